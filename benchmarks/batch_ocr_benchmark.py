@@ -0,0 +1,82 @@
+"""Сравнение мозаичного OCR с распознаванием каждой карточки по отдельности.
+
+Входные данные - папка с записанными изображениями карточек-кандидатов
+(вырезанные узлы view_group ленты). Для каждого режима выводит время на
+экран из --per-screen карточек и согласие результатов поиска фразы.
+
+Пример:
+    python -m benchmarks.batch_ocr_benchmark --corpus cards --per-screen 8
+"""
+
+import statistics
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import List
+
+from PIL import Image
+
+from src.utils import Tesseract
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, required=True, help="Папка с карточками")
+    parser.add_argument("--phrase", default="sponsored")
+    parser.add_argument("--per-screen", type=int, default=8, help="Карточек на экран")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    images = [
+        Image.open(path).convert("RGB")
+        for path in sorted(args.corpus.iterdir())
+        if path.suffix.lower() in (".png", ".jpg", ".jpeg")
+    ]
+    if not images:
+        parser.error(f"В {args.corpus} нет изображений")
+
+    screens = [
+        images[i : i + args.per_screen] for i in range(0, len(images), args.per_screen)
+    ]
+
+    loop_times: List[float] = []
+    batch_times: List[float] = []
+    loop_found: List[bool] = []
+    batch_found: List[bool] = []
+
+    for _ in range(args.repeat):
+        loop_found.clear()
+        batch_found.clear()
+
+        for screen in screens:
+            start = time.perf_counter()
+            for image in screen:
+                loop_found.append(
+                    bool(Tesseract.find_all_matches_by_word(image, args.phrase))
+                )
+            loop_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            matches = Tesseract.find_matches_batch(images=screen, phrase=args.phrase)
+            batch_times.append(time.perf_counter() - start)
+            batch_found.extend(bool(found) for found in matches)
+
+    agreement = sum(a == b for a, b in zip(loop_found, batch_found)) / len(loop_found)
+
+    print(f"Карточек: {len(images)}, экранов: {len(screens)}, фраза: {args.phrase!r}")
+    for name, times, found in (
+        ("по одной", loop_times, loop_found),
+        ("мозаика", batch_times, batch_found),
+    ):
+        print(
+            f"{name:<10} на экран p50={statistics.median(times) * 1000:8.1f} ms  "
+            f"max={max(times) * 1000:8.1f} ms  найдено={sum(found)}"
+        )
+    print(
+        f"Ускорение: {statistics.median(loop_times) / statistics.median(batch_times):.2f}x, "
+        f"согласие: {agreement * 100:.1f}%"
+    )
+
+
+if __name__ == "__main__":
+    main()
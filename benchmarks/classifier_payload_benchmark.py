@@ -0,0 +1,163 @@
+"""Сравнение вариантов кодирования изображений для классификатора.
+
+Для каждого варианта (формат, качество, максимальная сторона, detail)
+выводит размер запроса, задержку и согласие классификации с эталоном
+(PNG в полном разрешении). По умолчанию запросы идут на локальный
+mock-сервер, пропускная способность прокси эмулируется параметром
+--bandwidth-kbps. С флагом --live используется настоящий API, и только
+в этом режиме согласие классификации имеет смысл.
+
+Пример:
+    python -m benchmarks.classifier_payload_benchmark --corpus saved_ads --bandwidth-kbps 2000
+"""
+
+import json
+import statistics
+import threading
+import time
+from argparse import ArgumentParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from openai import OpenAI
+from PIL import Image
+
+from src.config import settings
+from src.core import ContentAnalyzer
+
+
+class Variant(NamedTuple):
+    name: str
+    image_format: str
+    image_quality: int
+    image_max_edge: Optional[int]
+    image_detail: str
+
+
+VARIANTS = [
+    Variant("png-full (эталон)", "PNG", 85, None, "auto"),
+    Variant("jpeg-85-1024", "JPEG", 85, 1024, "auto"),
+    Variant("jpeg-75-768", "JPEG", 75, 768, "auto"),
+    Variant("webp-80-1024", "WEBP", 80, 1024, "auto"),
+    Variant("jpeg-75-512-low", "JPEG", 75, 512, "low"),
+]
+
+MOCK_RESPONSE = {
+    "id": "mock",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {
+                "role": "assistant",
+                "content": json.dumps({"label": "non_arbitrage", "confidence": 0.9}),
+            },
+        }
+    ],
+}
+
+
+def start_mock_server(bandwidth_kbps: Optional[float]) -> ThreadingHTTPServer:
+    """Запускает mock-сервер chat.completions и эмулирует ширину канала."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            if bandwidth_kbps:
+                time.sleep(length * 8 / (bandwidth_kbps * 1000))
+
+            body = json.dumps(MOCK_RESPONSE).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_analyzer(variant: Variant, base_url: Optional[str]) -> ContentAnalyzer:
+    analyzer = ContentAnalyzer(
+        api_key=settings.env.openai_api_key,
+        prompt=settings.path.prompt_file.read_text(encoding="utf-8").strip(),
+        proxy=settings.env.proxy_url,
+        image_max_edge=variant.image_max_edge,
+        image_format=variant.image_format,
+        image_quality=variant.image_quality,
+        image_detail=variant.image_detail,
+    )
+    if base_url:
+        analyzer.client = OpenAI(api_key="mock", base_url=base_url)
+    return analyzer
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--corpus", type=Path, required=True, help="Папка с изображениями"
+    )
+    parser.add_argument(
+        "--live", action="store_true", help="Использовать настоящий API"
+    )
+    parser.add_argument("--bandwidth-kbps", type=float, default=None)
+    args = parser.parse_args()
+
+    images = [
+        Image.open(path)
+        for path in sorted(args.corpus.iterdir())
+        if path.suffix.lower() in (".png", ".jpg", ".jpeg", ".webp")
+    ]
+    if not images:
+        parser.error(f"В {args.corpus} нет изображений")
+
+    base_url = None
+    if not args.live:
+        server = start_mock_server(args.bandwidth_kbps)
+        base_url = f"http://127.0.0.1:{server.server_port}/v1"
+
+    reference_labels: List[str] = []
+    print(f"Изображений: {len(images)}, режим: {'live' if args.live else 'mock'}")
+
+    for variant in VARIANTS:
+        analyzer = build_analyzer(variant, base_url)
+        payloads: List[int] = []
+        latencies: List[float] = []
+        labels: List[str] = []
+
+        for image in images:
+            payloads.append(len(analyzer._image_to_base64(image)))
+
+            start = time.perf_counter()
+            result = analyzer.classify_arbitrage(image)
+            latencies.append(time.perf_counter() - start)
+            labels.append(result["label"])
+
+        if not reference_labels:
+            reference_labels = labels
+
+        agreement: Dict[bool, int] = {True: 0, False: 0}
+        for label, reference in zip(labels, reference_labels):
+            agreement[label == reference] += 1
+
+        agreement_text = (
+            f"{agreement[True] / len(labels) * 100:5.1f}%" if args.live else "  n/a"
+        )
+        print(
+            f"{variant.name:<20} payload={statistics.mean(payloads) / 1024:8.1f} KiB  "
+            f"latency p50={statistics.median(latencies) * 1000:7.1f} ms  "
+            f"max={max(latencies) * 1000:7.1f} ms  agreement={agreement_text}"
+        )
+
+
+if __name__ == "__main__":
+    main()
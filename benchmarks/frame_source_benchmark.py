@@ -0,0 +1,222 @@
+"""Сравнение источников кадров по FPS и объему данных на кадр.
+
+Входные данные - записанные сырые дампы 'adb exec-out screencap' (*.raw).
+Для uiautomator2 кадр кодируется в JPEG/PNG заранее (как это делает
+устройство), в замер входит только работа на хосте.
+
+Уменьшенные кадры для ожидания стабилизации экрана сравниваются так же:
+прореживание полного сырого кадра и декодирование уменьшенного JPEG,
+который сжимает устройство. С --live замеряется полное время
+capture_preview на подключенном устройстве, включая передачу.
+
+Примеры:
+    python -m benchmarks.frame_source_benchmark --record SERIAL --count 20 --dir dumps
+    python -m benchmarks.frame_source_benchmark --dir dumps --crop 0 300 1080 2000
+    python -m benchmarks.frame_source_benchmark --dir dumps --live SERIAL
+"""
+
+import base64
+import subprocess
+import time
+from argparse import ArgumentParser
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+
+from src.utils.frame_source import (
+    Frame,
+    FrameSource,
+    ScreencapRawFrameSource,
+    Uiautomator2FrameSource,
+    array_to_image,
+    parse_screencap,
+)
+
+PREVIEW_SCALE = 0.2
+PREVIEW_QUALITY = 30
+
+
+def record_dumps(serial: str, count: int, output_dir: Path, adb_path: str) -> None:
+    """Записывает сырые кадры с устройства."""
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(count):
+        result = subprocess.run(
+            [adb_path, "-s", serial, "exec-out", "screencap"],
+            capture_output=True,
+            check=True,
+        )
+        (output_dir / f"frame_{index:04d}.raw").write_bytes(result.stdout)
+        time.sleep(0.5)
+    print(f"Записано кадров: {count} -> {output_dir}")
+
+
+def encode_frame(array: np.ndarray, image_format: str) -> bytes:
+    """Кодирует кадр так, как его передает uiautomator2."""
+
+    buffer = BytesIO()
+    image = array_to_image(array)
+    if image_format == "JPEG":
+        image.save(buffer, format="JPEG", quality=80)
+        return base64.b64encode(buffer.getvalue())
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def run_case(
+    name: str,
+    payloads: List[bytes],
+    decode: Callable[[bytes], Frame],
+    crop: Optional[Sequence[int]],
+    repeat: int,
+) -> None:
+    """Замеряет декодирование, вырезание области и переход в PIL."""
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for payload in payloads:
+            frame = decode(payload)
+            frame.to_image(bounds=crop)
+    elapsed = time.perf_counter() - start
+
+    frames = repeat * len(payloads)
+    average_bytes = sum(len(payload) for payload in payloads) / len(payloads)
+    print(
+        f"{name:<20} fps={frames / elapsed:8.1f}  "
+        f"bytes/frame={average_bytes / 1024:10.1f} KiB"
+    )
+
+
+def decode_raw(payload: bytes) -> Frame:
+    return Frame(array=parse_screencap(payload), transferred_bytes=len(payload))
+
+
+def decode_jpeg(payload: bytes) -> Frame:
+    image = Image.open(BytesIO(base64.b64decode(payload))).convert("RGB")
+    return Frame(array=np.asarray(image), transferred_bytes=len(payload))
+
+
+def decode_png(payload: bytes) -> Frame:
+    image = Image.open(BytesIO(payload)).convert("RGB")
+    return Frame(array=np.asarray(image), transferred_bytes=len(payload))
+
+
+def encode_preview(array: np.ndarray) -> bytes:
+    """Кодирует уменьшенный кадр так, как его передает takeScreenshot."""
+
+    image = array_to_image(array)
+    size = (round(image.width * PREVIEW_SCALE), round(image.height * PREVIEW_SCALE))
+    buffer = BytesIO()
+    image.resize(size).save(buffer, format="JPEG", quality=PREVIEW_QUALITY)
+    return base64.b64encode(buffer.getvalue())
+
+
+def preview_raw(payload: bytes) -> np.ndarray:
+    step = round(1 / PREVIEW_SCALE)
+    return np.ascontiguousarray(parse_screencap(payload)[::step, ::step, 1])
+
+
+def preview_jpeg(payload: bytes) -> np.ndarray:
+    return np.asarray(Image.open(BytesIO(base64.b64decode(payload))).convert("L"))
+
+
+def run_preview_case(
+    name: str,
+    payloads: List[bytes],
+    decode: Callable[[bytes], np.ndarray],
+    repeat: int,
+) -> None:
+    """Замеряет получение уменьшенного кадра на хосте."""
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for payload in payloads:
+            decode(payload)
+    elapsed = time.perf_counter() - start
+
+    average_bytes = sum(len(payload) for payload in payloads) / len(payloads)
+    print(
+        f"{name:<20} ms/preview={elapsed * 1000 / (repeat * len(payloads)):6.2f}  "
+        f"bytes/preview={average_bytes / 1024:10.1f} KiB"
+    )
+
+
+def run_live_preview(name: str, source: FrameSource, count: int) -> None:
+    """Замеряет capture_preview на устройстве, включая передачу кадра."""
+
+    durations = []
+    for _ in range(count):
+        start = time.perf_counter()
+        source.capture_preview(scale=PREVIEW_SCALE, quality=PREVIEW_QUALITY)
+        durations.append(time.perf_counter() - start)
+
+    durations.sort()
+    print(
+        f"{name:<28} p50={durations[len(durations) // 2] * 1000:7.1f} ms  "
+        f"max={durations[-1] * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", type=Path, required=True, help="Папка с *.raw")
+    parser.add_argument("--record", metavar="SERIAL", help="Записать кадры")
+    parser.add_argument(
+        "--live", metavar="SERIAL", help="Замерить capture_preview на устройстве"
+    )
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--adb", default="adb")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--crop", type=int, nargs=4, metavar=("L", "T", "R", "B"), default=None
+    )
+    args = parser.parse_args()
+
+    if args.record:
+        record_dumps(args.record, args.count, args.dir, args.adb)
+        return
+
+    if args.live:
+        import uiautomator2
+
+        device = uiautomator2.connect(args.live)
+        print(f"capture_preview, {args.count} кадров:")
+        run_live_preview(
+            "screencap_raw (full frame)",
+            ScreencapRawFrameSource(serial=args.live, adb_path=args.adb),
+            args.count,
+        )
+        run_live_preview(
+            "screencap_raw (device)",
+            ScreencapRawFrameSource(serial=args.live, adb_path=args.adb, device=device),
+            args.count,
+        )
+        run_live_preview("uiautomator2", Uiautomator2FrameSource(device), args.count)
+        return
+
+    raw_payloads = [path.read_bytes() for path in sorted(args.dir.glob("*.raw"))]
+    if not raw_payloads:
+        parser.error(f"В {args.dir} нет файлов *.raw")
+
+    arrays = [parse_screencap(payload) for payload in raw_payloads]
+    jpeg_payloads = [encode_frame(array, "JPEG") for array in arrays]
+    png_payloads = [encode_frame(array, "PNG") for array in arrays]
+
+    print(
+        f"Кадров: {len(raw_payloads)}, разрешение: {arrays[0].shape[1]}x{arrays[0].shape[0]}"
+    )
+    run_case("screencap_raw", raw_payloads, decode_raw, args.crop, args.repeat)
+    run_case("uiautomator2 (jpeg)", jpeg_payloads, decode_jpeg, args.crop, args.repeat)
+    run_case("uiautomator2 (png)", png_payloads, decode_png, args.crop, args.repeat)
+
+    preview_payloads = [encode_preview(array) for array in arrays]
+    print(f"Уменьшенные кадры (scale={PREVIEW_SCALE}, quality={PREVIEW_QUALITY}):")
+    run_preview_case("screencap_raw", raw_payloads, preview_raw, args.repeat)
+    run_preview_case("takeScreenshot", preview_payloads, preview_jpeg, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Сравнение передачи кадров между процессами: pickle против кольца кадров.
+
+Процесс-производитель отправляет кадры размера экрана процессу-потребителю,
+потребитель читает область кадра и подтверждает обработку. Для кольца
+кадров в очередь уходит только FrameRef, слот освобождается по
+подтверждению.
+
+Пример:
+    python -m benchmarks.frame_transport_benchmark --width 1080 --height 2400 --frames 300
+"""
+
+import time
+from argparse import ArgumentParser
+from multiprocessing import Process, Queue
+from typing import Callable
+
+import numpy as np
+
+from src.utils.frame_ring import FrameRef, FrameRing, read_frame
+
+CROP = (0, 300, 1080, 900)
+
+
+def consumer(requests: Queue, acks: Queue) -> None:
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+
+        slot = None
+        if isinstance(message, FrameRef):
+            area = read_frame(message)
+            slot = message.slot
+        else:
+            left, top, right, bottom = CROP
+            area = message[top:bottom, left:right]
+
+        acks.put((slot, int(area.mean())))
+
+
+def run_case(
+    name: str,
+    frames: int,
+    window: int,
+    frame: np.ndarray,
+    send: Callable[[Queue, np.ndarray], None],
+    on_ack: Callable[[object], None],
+) -> None:
+    requests: Queue = Queue()
+    acks: Queue = Queue()
+    process = Process(target=consumer, args=(requests, acks), daemon=True)
+    process.start()
+
+    start = time.perf_counter()
+    in_flight = 0
+    for _ in range(frames):
+        if in_flight >= window:
+            on_ack(acks.get()[0])
+            in_flight -= 1
+        send(requests, frame)
+        in_flight += 1
+
+    while in_flight:
+        on_ack(acks.get()[0])
+        in_flight -= 1
+    elapsed = time.perf_counter() - start
+
+    requests.put(None)
+    process.join()
+
+    print(
+        f"{name:<8} fps={frames / elapsed:9.1f}  "
+        f"МБ/с={frames * frame.nbytes / elapsed / 1024 / 1024:9.1f}"
+    )
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=1080)
+    parser.add_argument("--height", type=int, default=2400)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--slots", type=int, default=4)
+    args = parser.parse_args()
+
+    frame = np.random.randint(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+    print(f"Кадр: {args.width}x{args.height}, {frame.nbytes / 1024 / 1024:.1f} МБ")
+
+    run_case(
+        name="pickle",
+        frames=args.frames,
+        window=args.slots,
+        frame=frame,
+        send=lambda queue, array: queue.put(array),
+        on_ack=lambda slot: None,
+    )
+
+    ring = FrameRing(slots=args.slots, width=args.width, height=args.height)
+    refs = {}
+
+    def send_ref(queue: Queue, array: np.ndarray) -> None:
+        ref = ring.put(array, crop=CROP)
+        refs[ref.slot] = ref
+        queue.put(ref)
+
+    try:
+        run_case(
+            name="ring",
+            frames=args.frames,
+            window=args.slots,
+            frame=frame,
+            send=send_ref,
+            on_ack=lambda slot: ring.release(refs.pop(slot)),
+        )
+    finally:
+        ring.close()
+
+
+if __name__ == "__main__":
+    main()
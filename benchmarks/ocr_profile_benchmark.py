@@ -0,0 +1,86 @@
+"""Сравнение профилей OCR по задержке и полноте обнаружения метки.
+
+Размеченный набор - две папки: изображения с меткой (--positive) и без
+нее (--negative). Для каждого профиля из configs/ocr_profiles.json
+выводятся задержка распознавания, полнота (recall) и доля ложных
+срабатываний.
+
+Пример:
+    python -m benchmarks.ocr_profile_benchmark --positive labeled/sponsored --negative labeled/organic
+"""
+
+import statistics
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import List, Optional
+
+from PIL import Image
+from PIL.Image import Image as PILImage
+
+from src.config import settings
+from src.utils import Tesseract
+from src.utils.ocr_profile import load_ocr_profiles
+
+
+def load_images(directory: Optional[Path]) -> List[PILImage]:
+    if directory is None:
+        return []
+    return [
+        Image.open(path).convert("RGB")
+        for path in sorted(directory.iterdir())
+        if path.suffix.lower() in (".png", ".jpg", ".jpeg")
+    ]
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--positive", type=Path, required=True, help="Изображения с меткой"
+    )
+    parser.add_argument(
+        "--negative", type=Path, default=None, help="Изображения без метки"
+    )
+    parser.add_argument("--phrase", default="sponsored")
+    parser.add_argument("--profiles", nargs="*", default=None, help="Имена профилей")
+    args = parser.parse_args()
+
+    positives = load_images(args.positive)
+    negatives = load_images(args.negative)
+    if not positives:
+        parser.error(f"В {args.positive} нет изображений")
+
+    profiles = load_ocr_profiles(settings.path.ocr_profiles_file)
+    names = args.profiles or list(profiles)
+
+    print(
+        f"С меткой: {len(positives)}, без метки: {len(negatives)}, фраза: {args.phrase!r}"
+    )
+    for name in names:
+        profile = profiles[name]
+        latencies: List[float] = []
+        found = []
+
+        for image in positives + negatives:
+            start = time.perf_counter()
+            coords = Tesseract.find_matches_by_word(
+                image=image, target_word=args.phrase, profile=profile
+            )
+            latencies.append(time.perf_counter() - start)
+            found.append(coords is not None)
+
+        recall = sum(found[: len(positives)]) / len(positives)
+        false_positive = (
+            f"{sum(found[len(positives):]) / len(negatives) * 100:5.1f}%"
+            if negatives
+            else "  n/a"
+        )
+        print(
+            f"{name:<16} p50={statistics.median(latencies) * 1000:7.1f} ms  "
+            f"max={max(latencies) * 1000:7.1f} ms  "
+            f"recall={recall * 100:5.1f}%  ложные={false_positive}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Оценка смещения ленты между последовательными кадрами.
+
+Входные данные - кадры, записанные подряд между свайпами (*.raw дампы
+screencap или *.png, порядок по имени файла). Для каждой пары выводится
+оценка смещения, корреляция, время оценки и доля области контента,
+которую нужно распознать при инкрементальном поиске меток.
+
+Пример:
+    python -m benchmarks.scroll_offset_benchmark --frames swipes --crop 0 300 1080 2200
+"""
+
+import statistics
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+from benchmarks.template_detector_benchmark import load_frames
+from src.config import settings
+from src.utils import estimate_scroll_offset, row_profile
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=Path, required=True, help="Папка с кадрами")
+    parser.add_argument(
+        "--crop", type=int, nargs=4, metavar=("L", "T", "R", "B"), default=None
+    )
+    parser.add_argument(
+        "--margin", type=int, default=settings.ocr.incremental_scan_margin
+    )
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames, args.crop)
+    if len(frames) < 2:
+        parser.error(f"В {args.frames} меньше двух кадров")
+
+    times = []
+    scanned = 0
+    total = 0
+    previous = row_profile(frames[0])
+    for index, frame in enumerate(frames[1:], start=1):
+        start = time.perf_counter()
+        current = row_profile(frame)
+        estimate = estimate_scroll_offset(previous, current)
+        times.append(time.perf_counter() - start)
+        previous = current
+
+        height = frame.shape[0]
+        if estimate is None:
+            strip = height
+            print(f"{index:4d}: смещение не найдено, полное распознавание")
+        else:
+            strip = min(height, estimate.offset + args.margin) if estimate.offset else 0
+            print(
+                f"{index:4d}: смещение {estimate.offset:5d} px, "
+                f"корреляция {estimate.score:.3f}, полоса {strip} px"
+            )
+        scanned += strip
+        total += height
+
+    print(
+        f"Оценка: p50={statistics.median(times) * 1000:.1f} ms, "
+        f"max={max(times) * 1000:.1f} ms"
+    )
+    print(f"Распознается {scanned / total * 100:.0f}% пикселей области контента")
+
+
+if __name__ == "__main__":
+    main()
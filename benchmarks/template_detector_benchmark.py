@@ -0,0 +1,185 @@
+"""Точность и полнота детектора шаблонов метки 'Sponsored' относительно OCR.
+
+Входные данные - записанные кадры (*.raw дампы screencap или *.png).
+Эталоном считается полное распознавание области кадра профилем навигации.
+Для детектора выводятся precision/recall по вхождениям и время на кадр;
+для схемы "детектор + проверка Tesseract" - совпадение с эталоном по кадрам.
+
+Флаг --capture сохраняет найденные OCR метки как шаблоны.
+
+Примеры:
+    python -m benchmarks.template_detector_benchmark --frames dumps --capture 5
+    python -m benchmarks.template_detector_benchmark --frames dumps --crop 0 300 1080 2200
+"""
+
+import statistics
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+
+from src.config import settings
+from src.utils import TemplateDetector, Tesseract, TesseractCoords, get_ocr_profile
+from src.utils.frame_source import parse_screencap
+
+PHRASE = "sponsored"
+
+
+def load_frames(directory: Path, crop: Optional[Sequence[int]]) -> List[np.ndarray]:
+    frames = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix == ".raw":
+            array = parse_screencap(path.read_bytes())
+        elif path.suffix.lower() == ".png":
+            array = np.asarray(Image.open(path).convert("RGB"))
+        else:
+            continue
+
+        if crop:
+            left, top, right, bottom = crop
+            array = array[top:bottom, left:right]
+        frames.append(np.ascontiguousarray(array[..., :3]))
+    return frames
+
+
+def capture(frames: List[np.ndarray], count: int, output_dir: Path) -> None:
+    """Сохраняет метки, найденные OCR, как шаблоны."""
+
+    profile = get_ocr_profile(settings.ocr.navigation_profile)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    saved = 0
+    for index, frame in enumerate(frames):
+        for coords in Tesseract.find_all_matches_by_word(
+            image=Image.fromarray(frame), target_word=PHRASE, profile=profile
+        ):
+            label = frame[coords.top : coords.bottom, coords.left : coords.right]
+            Image.fromarray(label).convert("L").save(
+                output_dir / f"sponsored_{index:04d}_{saved}.png"
+            )
+            saved += 1
+            if saved >= count:
+                print(f"Сохранено шаблонов: {saved} -> {output_dir}")
+                return
+    print(f"Сохранено шаблонов: {saved} -> {output_dir}")
+
+
+def contains(coords: TesseractCoords, x: int, y: int) -> bool:
+    return coords.left <= x < coords.right and coords.top <= y < coords.bottom
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=Path, required=True, help="Папка с кадрами")
+    parser.add_argument(
+        "--crop", type=int, nargs=4, metavar=("L", "T", "R", "B"), default=None
+    )
+    parser.add_argument(
+        "--templates", type=Path, default=settings.path.sponsored_templates_dir
+    )
+    parser.add_argument("--capture", type=int, metavar="N", help="Сохранить N шаблонов")
+    parser.add_argument(
+        "--threshold", type=float, default=settings.ocr.template_threshold
+    )
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames, args.crop)
+    if not frames:
+        parser.error(f"В {args.frames} нет кадров")
+
+    if args.capture:
+        capture(frames, args.capture, args.templates)
+        return
+
+    detector = TemplateDetector.from_directory(
+        args.templates,
+        scales=settings.ocr.template_scales,
+        threshold=args.threshold,
+        downscale=settings.ocr.template_downscale,
+    )
+    if not detector.enabled:
+        parser.error(f"В {args.templates} нет шаблонов, используйте --capture")
+
+    profile = get_ocr_profile(settings.ocr.navigation_profile)
+    margin = settings.ocr.template_verify_margin
+
+    ocr_times, detector_times, pipeline_times = [], [], []
+    true_hits = false_hits = found_labels = total_labels = 0
+    frame_agreement = 0
+
+    for frame in frames:
+        image = Image.fromarray(frame)
+
+        start = time.perf_counter()
+        labels = Tesseract.find_all_matches_by_word(image, PHRASE, profile=profile)
+        ocr_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        hits = detector.detect(frame)
+        detector_times.append(time.perf_counter() - start)
+
+        # Вхождение верно, если его центр лежит внутри метки, найденной OCR
+        for hit in hits:
+            center = ((hit.left + hit.right) // 2, (hit.top + hit.bottom) // 2)
+            if any(contains(label, *center) for label in labels):
+                true_hits += 1
+            else:
+                false_hits += 1
+        total_labels += len(labels)
+        found_labels += sum(
+            any(
+                contains(
+                    label, (hit.left + hit.right) // 2, (hit.top + hit.bottom) // 2
+                )
+                for hit in hits
+            )
+            for label in labels
+        )
+
+        # Схема из NavigationManager._find_sponsored
+        start = time.perf_counter()
+        found = False
+        if hits:
+            for hit in hits:
+                region = image.crop(
+                    (
+                        max(0, hit.left - margin),
+                        max(0, hit.top - margin),
+                        min(image.width, hit.right + margin),
+                        min(image.height, hit.bottom + margin),
+                    )
+                )
+                if Tesseract.find_matches_by_word(region, PHRASE, profile=profile):
+                    found = True
+                    break
+        else:
+            found = (
+                Tesseract.find_matches_by_word(image, PHRASE, profile=profile)
+                is not None
+            )
+        pipeline_times.append(time.perf_counter() - start + detector_times[-1])
+        frame_agreement += found == bool(labels)
+
+    precision = true_hits / (true_hits + false_hits) if true_hits + false_hits else 0.0
+    recall = found_labels / total_labels if total_labels else 0.0
+
+    print(f"Кадров: {len(frames)}, меток по OCR: {total_labels}")
+    print(f"Детектор: precision={precision * 100:5.1f}%  recall={recall * 100:5.1f}%")
+    for name, times in (
+        ("OCR", ocr_times),
+        ("детектор", detector_times),
+        ("детектор+OCR", pipeline_times),
+    ):
+        print(
+            f"{name:<14} p50={statistics.median(times) * 1000:8.1f} ms  max={max(times) * 1000:8.1f} ms"
+        )
+    print(
+        f"Совпадение схемы с OCR по кадрам: {frame_agreement / len(frames) * 100:5.1f}%"
+    )
+
+
+if __name__ == "__main__":
+    main()
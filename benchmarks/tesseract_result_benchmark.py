@@ -0,0 +1,122 @@
+"""Микро-бенчмарк разбора результата Tesseract: списки против массивов NumPy.
+
+Входные данные - сохраненные выводы image_to_data (*.json со словарем
+колонок). Сохранить их можно из папки изображений флагом --record.
+Замеряется построение TesseractResult, масштабирование координат и поиск
+фраз; базовая версия повторяет прежнюю реализацию на списках.
+
+Примеры:
+    python -m benchmarks.tesseract_result_benchmark --record screenshots --dir ocr_dumps
+    python -m benchmarks.tesseract_result_benchmark --dir ocr_dumps --repeat 200
+"""
+
+import json
+import math
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+from PIL import Image
+
+from src.utils import Tesseract, TesseractResult
+from src.utils.ocr_engine import get_ocr_engine
+
+PHRASES = ["sponsored", "google play:"]
+
+
+def record(images_dir: Path, output_dir: Path, scale: int) -> None:
+    """Сохраняет выводы image_to_data для изображений из папки."""
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for path in sorted(images_dir.iterdir()):
+        if path.suffix.lower() not in (".png", ".jpg", ".jpeg"):
+            continue
+        image = Image.open(path)
+        image = image.resize((image.width * scale, image.height * scale))
+        data = get_ocr_engine().image_to_data(
+            image=image, lang="eng", config="--oem 3 --psm 6"
+        )
+        (output_dir / f"{path.stem}.json").write_text(json.dumps(data))
+    print(f"Сохранено в {output_dir}")
+
+
+def legacy(data: Dict[str, List], scale: int) -> Dict[str, int]:
+    """Прежняя реализация: списки, math.floor/ceil и вложенные проверки."""
+
+    top = [math.floor(i / scale) for i in data["top"]]
+    left = [math.floor(i / scale) for i in data["left"]]
+    width = [math.ceil(i / scale) for i in data["width"]]
+    height = [math.ceil(i / scale) for i in data["height"]]
+
+    words = [w.lower() if w else "" for w in data["text"]]
+    found = {}
+    for phrase in PHRASES:
+        target_words = phrase.lower().split()
+        count = 0
+        for i in range(len(words) - len(target_words) + 1):
+            end = i + len(target_words)
+            if words[i:end] != target_words:
+                continue
+            if any(conf < 60 for conf in data["conf"][i:end]):
+                continue
+            min(top[i:end]), min(left[i:end])
+            max(l + w for l, w in zip(left[i:end], width[i:end]))
+            max(t + h for t, h in zip(top[i:end], height[i:end]))
+            count += 1
+        found[phrase] = count
+    return found
+
+
+def vectorized(data: Dict[str, List], scale: int) -> Dict[str, int]:
+    result = TesseractResult(**data)
+    result.rescale(scale)
+    matches = Tesseract._match_phrases(result, PHRASES, min_confidence=60)
+    return {phrase: len(coords) for phrase, coords in matches.items()}
+
+
+def run_case(
+    name: str,
+    dumps: Sequence[Dict[str, List]],
+    function: Callable[[Dict[str, List], int], Dict[str, int]],
+    repeat: int,
+    scale: int,
+) -> List[Dict[str, int]]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [function(data, scale) for data in dumps]
+    elapsed = time.perf_counter() - start
+
+    calls = repeat * len(dumps)
+    print(f"{name:<12} {elapsed / calls * 1e6:9.1f} мкс на результат")
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", type=Path, required=True, help="Папка с *.json")
+    parser.add_argument(
+        "--record", type=Path, metavar="IMAGES", help="Папка с изображениями"
+    )
+    parser.add_argument("--scale", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record, args.dir, args.scale)
+        return
+
+    dumps = [json.loads(path.read_text()) for path in sorted(args.dir.glob("*.json"))]
+    if not dumps:
+        parser.error(f"В {args.dir} нет файлов *.json")
+
+    rows = sum(len(data["text"]) for data in dumps) / len(dumps)
+    print(f"Результатов: {len(dumps)}, строк в среднем: {rows:.0f}")
+
+    expected = run_case("списки", dumps, legacy, args.repeat, args.scale)
+    actual = run_case("numpy", dumps, vectorized, args.repeat, args.scale)
+    print(f"Совпадение результатов: {expected == actual}")
+
+
+if __name__ == "__main__":
+    main()
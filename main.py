@@ -2,7 +2,7 @@ import logging
 import sys
 from datetime import datetime
 from multiprocessing import Process
-from typing import List
+from typing import List, Optional
 
 from uiautomator2 import Device
 
@@ -10,6 +10,7 @@ from src.config import settings
 from src.app import GoogleParser
 from src.utils import AdbDevicesManager
 from src.utils import ArgsManager
+from src.utils import OcrService, RemoteOcrEngine
 from src.utils import get_logger, setup_logging
 
 # Настраиваем логирование
@@ -22,6 +23,13 @@ class DeviceProcessLauncher:
     def __init__(self) -> None:
         self.args = ArgsManager().parse_args()
         self.device_manager = AdbDevicesManager()
+        self.ocr_service: Optional[OcrService] = None
+        if settings.ocr.ocr_service:
+            self.ocr_service = OcrService(
+                workers=settings.ocr.ocr_service_workers,
+                queue_size=settings.ocr.ocr_service_queue_size,
+                timeout=settings.ocr.ocr_service_timeout,
+            )
 
     def _get_available_devices(self) -> List[str]:
         try:
@@ -57,6 +65,7 @@ class DeviceProcessLauncher:
         self,
         device_serial: str,
         result_dir: str,
+        ocr_client: Optional[RemoteOcrEngine] = None,
     ) -> None:
         start_time = datetime.now()
 
@@ -68,6 +77,10 @@ class DeviceProcessLauncher:
             logger.info("[%s] Устройство успешно инициализировано", device_serial)
 
             parser = GoogleParser(device=device, result_dir=result_dir)
+
+            if ocr_client:
+                ocr_client.install(frame_ring=parser.frame_ring)
+
             parser.run()
 
         except Exception as e:
@@ -90,10 +103,14 @@ class DeviceProcessLauncher:
         device_serial: str,
         result_dir: str,
     ) -> Process:
+        ocr_client = None
+        if self.ocr_service:
+            ocr_client = self.ocr_service.register(serial=device_serial)
+
         return Process(
             name=f"Device-{device_serial}",
             target=self._device_worker,
-            args=(device_serial, result_dir),
+            args=(device_serial, result_dir, ocr_client),
             daemon=True,
         )
 
@@ -119,6 +136,11 @@ class DeviceProcessLauncher:
                 process.start()
                 logger.info("[%s] Запущен процесс для устройства", device_serial)
 
+            # Сервис OCR стартует после процессов устройств, чтобы они не
+            # наследовали его потоки
+            if self.ocr_service:
+                self.ocr_service.start()
+
             # Ожидаем завершения всех процессов
             for process in processes:
                 process.join()
@@ -133,6 +155,9 @@ class DeviceProcessLauncher:
         except Exception as e:
             logger.error("Критическая ошибка: %s", str(e), exc_info=True)
         finally:
+            if self.ocr_service:
+                self.ocr_service.close()
+
             duration = datetime.now() - start_time
             logger.info("Общее время выполнения: %s", duration)
 
@@ -5,18 +5,32 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
-from uiautomator2 import Device
+from uiautomator2 import Device, UiObject
 
 from src.config import settings
 from src.core import (
     AccountSwitcher,
+    AdJob,
+    ClassificationPipeline,
     ContentAnalyzer,
     DataInterpreter,
     MainClass,
     NavigationManager,
+    TextPrefilter,
 )
 from src.models import ConfigItem
-from src.utils import GoogleApp, get_logger
+from src.utils import (
+    ClassificationCache,
+    FrameRing,
+    GoogleApp,
+    ScheduleState,
+    ScheduleTable,
+    SeenAdIndex,
+    SwitchLatency,
+    get_logger,
+    hamming_distance,
+    perceptual_hash,
+)
 
 logger = get_logger(name="google-parser")
 
@@ -35,8 +49,66 @@ class GoogleParser(MainClass):
             api_key=settings.env.openai_api_key,
             proxy=settings.env.proxy_url,
             prompt=self._get_prompt(),
+            cache=self._get_classification_cache(),
+            image_max_edge=settings.classifier.image_max_edge,
+            image_format=settings.classifier.image_format,
+            image_quality=settings.classifier.image_quality,
+            image_detail=settings.classifier.image_detail,
         )
         self.config = self._get_config()
+        self.schedule = ScheduleTable(self.config or [])
+        self._schedule_state: Optional[ScheduleState] = None
+
+        self.text_prefilter: Optional[TextPrefilter] = None
+        if settings.classifier.text_prefilter:
+            self.text_prefilter = TextPrefilter.from_file(
+                settings.path.prefilter_keywords_file
+            )
+
+        self.seen_ads: Optional[SeenAdIndex] = None
+        if settings.classifier.seen_ad_index:
+            self.seen_ads = SeenAdIndex(
+                path=settings.path.seen_ads_file,
+                device_serial=device.serial,
+                window=settings.classifier.seen_ad_window,
+                max_distance=settings.classifier.seen_ad_distance,
+            )
+
+        # Измеренная длительность смены аккаунта для смены до открытия окна
+        self.switch_latency = SwitchLatency(
+            path=settings.path.switch_latency_file,
+            device_serial=device.serial,
+            initial=settings.timeout.account_switch_initial,
+            margin=settings.timeout.account_switch_margin,
+            max_lead=settings.timeout.account_switch_max_lead,
+        )
+
+        # Кольцо кадров для передачи снятых кадров в общий сервис OCR.
+        # Размер слота берется по снятому кадру: displayHeight может не
+        # учитывать панель навигации
+        self.frame_ring: Optional[FrameRing] = None
+        if settings.ocr.ocr_service and settings.ocr.frame_ring:
+            frame = self.screen.get_frame()
+            self.frame_ring = FrameRing(
+                slots=settings.ocr.frame_ring_slots,
+                width=frame.width,
+                height=frame.height,
+            )
+
+        # Обновления ленты без перезапуска приложения
+        self._warm_refreshes = 0
+        self._feed_hash: Optional[int] = None
+
+        self.pipeline: Optional[ClassificationPipeline] = None
+        if settings.classifier.async_classification:
+            self.pipeline = ClassificationPipeline(
+                content_analyzer=self.content_analyzer,
+                on_arbitrage=self._save_ad,
+                on_non_arbitrage=self._mark_seen,
+                workers=settings.classifier.classification_workers,
+                queue_size=settings.classifier.classification_queue_size,
+                policy=settings.classifier.classification_backpressure,
+            )
 
         self.download_dir = Path(result_dir) / self.device.serial
         self.download_dir.mkdir(exist_ok=True, parents=True)
@@ -64,6 +136,17 @@ class GoogleParser(MainClass):
         logger.debug("Промпт успешно загружен")
         return prompt
 
+    def _get_classification_cache(self) -> Optional[ClassificationCache]:
+        if not settings.classifier.classification_cache:
+            return None
+
+        return ClassificationCache(
+            path=settings.path.classification_cache_file,
+            max_distance=settings.classifier.classification_cache_distance,
+            ttl=settings.classifier.classification_cache_ttl,
+            max_entries=settings.classifier.classification_cache_max_entries,
+        )
+
     def _get_config(self) -> Optional[List[ConfigItem]]:
         device_serial = self.device.serial
         logger.debug("Загрузка конфигурации для устройства: %s", device_serial)
@@ -122,33 +205,238 @@ class GoogleParser(MainClass):
 
         self.app.close()
 
+        if self.pipeline:
+            self.pipeline.close()
+
+        if self.frame_ring:
+            self.frame_ring.close()
+
+    def _save_ad(self, job: AdJob) -> None:
+        hash_name = hashlib.md5(job.url.encode("utf-8")).hexdigest()
+        download_dir: Path = self.download_dir / job.region / hash_name
+        download_dir.mkdir(parents=True, exist_ok=True)
+
+        job.image.save(download_dir / "image.png")
+        with (download_dir / "info.txt").open(mode="w", encoding="utf-8") as file:
+            data = f"url: {job.url}\ntext: {job.text}"
+            file.write(data)
+
+        logger.info("Сохранена арбитражная реклама: %s...", job.url[:50])
+        self._mark_seen(job)
+
+    def _mark_seen(self, job: AdJob) -> None:
+        """Отмечает объявление с окончательным результатом как просмотренное."""
+
+        if self.seen_ads and job.phash is not None:
+            self.seen_ads.add(region=job.region, text=job.text, phash=job.phash)
+
+    def _process_ad(self, ads_node: UiObject, region: str) -> bool:
+        """Обрабатывает найденное объявление.
+
+        Повторно встреченные объявления (по тексту и хэшу изображения)
+        пропускаются до любой дорогой работы. Затем текст проверяется
+        локальным префильтром: в классификатор уходят только неоднозначные
+        объявления. В фоновом
+        режиме все данные, для которых нужен живой узел (включая ссылку),
+        снимаются сразу, а классификация и сохранение уходят в конвейер.
+        В индекс просмотренных объявление попадает только с окончательным
+        результатом: после сохранения или классификации как обычной рекламы.
+        Возвращает True, если объявление сохранено синхронно.
+        """
+        text = self.data_interpreter.get_text(node=ads_node)
+        image = self.data_interpreter.get_image(node=ads_node)
+        if image is None:
+            return False
+
+        job = AdJob(image=image, text=text, url=None, region=region)
+        if self.seen_ads:
+            job.phash = perceptual_hash(image)
+            if self.seen_ads.seen(region=region, text=text, phash=job.phash):
+                return False
+
+        verdict = "unsure"
+        if self.text_prefilter:
+            verdict = self.text_prefilter.classify(text)
+        if verdict == "non_arbitrage":
+            self._mark_seen(job)
+            return False
+
+        if verdict == "unsure":
+            if self.pipeline:
+                job.url = self.data_interpreter.get_link(node=ads_node)
+                if job.url and text:
+                    self.pipeline.submit(job)
+                return False
+
+            is_arbitrage = self.content_analyzer.check_arbitrage(image=image)
+            if is_arbitrage is None:
+                return False
+            if not is_arbitrage:
+                self._mark_seen(job)
+                return False
+
+        job.url = self.data_interpreter.get_link(node=ads_node)
+        if not (job.url and text):
+            return False
+
+        self._save_ad(job)
+        return True
+
+    def _start_app(self, stop: bool = False) -> None:
+        self.app.start(timeout=settings.timeout.app_start_timeout, stop=stop)
+        self.transitions.wait_node(
+            self.nodes.blocks.google_app,
+            timeout=settings.timeout.app_start_timeout,
+            name="загрузка ленты",
+        )
+        self._invalidate_screen()
+
+    def _restart_app(self) -> None:
+        # Приложение уже остановлено close(), повторная остановка не нужна
+        self.app.close()
+        self._start_app()
+        self._warm_refreshes = 0
+        self._feed_hash = None
+
+    def _get_feed_hash(self) -> Optional[int]:
+        """Перцептивный хэш видимой части ленты или None, если ленты нет."""
+
+        if not self._node(self.nodes.blocks.google_app).exists:
+            return None
+
+        content_bounds = self.navigation_manager.get_content_area_bounds()
+        return perceptual_hash(self._crop_frame(bounds=content_bounds.to_list()))
+
+    def _update_feed(self) -> Optional[int]:
+        """Обновляет ленту жестом и ждет загрузки нового контента.
+
+        Returns:
+            Хэш начала ленты после обновления
+        """
+        self.navigation_manager.update_feed()
+        self._wait_settled(
+            baseline=5,
+            timeout=settings.timeout.refresh_settle_timeout,
+            motion_only=False,
+        )
+        return self._get_feed_hash()
+
+    def _refresh_feed(self) -> None:
+        """Обновляет ленту между проходами.
+
+        По умолчанию лента обновляется внутри запущенного приложения:
+        возврат в начало и жест обновления. Холодный перезапуск выполняется
+        после settings.screen.warm_refresh_limit обновлений подряд, если
+        лента пропала с экрана или если после обновления начало ленты не
+        изменилось.
+        """
+        start = time.monotonic()
+
+        if (
+            settings.screen.warm_refresh
+            and self._warm_refreshes < settings.screen.warm_refresh_limit
+            and self._node(self.nodes.blocks.google_app).exists
+        ):
+            feed_hash = self._update_feed()
+            stale = feed_hash is None or (
+                self._feed_hash is not None
+                and hamming_distance(feed_hash, self._feed_hash)
+                <= settings.screen.stale_feed_distance
+            )
+            if not stale:
+                self._warm_refreshes += 1
+                self._feed_hash = feed_hash
+                logger.info(
+                    "Лента обновлена без перезапуска (#%d) за %.1f с",
+                    self._warm_refreshes,
+                    time.monotonic() - start,
+                )
+                return
+
+            logger.info("Лента не обновилась, перезапуск приложения")
+
+        self._restart_app()
+        self._feed_hash = self._update_feed()
+        logger.info(
+            "Лента обновлена перезапуском приложения за %.1f с",
+            time.monotonic() - start,
+        )
+
     def get_current_config(self) -> Optional[ConfigItem]:
+        """Активная конфигурация расписания.
+
+        Таблица расписания просматривается заново только после момента
+        следующей смены, в остальное время проверяется одно время.
+        """
         if not self.config:
             logger.debug("Конфигурация отсутствует")
             return None
 
-        current_time = datetime.now().strftime("%H:%M")
-        logger.debug("Поиск активной конфигурации для времени %s", current_time)
+        now = datetime.now()
+        state = self._schedule_state
+        if state is None or (
+            state.next_transition is not None and now >= state.next_transition
+        ):
+            state = self._schedule_state = self.schedule.lookup(now)
+            logger.debug(
+                "Активная конфигурация: %s, следующая смена расписания: %s",
+                state.config["region"] if state.config else None,
+                state.next_transition,
+            )
 
-        for region_config in self.config:
-            start_time = region_config["start_time"]
-            end_time = region_config["end_time"]
+        return state.config
 
-            if start_time > end_time:
-                if current_time >= start_time or current_time < end_time:
-                    logger.debug(
-                        "Найдена активная конфигурация: %s", region_config["region"]
-                    )
-                    return region_config
-            else:
-                if start_time <= current_time < end_time:
-                    logger.debug(
-                        "Найдена активная конфигурация: %s", region_config["region"]
-                    )
-                    return region_config
+    def _window_deadline(self) -> Optional[float]:
+        """Момент смены расписания (timestamp) или None, если смены нет."""
 
-        logger.debug("Активная конфигурация не найдена")
-        return None
+        if self._schedule_state is None or self._schedule_state.next_transition is None:
+            return None
+        return self._schedule_state.next_transition.timestamp()
+
+    def _switch_account(self, email: Optional[str], target: str) -> None:
+        """Меняет аккаунт и перезапускает приложение, замеряя длительность."""
+
+        logger.info("Смена аккаунта с %s на %s", email, target)
+        start = time.monotonic()
+
+        self.navigation_manager.go_to_start_feed()
+        self.account_switcher.change_user(email=target)
+        time.sleep(0.25)
+        self._restart_app()
+        logger.debug("Приложение перезапущено после смены аккаунта")
+
+        self.switch_latency.record(time.monotonic() - start)
+
+    def _wait_next_window(self, email: Optional[str]) -> None:
+        """Ожидает открытия следующего окна расписания.
+
+        Если следующее окно требует другого аккаунта, ожидание прерывается
+        за switch_latency.lead_time до открытия окна и аккаунт меняется
+        заранее, чтобы сканирование началось сразу с открытием окна.
+        """
+        deadline = self._window_deadline()
+        wait_time = max(deadline - time.time(), 1) if deadline else 60
+
+        state = self._schedule_state
+        next_config = state.next_config if state and deadline else None
+        if (
+            settings.screen.account_preswitch
+            and next_config is not None
+            and email != next_config["email"]
+        ):
+            lead_time = self.switch_latency.lead_time
+            if wait_time <= lead_time:
+                logger.info(
+                    "Окно расписания откроется через %.0f с, смена аккаунта заранее",
+                    wait_time,
+                )
+                self._switch_account(email=email, target=next_config["email"])
+                return
+
+            wait_time -= lead_time
+
+        logger.info("Конфигурация не активна, ожидание %.0f секунд", wait_time)
+        time.sleep(wait_time)
 
     def run(self) -> None:
         if self.config is None:
@@ -159,34 +447,30 @@ class GoogleParser(MainClass):
         logger.info("Запуск основного цикла парсера")
 
         try:
-            self.app.start()
+            if self.pipeline:
+                self.pipeline.start()
+
+            self._start_app(stop=True)
 
             while True:
                 email = self.account_switcher.get_current_user()
                 current_config = self.get_current_config()
 
                 if not current_config:
-                    logger.debug("Конфигурация не активна, ожидание 60 секунд")
-                    time.sleep(60)
+                    self._wait_next_window(email=email)
                     continue
 
                 if email != current_config["email"]:
-                    logger.info(
-                        "Смена аккаунта с %s на %s", email, current_config["email"]
-                    )
-                    self.navigation_manager.go_to_start_feed()
-                    self.account_switcher.change_user(email=current_config["email"])
-                    time.sleep(0.25)
-                    self.app.close()
-                    self.app.start()
-                    logger.debug("Приложение перезапущено после смены аккаунта")
+                    self._switch_account(email=email, target=current_config["email"])
 
                 need_account_switch = False
                 ads_count = 0
                 arbitrage_count = 0
 
                 while True:
-                    for ads_node in self.navigation_manager.find_ads():
+                    for ads_node in self.navigation_manager.find_ads(
+                        deadline=self._window_deadline()
+                    ):
                         if need_account_switch:
                             break
 
@@ -199,32 +483,18 @@ class GoogleParser(MainClass):
                             continue
 
                         if ads_node:
-                            image = self.data_interpreter.get_image(node=ads_node)
-                            if self.content_analyzer.is_arbitrage(image=image):
-                                text = self.data_interpreter.get_text(node=ads_node)
-                                url = self.data_interpreter.get_link(node=ads_node)
-
-                                if url and text:
-                                    hash_name = hashlib.md5(
-                                        url.encode("utf-8")
-                                    ).hexdigest()
-                                    download_dir: Path = (
-                                        self.download_dir
-                                        / current_config["region"]
-                                        / hash_name
-                                    )
-                                    download_dir.mkdir(parents=True, exist_ok=True)
-
-                                    image.save(download_dir / "image.png")
-                                    with (download_dir / "info.txt").open(
-                                        mode="w", encoding="utf-8"
-                                    ) as file:
-                                        data = f"url: {url}\ntext: {text}"
-                                        file.write(data)
-
-                                    logger.info(
-                                        "Сохранена арбитражная реклама: %s...", url[:50]
-                                    )
+                            ads_count += 1
+                            if self._process_ad(
+                                ads_node=ads_node, region=current_config["region"]
+                            ):
+                                arbitrage_count += 1
+
+                    # Проход мог завершиться по закрытию окна расписания
+                    if not need_account_switch and (
+                        self.get_current_config() != current_config
+                    ):
+                        logger.info("Окно расписания закрылось, требуется смена")
+                        need_account_switch = True
 
                     if ads_count > 0:
                         logger.debug(
@@ -233,14 +503,29 @@ class GoogleParser(MainClass):
                             arbitrage_count,
                         )
 
+                    if self.pipeline:
+                        logger.debug("Конвейер классификации: %s", self.pipeline.stats)
+
+                    if self.content_analyzer.cache:
+                        self.content_analyzer.cache.log_stats()
+
+                    if self.text_prefilter:
+                        self.text_prefilter.log_stats()
+
+                    if self.seen_ads:
+                        self.seen_ads.log_stats()
+
+                    self.navigation_manager.log_detection_stats()
+                    self.screen.settle.log_stats()
+                    self.data_interpreter.sponsored_node_chain.log_stats()
+
+                    if self.frame_ring:
+                        self.frame_ring.log_stats()
+
                     if need_account_switch:
                         break
 
-                    logger.debug("Обновление ленты и перезапуск приложения")
-                    self.app.close()
-                    self.app.start()
-                    self.navigation_manager.update_feed()
-                    time.sleep(5)
+                    self._refresh_feed()
                     ads_count = 0
                     arbitrage_count = 0
 
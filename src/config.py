@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import List, Literal, Optional
 
 from pydantic import DirectoryPath, Field, FilePath, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -23,12 +24,20 @@ class PathSettings(BaseSettings):
     logs_dir: Path = Path("logs")
     log_file: Path = logs_dir / "google_parser.log"
 
+    cache_dir: Path = Path("cache")
+    classification_cache_file: Path = cache_dir / "classifications.sqlite3"
+    seen_ads_file: Path = cache_dir / "seen_ads.sqlite3"
+    switch_latency_file: Path = cache_dir / "switch_latency.sqlite3"
+
     config_dir: DirectoryPath = Path("configs")
     prompt_file: FilePath = config_dir / "prompt.md"
     region_emails_file: FilePath = config_dir / "region_emails.json"
     device_schedule_file: FilePath = config_dir / "device_schedule.json"
+    prefilter_keywords_file: FilePath = config_dir / "prefilter_keywords.json"
+    ocr_profiles_file: FilePath = config_dir / "ocr_profiles.json"
+    sponsored_templates_dir: Path = config_dir / "templates" / "sponsored"
 
-    @field_validator("logs_dir", "config_dir")
+    @field_validator("logs_dir", "cache_dir", "config_dir")
     @classmethod
     def create_directories(cls, v: Path) -> Path:
         """Автоматическое создание директорий"""
@@ -38,9 +47,78 @@ class PathSettings(BaseSettings):
 
 class TimeoutSettings(BaseSettings):
     action_timeout: float = 0.5
-
-
-class NumericalSettings(BaseSettings): ...
+    frame_cache_ttl: float = 2.0
+    settle_timeout: float = 1.5
+    refresh_settle_timeout: float = 8.0
+    settle_poll_interval: float = 0.05
+    transition_min_interval: float = 0.05
+    transition_max_interval: float = 0.5
+    app_start_timeout: float = 10.0
+    app_close_timeout: float = 5.0
+    back_transition_timeout: float = 1.0
+    account_switch_initial: float = 30.0
+    account_switch_margin: float = 5.0
+    account_switch_max_lead: float = 300.0
+
+
+class NumericalSettings(BaseSettings):
+    card_label_tolerance: int = 48
+    card_dedup_distance: int = 4
+
+
+class ScreenSettings(BaseSettings):
+    hierarchy_snapshot: bool = True
+    hierarchy_detection: bool = True
+    frame_source: Literal["uiautomator2", "screencap_raw"] = "uiautomator2"
+    adb_path: str = "adb"
+    settle_detection: bool = True
+    settle_scale: float = 0.2
+    settle_quality: int = 30
+    settle_threshold: float = 6.0
+    warm_refresh: bool = True
+    warm_refresh_limit: int = 5
+    stale_feed_distance: int = 4
+    account_preswitch: bool = True
+
+
+class ClassifierSettings(BaseSettings):
+    async_classification: bool = False
+    classification_workers: int = 2
+    classification_queue_size: int = 8
+    classification_backpressure: Literal["block", "drop_oldest", "skip"] = "block"
+    classification_cache: bool = True
+    classification_cache_distance: int = 6
+    classification_cache_ttl: float = 7 * 24 * 3600
+    classification_cache_max_entries: int = 50_000
+    image_max_edge: Optional[int] = 1024
+    image_format: Literal["PNG", "JPEG", "WEBP"] = "JPEG"
+    image_quality: int = 85
+    image_detail: Literal["auto", "low", "high"] = "auto"
+    text_prefilter: bool = True
+    seen_ad_index: bool = True
+    seen_ad_window: float = 6 * 3600
+    seen_ad_distance: int = 4
+
+
+class OcrSettings(BaseSettings):
+    ocr_backend: Literal["pytesseract", "tesserocr"] = "pytesseract"
+    tessdata_path: Optional[str] = None
+    ocr_service: bool = False
+    ocr_service_workers: Optional[int] = None
+    ocr_service_queue_size: int = 4
+    ocr_service_timeout: float = 60.0
+    frame_ring: bool = True
+    frame_ring_slots: int = 4
+    navigation_profile: str = "feed_scan"
+    interpreter_profile: str = "default"
+    card_profile: str = "default"
+    template_prefilter: bool = True
+    template_threshold: float = 0.75
+    template_scales: List[float] = [0.9, 1.0, 1.1]
+    template_downscale: int = 3
+    template_verify_margin: int = 24
+    incremental_scan: bool = True
+    incremental_scan_margin: int = 96
 
 
 class Settings:
@@ -48,6 +126,9 @@ class Settings:
     path = PathSettings()
     timeout = TimeoutSettings()
     numeric = NumericalSettings()
+    ocr = OcrSettings()
+    screen = ScreenSettings()
+    classifier = ClassifierSettings()
 
 
 settings = Settings()
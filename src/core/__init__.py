@@ -1,13 +1,23 @@
 from .account_orchestrator import AccountSwitcher
+from .classification_pipeline import AdJob, ClassificationPipeline
 from .content_analyzer import ContentAnalyzer
 from .data_interpreter import DataInterpreter
+from .detection_chain import DetectionChain, StrategyStats
 from .main_class import MainClass
 from .navigation_manager import NavigationManager
+from .screen_cache import ScreenCache
+from .text_prefilter import TextPrefilter
 
 __all__ = [
+    "AdJob",
     "MainClass",
     "ContentAnalyzer",
     "DataInterpreter",
+    "DetectionChain",
+    "StrategyStats",
     "AccountSwitcher",
+    "ScreenCache",
+    "TextPrefilter",
     "NavigationManager",
+    "ClassificationPipeline",
 ]
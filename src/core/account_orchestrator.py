@@ -35,11 +35,12 @@ class AccountSwitcher(MainClass):
         """
         logger.debug("Получение текущего пользователя")
 
-        if not self.nodes.buttons.selected_account.exists:
+        selected_account = self._node(self.nodes.buttons.selected_account)
+        if not selected_account.exists:
             logger.debug("Элемент выбранного аккаунта не найден")
             return None
 
-        text: str = self.nodes.buttons.selected_account.info.get("contentDescription")
+        text: str = selected_account.info.get("contentDescription")
         if not text:
             logger.debug("Описание аккаунта пустое")
             return None
@@ -85,13 +86,13 @@ class AccountSwitcher(MainClass):
 
         # Открываем меню выбора аккаунта
         logger.debug("Открытие меню выбора аккаунта")
-        self.nodes.buttons.selected_account.click_exists(timeout=timeout)
+        self._click(self.nodes.buttons.selected_account, timeout=timeout)
 
         # Переходим к списку аккаунтов
         logger.debug("Переход к списку аккаунтов")
         if not self.nodes.accounts.account_management.exists:
-            self.nodes.accounts.accounts_label.click_exists(timeout=timeout)
-        self.nodes.accounts.account_management.click_exists(timeout=timeout)
+            self._click(self.nodes.accounts.accounts_label, timeout=timeout)
+        self._click(self.nodes.accounts.account_management, timeout=timeout)
 
         # Прокручиваем список аккаунтов
         logger.debug("Прокрутка списка аккаунтов")
@@ -107,11 +108,11 @@ class AccountSwitcher(MainClass):
 
         # Поиск и выбор нужного аккаунта
         logger.debug("Поиск аккаунта %s в списке", email)
-        accounts = self.nodes.accounts.accounts_info
+        accounts = self._node(self.nodes.accounts.accounts_info)
         account_found = False
         for account in accounts:
             if account.info["text"] == email:
-                account.click_exists(timeout=timeout)
+                self._click(account, timeout=timeout)
                 account_found = True
                 logger.info("Аккаунт %s успешно выбран", email)
                 time.sleep(enter_back_timeout)
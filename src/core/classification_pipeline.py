@@ -0,0 +1,195 @@
+import queue
+import time
+from dataclasses import dataclass, field
+from threading import Lock, Thread
+from typing import Callable, List, Literal, Optional
+
+from PIL.Image import Image
+
+from src.utils import get_logger
+
+from .content_analyzer import ContentAnalyzer
+
+logger = get_logger(name="classification-pipeline")
+
+BackpressurePolicy = Literal["block", "drop_oldest", "skip"]
+
+
+@dataclass
+class AdJob:
+    """Все данные объявления, необходимые для классификации и сохранения."""
+
+    image: Image
+    text: Optional[str]
+    url: Optional[str]
+    region: str
+    phash: Optional[int] = None
+    created_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class PipelineStats:
+    """Счетчики фонового конвейера классификации."""
+
+    submitted: int = 0
+    classified: int = 0
+    arbitrage: int = 0
+    dropped: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+class ClassificationPipeline:
+    """Фоновая классификация объявлений, отвязанная от цикла прокрутки.
+
+    Цикл прокрутки кладет задачи в ограниченную очередь, рабочие потоки
+    классифицируют их и передают арбитражные объявления обработчику.
+    При заполненной очереди применяется политика backpressure:
+    block - ждать свободного места, drop_oldest - вытеснить самую старую
+    задачу, skip - отбросить новую задачу.
+    """
+
+    def __init__(
+        self,
+        content_analyzer: ContentAnalyzer,
+        on_arbitrage: Callable[[AdJob], None],
+        on_non_arbitrage: Optional[Callable[[AdJob], None]] = None,
+        workers: int = 2,
+        queue_size: int = 8,
+        policy: BackpressurePolicy = "block",
+    ) -> None:
+        """
+        Args:
+            content_analyzer: Классификатор объявлений
+            on_arbitrage: Обработчик арбитражных объявлений (сохранение)
+            on_non_arbitrage: Обработчик объявлений, классифицированных как
+                обычная реклама
+            workers: Количество рабочих потоков
+            queue_size: Максимальный размер очереди задач
+            policy: Политика при заполненной очереди
+        """
+        self.content_analyzer = content_analyzer
+        self.on_arbitrage = on_arbitrage
+        self.on_non_arbitrage = on_non_arbitrage
+        self.policy = policy
+        self.stats = PipelineStats()
+
+        self._queue: "queue.Queue[Optional[AdJob]]" = queue.Queue(maxsize=queue_size)
+        self._stats_lock = Lock()
+        self._threads: List[Thread] = [
+            Thread(
+                target=self._worker,
+                name=f"classifier-{index}",
+                daemon=True,
+            )
+            for index in range(workers)
+        ]
+
+    def start(self) -> None:
+        """Запускает рабочие потоки."""
+
+        for thread in self._threads:
+            thread.start()
+        logger.info(
+            "Конвейер классификации запущен: потоков=%d, очередь=%d, политика=%s",
+            len(self._threads),
+            self._queue.maxsize,
+            self.policy,
+        )
+
+    def submit(self, job: AdJob) -> bool:
+        """
+        Ставит объявление в очередь на классификацию.
+
+        Args:
+            job: Данные объявления
+
+        Returns:
+            True, если задача принята в очередь
+        """
+        if self.policy == "block":
+            self._queue.put(job)
+            self._count("submitted")
+            return True
+
+        try:
+            self._queue.put_nowait(job)
+            self._count("submitted")
+            return True
+        except queue.Full:
+            pass
+
+        if self.policy == "skip":
+            self._count("skipped")
+            logger.warning("Очередь классификации заполнена, объявление пропущено")
+            return False
+
+        # drop_oldest: вытесняем самую старую задачу
+        try:
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self._count("dropped")
+            logger.warning("Очередь классификации заполнена, вытеснена старая задача")
+        except queue.Empty:
+            pass
+
+        try:
+            self._queue.put_nowait(job)
+            self._count("submitted")
+            return True
+        except queue.Full:
+            self._count("skipped")
+            return False
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Дожидается обработки очереди и останавливает рабочие потоки.
+
+        Args:
+            timeout: Максимальное время ожидания каждого потока
+        """
+        alive_threads = [thread for thread in self._threads if thread.is_alive()]
+        for _ in alive_threads:
+            self._queue.put(None)
+        for thread in alive_threads:
+            thread.join(timeout=timeout)
+
+        logger.info("Конвейер классификации остановлен: %s", self.stats)
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._process(job)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, job: AdJob) -> None:
+        try:
+            is_arbitrage = self.content_analyzer.check_arbitrage(image=job.image)
+            if is_arbitrage is None:
+                self._count("failed")
+                return
+
+            self._count("classified")
+
+            logger.debug(
+                "Объявление классифицировано за %.1f с после постановки в очередь",
+                time.monotonic() - job.created_at,
+            )
+
+            if is_arbitrage:
+                self._count("arbitrage")
+                self.on_arbitrage(job)
+            elif self.on_non_arbitrage:
+                self.on_non_arbitrage(job)
+
+        except Exception as e:
+            self._count("failed")
+            logger.error("Ошибка обработки объявления в конвейере: %s", e)
@@ -1,15 +1,15 @@
 import base64
 import json
 from io import BytesIO
-from typing import Optional
+from typing import Literal, Optional
 
 import requests
 from httpx import Client
 from openai import OpenAI
-from PIL.Image import Image
+from PIL.Image import Image, Resampling
 
 from src.models import ClassificationResult
-from src.utils import get_logger
+from src.utils import ClassificationCache, get_logger, perceptual_hash
 
 logger = get_logger(name="content-analyzer")
 
@@ -17,19 +17,55 @@ logger = get_logger(name="content-analyzer")
 class ContentAnalyzer:
     """Классификатор рекламных объявлений для определения арбитража трафика."""
 
-    def __init__(self, api_key: str, prompt: str, proxy: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        prompt: str,
+        proxy: Optional[str] = None,
+        cache: Optional[ClassificationCache] = None,
+        image_max_edge: Optional[int] = None,
+        image_format: Literal["PNG", "JPEG", "WEBP"] = "PNG",
+        image_quality: int = 85,
+        image_detail: Literal["auto", "low", "high"] = "auto",
+    ) -> None:
         self.model = "gpt-4o"
         self.prompt = prompt
+        self.cache = cache
+        self.image_max_edge = image_max_edge
+        self.image_format = image_format
+        self.image_quality = image_quality
+        self.image_detail = image_detail
         self.client = OpenAI(api_key=api_key, http_client=Client(proxy=proxy))
         logger.info("ContentAnalyzer инициализирован")
 
+    def _prepare_image(self, image: Image) -> Image:
+        """Уменьшает изображение до максимальной длины стороны."""
+        if self.image_max_edge and max(image.size) > self.image_max_edge:
+            ratio = self.image_max_edge / max(image.size)
+            new_size = (
+                max(1, round(image.width * ratio)),
+                max(1, round(image.height * ratio)),
+            )
+            image = image.resize(new_size, Resampling.LANCZOS)
+
+        if self.image_format != "PNG" and image.mode != "RGB":
+            image = image.convert("RGB")
+
+        return image
+
     def _image_to_base64(self, image: Image) -> str:
         """Конвертирует изображение в base64 data URL."""
         try:
             buffered = BytesIO()
-            image.save(buffered, format="PNG")
+            save_kwargs = {}
+            if self.image_format != "PNG":
+                save_kwargs["quality"] = self.image_quality
+
+            self._prepare_image(image).save(
+                buffered, format=self.image_format, **save_kwargs
+            )
             img_str = base64.b64encode(buffered.getvalue()).decode()
-            return f"data:image/png;base64,{img_str}"
+            return f"data:image/{self.image_format.lower()};base64,{img_str}"
         except Exception as e:
             logger.error("Ошибка конвертации изображения: %s", str(e))
             raise
@@ -40,6 +76,18 @@ class ContentAnalyzer:
         """Классифицирует рекламное объявление на предмет арбитража трафика."""
         logger.info("Начата классификация рекламного объявления")
 
+        phash = None
+        if self.cache:
+            phash = perceptual_hash(image)
+            cached_result = self.cache.get(phash)
+            if cached_result:
+                logger.info(
+                    "Результат классификации взят из кэша: %s (confidence: %.2f)",
+                    cached_result["label"],
+                    cached_result["confidence"],
+                )
+                return cached_result
+
         try:
             image_data_url = self._image_to_base64(image)
 
@@ -49,7 +97,10 @@ class ContentAnalyzer:
                     {"type": "text", "text": f"Контекст: {description}"}
                 )
             user_content.append(
-                {"type": "image_url", "image_url": {"url": image_data_url}}
+                {
+                    "type": "image_url",
+                    "image_url": {"url": image_data_url, "detail": self.image_detail},
+                }
             )
 
             response = self.client.chat.completions.create(
@@ -67,6 +118,9 @@ class ContentAnalyzer:
             data = json.loads(response_data)
             result = ClassificationResult(**data)
 
+            if self.cache:
+                self.cache.put(phash, result)
+
             logger.info(
                 "Классификация завершена: %s (confidence: %.2f)",
                 result["label"],
@@ -81,8 +135,10 @@ class ContentAnalyzer:
             logger.error("Ошибка классификации: %s", str(e))
             raise
 
-    def is_arbitrage(self, image: Image, min_confidence: float = 0.6) -> bool:
-        """Проверяет, является ли объявление арбитражем трафика."""
+    def check_arbitrage(
+        self, image: Image, min_confidence: float = 0.6
+    ) -> Optional[bool]:
+        """Проверяет объявление на арбитраж; None, если классификация не удалась."""
         logger.info("Проверка на арбитраж с уверенностью: %.2f", min_confidence)
 
         try:
@@ -97,4 +153,8 @@ class ContentAnalyzer:
 
         except Exception as e:
             logger.error("Ошибка проверки на арбитраж: %s", str(e))
-            return False
+            return None
+
+    def is_arbitrage(self, image: Image, min_confidence: float = 0.6) -> bool:
+        """Проверяет, является ли объявление арбитражем трафика."""
+        return bool(self.check_arbitrage(image, min_confidence=min_confidence))
@@ -1,11 +1,15 @@
+import re
 from typing import Optional, Tuple
 
 from PIL.Image import Image
 from uiautomator2 import Device, UiObject
 
+from src.config import settings
 from src.elements import Buttons, Classes
-from src.utils import Tesseract, get_logger
+from src.models import Coordinates
+from src.utils import Tesseract, get_logger, get_ocr_profile
 
+from .detection_chain import DetectionChain
 from .main_class import MainClass
 
 logger = get_logger(name="data-interpreter")
@@ -14,11 +18,23 @@ logger = get_logger(name="data-interpreter")
 class DataInterpreter(MainClass):
     """Класс для извлечения и интерпретации данных из UI элементов."""
 
+    SPONSORED_PHRASE = "sponsored"
+    GOOGLE_PLAY_PHRASE = "google play:"
+    GOOGLE_PLAY_LABEL = re.compile(r"google play:", re.IGNORECASE)
+
     def __init__(
         self,
         device: Device,
     ) -> None:
         super().__init__(device=device)
+        self.ocr_profile = get_ocr_profile(settings.ocr.interpreter_profile)
+
+        strategies = [("ocr", self._find_sponsored_node_by_ocr)]
+        if settings.screen.hierarchy_detection:
+            strategies.insert(0, ("hierarchy", self._find_sponsored_node_in_hierarchy))
+        self.sponsored_node_chain: DetectionChain[UiObject] = DetectionChain(
+            name="Элемент 'sponsored' карточки", strategies=strategies
+        )
 
     def _get_largest_image_node(
         self,
@@ -76,12 +92,46 @@ class DataInterpreter(MainClass):
 
         return None
 
-    def _find_sponsored_node(
+    def _find_sponsored_node_in_hierarchy(
         self,
         node: UiObject,
     ) -> Optional[UiObject]:
         """
-        Находит элемент, содержащий текст 'sponsored'.
+        Находит элемент с меткой 'sponsored' по снимку иерархии.
+
+        Args:
+            node: Родительский UI элемент
+
+        Returns:
+            UiObject или None, если метки нет в иерархии или это реклама
+            приложения из Google Play
+        """
+        labels = self._find_text_bounds(self.SPONSORED_LABEL)
+        if not labels:
+            return None
+
+        google_play_labels = self._find_text_bounds(self.GOOGLE_PLAY_LABEL)
+        for view_node in node.child(**Classes.view_group):
+            view_bounds = Coordinates(*view_node.bounds())
+            if not any(
+                view_bounds.contains_point(label.center_x, label.center_y)
+                for label in labels
+            ):
+                continue
+
+            for label in google_play_labels:
+                if view_bounds.contains_point(label.center_x, label.center_y):
+                    return None
+            return view_node
+
+        return None
+
+    def _find_sponsored_node_by_ocr(
+        self,
+        node: UiObject,
+    ) -> Optional[UiObject]:
+        """
+        Находит элемент, содержащий текст 'sponsored', распознаванием.
 
         Args:
             node: Родительский UI элемент
@@ -93,12 +143,13 @@ class DataInterpreter(MainClass):
 
         for view_node in view_group_nodes:
             try:
-                if Tesseract.find_matches_by_word(
-                    image=view_node.screenshot(), target_word="sponsored"
-                ):
-                    if Tesseract.find_matches_by_word(
-                        image=view_node.screenshot(), target_word="google play:"
-                    ):
+                matches = Tesseract.find_matches_by_words(
+                    image=self._frame_region(bounds=view_node.bounds()),
+                    phrases=(self.SPONSORED_PHRASE, self.GOOGLE_PLAY_PHRASE),
+                    profile=self.ocr_profile,
+                )
+                if matches[self.SPONSORED_PHRASE]:
+                    if matches[self.GOOGLE_PLAY_PHRASE]:
                         return None
                     return view_node
             except Exception as e:
@@ -108,6 +159,24 @@ class DataInterpreter(MainClass):
         logger.debug("Элемент со словом 'sponsored' не найден")
         return None
 
+    def _find_sponsored_node(
+        self,
+        node: UiObject,
+    ) -> Optional[UiObject]:
+        """
+        Находит элемент, содержащий текст 'sponsored'.
+
+        Сначала элемент ищется по снимку иерархии, распознавание
+        выполняется, только если метки там нет.
+
+        Args:
+            node: Родительский UI элемент
+
+        Returns:
+            UiObject или None, если элемент не найден
+        """
+        return self.sponsored_node_chain.run(node)
+
     def _extract_link_from_content(
         self,
         content_text: str,
@@ -143,7 +212,7 @@ class DataInterpreter(MainClass):
         try:
             image_node = self._get_largest_image_node(node)
             if image_node:
-                return image_node.screenshot()
+                return self._node_screenshot(image_node)
 
             logger.debug("Элементы изображений не найдены")
             return None
@@ -193,11 +262,11 @@ class DataInterpreter(MainClass):
                 logger.debug("Спонсируемый элемент не найден")
                 return None
 
-            if not sponsored_node.click_exists(timeout=timeout):
+            if not self._click(sponsored_node, timeout=timeout):
                 logger.debug("Не удалось кликнуть на спонсируемый элемент")
                 return None
 
-            if not self.nodes.buttons.share_link.click_exists(timeout=timeout):
+            if not self._click(self.nodes.buttons.share_link, timeout=timeout):
                 logger.debug("Кнопка share link не найдена или недоступна для клика")
                 return None
 
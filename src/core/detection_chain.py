@@ -0,0 +1,103 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Optional, Sequence, Tuple, TypeVar
+
+from src.utils import get_logger
+
+logger = get_logger(name="detection-chain")
+
+T = TypeVar("T")
+
+
+@dataclass
+class StrategyStats:
+    """Статистика одной стратегии поиска."""
+
+    calls: int = 0
+    hits: int = 0
+    total_time: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.calls if self.calls else 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class DetectionChain(Generic[T]):
+    """Цепочка стратегий поиска элемента, от дешевых к дорогим.
+
+    Стратегии вызываются по порядку, пока одна из них не вернет результат.
+    Для каждой стратегии считаются вызовы, попадания и время, поэтому по
+    логам видно, как часто поиск доходит до OCR.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        strategies: Sequence[Tuple[str, Callable[..., Optional[T]]]],
+    ) -> None:
+        """
+        Args:
+            name: Название цели поиска для логов
+            strategies: Пары (название стратегии, функция поиска)
+        """
+        self.name = name
+        self.strategies = list(strategies)
+        self.stats: Dict[str, StrategyStats] = {
+            strategy_name: StrategyStats() for strategy_name, _ in self.strategies
+        }
+        self.runs = 0
+        self.misses = 0
+
+    def run(self, *args: Any, **kwargs: Any) -> Optional[T]:
+        """
+        Выполняет стратегии по порядку.
+
+        Returns:
+            Результат первой успешной стратегии или None
+        """
+        self.runs += 1
+
+        for strategy_name, strategy in self.strategies:
+            stats = self.stats[strategy_name]
+            start = time.perf_counter()
+            try:
+                result = strategy(*args, **kwargs)
+            finally:
+                stats.calls += 1
+                stats.total_time += time.perf_counter() - start
+
+            if result is not None:
+                stats.hits += 1
+                logger.debug("%s: найдено стратегией %s", self.name, strategy_name)
+                return result
+
+        self.misses += 1
+        return None
+
+    def log_stats(self) -> None:
+        """Выводит попадания и среднее время каждой стратегии."""
+
+        if not self.runs:
+            return
+
+        logger.info(
+            "%s: поисков %d, не найдено %d; %s",
+            self.name,
+            self.runs,
+            self.misses,
+            ", ".join(
+                "%s %d/%d (%.0f%%, %.1f мс)"
+                % (
+                    strategy_name,
+                    stats.hits,
+                    stats.calls,
+                    stats.hit_rate * 100,
+                    stats.mean_time * 1000,
+                )
+                for strategy_name, stats in self.stats.items()
+            ),
+        )
@@ -1,15 +1,31 @@
+import re
 import time
+from typing import List, Optional, Pattern, Sequence, Union
 
-from uiautomator2 import Device
+from PIL.Image import Image
+from uiautomator2 import Device, UiObject
 
-from src.elements import Nodes
+from src.config import settings
+from src.elements import Nodes, SnapshotObject, parse_bounds
+from src.models import Coordinates
+from src.utils import Frame, FrameRegion, TransitionWaiter
+
+from .screen_cache import ScreenCache
 
 
 class MainClass:
+    # Метка рекламной карточки в text или contentDescription элементов
+    SPONSORED_LABEL = re.compile(r"^\s*sponsored\b", re.IGNORECASE)
 
     def __init__(self, device: Device) -> None:
         self.device = device
         self.nodes = Nodes(device=device)
+        self.screen = ScreenCache.for_device(device=device)
+        self.transitions = TransitionWaiter(
+            device=device,
+            min_interval=settings.timeout.transition_min_interval,
+            max_interval=settings.timeout.transition_max_interval,
+        )
 
         self._screen_width = self.device.info["displayWidth"]
         self._screen_height = self.device.info["displayHeight"]
@@ -21,7 +37,7 @@ class MainClass:
         min_swipe_length: int = 35,
         swipe_speed_factor: int = 2000,
         wait_time: float = 0.1,
-    ) -> None:
+    ) -> bool:
         """
         Выполняет свайп по вертикали.
 
@@ -31,10 +47,13 @@ class MainClass:
             min_swipe_length: Минимальная длина свайпа
             swipe_speed_factor: Фактор скорости свайпа
             wait_time: Время ожидания после свайпа
+
+        Returns:
+            True, если свайп выполнен
         """
         swipe_length = abs(start_y - end_y)
         if swipe_length < min_swipe_length:
-            return None
+            return False
 
         duration = 1 * (swipe_length / swipe_speed_factor)
         self.device.swipe_points(
@@ -44,24 +63,168 @@ class MainClass:
             ],
             duration=duration,
         )
-        time.sleep(wait_time)
+        self._invalidate_screen()
+        self._wait_settled(baseline=wait_time)
+        return True
+
+    def _wait_settled(
+        self,
+        baseline: float,
+        timeout: Optional[float] = None,
+        motion_only: bool = True,
+    ) -> None:
+        """
+        Ждет стабилизации экрана после действия.
+
+        Если ожидание отключено в настройках или источник кадров не умеет
+        снимать уменьшенные кадры без передачи полного кадра (тогда каждая
+        проверка дольше самой паузы), выполняется прежняя фиксированная пауза.
+
+        Args:
+            baseline: Фиксированная пауза, которую заменяет ожидание
+            timeout: Максимальное время ожидания
+            motion_only: Достаточно остановки скролла (см. SettleDetector)
+        """
+        if not (
+            settings.screen.settle_detection
+            and self.screen.settle.frame_source.fast_preview
+        ):
+            time.sleep(baseline)
+            return
+
+        self.screen.settle.wait(
+            timeout=timeout if timeout is not None else settings.timeout.settle_timeout,
+            baseline=baseline,
+            motion_only=motion_only,
+        )
+
+    def _invalidate_screen(self) -> None:
+        """Сбрасывает кэшированное состояние экрана после действия."""
+        self.screen.invalidate()
+
+    def _node(self, node: UiObject) -> Union[UiObject, SnapshotObject]:
+        """
+        Возвращает элемент для чтения состояния текущего экрана.
+
+        В режиме снимка иерархии селектор вычисляется локально по одному
+        dump_hierarchy() на состояние UI, иначе возвращается сам UiObject.
+
+        Args:
+            node: UI элемент
+
+        Returns:
+            Элемент снимка иерархии или исходный UiObject
+        """
+        if not settings.screen.hierarchy_snapshot:
+            return node
+        return self.screen.get_hierarchy().node(node)
+
+    def _find_text_bounds(self, pattern: Pattern[str]) -> List[Coordinates]:
+        """
+        Находит в снимке иерархии элементы с текстом или описанием по шаблону.
+
+        Args:
+            pattern: Регулярное выражение для text и contentDescription
+
+        Returns:
+            Границы найденных элементов в порядке обхода дерева
+        """
+        return [
+            Coordinates(*parse_bounds(element.get("bounds", "")))
+            for element in self.screen.get_hierarchy().find_text(pattern)
+        ]
+
+    def _get_frame(self) -> Frame:
+        """
+        Возвращает кадр текущего состояния экрана.
+
+        Returns:
+            Кадр экрана в виде массива пикселей
+        """
+        return self.screen.get_frame()
+
+    def _crop_frame(self, bounds: Sequence[int]) -> Image:
+        """
+        Вырезает область из кадра текущего состояния экрана.
+
+        Args:
+            bounds: Границы области (left, top, right, bottom)
+
+        Returns:
+            Изображение области
+        """
+        return self.screen.crop(bounds=bounds)
+
+    def _frame_region(self, bounds: Sequence[int]) -> FrameRegion:
+        """
+        Возвращает область кадра текущего состояния экрана для OCR.
+
+        Args:
+            bounds: Границы области (left, top, right, bottom)
+
+        Returns:
+            Область кадра
+        """
+        return self.screen.region(bounds=bounds)
+
+    def _node_screenshot(self, node: UiObject) -> Image:
+        """
+        Получает изображение элемента из кадра текущего состояния экрана.
+
+        Args:
+            node: UI элемент
+
+        Returns:
+            Изображение элемента
+        """
+        return self._crop_frame(bounds=node.bounds())
+
+    def _click(self, node: UiObject, timeout: float = 0) -> bool:
+        """
+        Кликает по элементу, если он существует.
+
+        Args:
+            node: UI элемент
+            timeout: Таймаут ожидания элемента
+
+        Returns:
+            True, если клик выполнен
+        """
+        clicked = node.click_exists(timeout=timeout)
+        self._invalidate_screen()
+        return clicked
+
+    def _press_back(self) -> None:
+        """Нажимает кнопку 'Назад'."""
+        self.device.press("back")
+        self._invalidate_screen()
 
     def _back_to_feed_news(
         self,
-        timeout: float = 0.5,
+        timeout: Optional[float] = None,
         max_back_presses: int = 3,
     ) -> None:
         """
         Возвращает в ленту новостей с помощью кнопки 'Назад'.
 
+        После каждого нажатия появление ленты ожидается до срока timeout,
+        следующее нажатие выполняется, только если лента не появилась.
+
         Args:
+            timeout: Срок ожидания ленты после нажатия
             max_back_presses: Максимальное количество нажатий
         """
-        back_presses = 0
+        if timeout is None:
+            timeout = settings.timeout.back_transition_timeout
 
-        while (
-            not self.nodes.blocks.google_app.exists and back_presses < max_back_presses
-        ):
-            self.device.press("back")
-            back_presses += 1
-            time.sleep(timeout)
+        for _ in range(max_back_presses):
+            if self.nodes.blocks.google_app.exists:
+                return
+
+            self._press_back()
+            if self.transitions.wait_node(
+                self.nodes.blocks.google_app,
+                timeout=timeout,
+                name="возврат в ленту",
+            ):
+                return
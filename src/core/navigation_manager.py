@@ -1,20 +1,78 @@
 import time
-from typing import Generator, Optional
+from typing import Dict, Generator, List, NamedTuple, Optional, Sequence, Tuple
 
+import numpy as np
 from uiautomator2 import Device, UiObject
 
+from src.config import settings
 from src.elements import Classes
 from src.models import Coordinates
-from src.utils import Tesseract, get_logger
-
+from src.utils import (
+    ScrollStats,
+    TemplateDetector,
+    Tesseract,
+    estimate_scroll_offset,
+    get_logger,
+    get_ocr_profile,
+    hamming_distance,
+    perceptual_hash,
+    row_profile,
+)
+
+from .detection_chain import DetectionChain
 from .main_class import MainClass
 
 logger = get_logger("navigation-manager")
 
+# Кандидат в карточки ленты: (высота, узел, границы)
+CardCandidate = Tuple[int, UiObject, Tuple[int, int, int, int]]
+
+
+class SponsoredScan(NamedTuple):
+    """Результат распознавания кадра для инкрементального поиска меток."""
+
+    bounds: Coordinates
+    profile: np.ndarray
+    labels: List[Coordinates]
+
 
 class NavigationManager(MainClass):
     def __init__(self, device: Device) -> None:
         super().__init__(device=device)
+        self.ocr_profile = get_ocr_profile(settings.ocr.navigation_profile)
+        self.card_ocr_profile = get_ocr_profile(settings.ocr.card_profile)
+
+        self.sponsored_detector: Optional[TemplateDetector] = None
+        if settings.ocr.template_prefilter:
+            self.sponsored_detector = TemplateDetector.from_directory(
+                settings.path.sponsored_templates_dir,
+                scales=settings.ocr.template_scales,
+                threshold=settings.ocr.template_threshold,
+                downscale=settings.ocr.template_downscale,
+            )
+
+        # Последний распознанный кадр для распознавания только новой полосы
+        self._last_scan: Optional[SponsoredScan] = None
+        self.scroll_stats = ScrollStats()
+
+        # Сначала метка ищется в снимке иерархии, OCR - только если ее там нет
+        sponsored_strategies = [("ocr", self._find_sponsored_on_screen)]
+        ads_node_strategies = [("ocr", self._ads_node_from_ocr)]
+        if settings.screen.hierarchy_detection:
+            sponsored_strategies.insert(
+                0, ("hierarchy", self._find_sponsored_in_hierarchy)
+            )
+            ads_node_strategies.insert(0, ("hierarchy", self._ads_node_from_hierarchy))
+
+        # Если положение метки известно, карточка определяется по границам
+        ads_node_strategies.insert(0, ("geometry", self._ads_node_from_geometry))
+
+        self.sponsored_chain: DetectionChain[List[Coordinates]] = DetectionChain(
+            name="Метка 'sponsored'", strategies=sponsored_strategies
+        )
+        self.ads_node_chain: DetectionChain[UiObject] = DetectionChain(
+            name="Карточка рекламы", strategies=ads_node_strategies
+        )
 
     def _scroll_content(
         self,
@@ -39,63 +97,313 @@ class NavigationManager(MainClass):
         ads_coords: Coordinates,
         edge_offset: int = 150,
         action_timeout: float = 0.1,
-    ) -> None:
+    ) -> int:
         """
         Скроллит к указанному рекламному объявлению.
 
         Args:
             ads_coords: Координаты рекламного объявления
+
+        Returns:
+            Ожидаемое смещение контента вверх в пикселях
         """
         content_bounds = self.get_content_area_bounds()
-        self._swipe(
-            start_y=ads_coords.top - edge_offset,
+        start_y = ads_coords.top - edge_offset
+        swiped = self._swipe(
+            start_y=start_y,
             end_y=content_bounds.top,
             wait_time=action_timeout,
         )
+        return start_y - content_bounds.top if swiped else 0
 
-    def _find_sponsored(self) -> Optional[Coordinates]:
+    def _detect_sponsored_candidates(
+        self,
+        content_bounds: Coordinates,
+    ) -> List[Coordinates]:
         """
-        Поиск метки 'sponsored' на экране.
+        Быстрый поиск кандидатов метки 'sponsored' по шаблонам.
+
+        Args:
+            content_bounds: Границы области контента
 
         Returns:
-            Координаты найденной метки или None
+            Координаты кандидатов на экране
         """
-        content_bounds = self.get_content_area_bounds()
+        if not self.sponsored_detector or not self.sponsored_detector.enabled:
+            return []
+
+        content_pixels = self._get_frame().crop(content_bounds.to_list())
+        return [
+            Coordinates(
+                left=match.left + content_bounds.left,
+                top=match.top + content_bounds.top,
+                right=match.right + content_bounds.left,
+                bottom=match.bottom + content_bounds.top,
+            )
+            for match in self.sponsored_detector.detect(content_pixels)
+        ]
+
+    def _ocr_sponsored(
+        self,
+        bounds: Coordinates,
+    ) -> List[Coordinates]:
+        """
+        Ищет метки 'sponsored' распознаванием области экрана.
+
+        Args:
+            bounds: Границы области
+
+        Returns:
+            Координаты всех найденных меток на экране
+        """
+        return [
+            Coordinates(
+                top=crop_coords.top + bounds.top,
+                left=crop_coords.left + bounds.left,
+                right=crop_coords.right + bounds.left,
+                bottom=crop_coords.bottom + bounds.top,
+            )
+            for crop_coords in Tesseract.find_all_matches_by_word(
+                image=self._frame_region(bounds=bounds.to_list()),
+                target_word="sponsored",
+                profile=self.ocr_profile,
+            )
+        ]
+
+    @staticmethod
+    def _sort_labels(labels: List[Coordinates]) -> Optional[List[Coordinates]]:
+        """
+        Упорядочивает метки сверху вниз и убирает повторы.
 
-        screenshot = self.device.screenshot()
-        content_image = screenshot.crop(box=content_bounds.to_list())
+        Повторы возникают, когда области проверки соседних кандидатов
+        детектора шаблонов пересекаются.
 
-        sponsored_crop_coords = Tesseract.find_matches_by_word(
-            image=content_image,
-            target_word="sponsored",
-            scale=2,
-            contrast_factor=2,
+        Returns:
+            Метки или None, если их нет
+        """
+        unique: List[Coordinates] = []
+        for label in sorted(labels, key=lambda label: (label.top, label.left)):
+            if not any(
+                kept.contains_point(label.center_x, label.center_y) for kept in unique
+            ):
+                unique.append(label)
+        return unique or None
+
+    def _find_sponsored_in_hierarchy(
+        self,
+        content_bounds: Coordinates,
+    ) -> Optional[List[Coordinates]]:
+        """
+        Ищет метки 'sponsored' в text и contentDescription элементов.
+
+        Args:
+            content_bounds: Границы области контента
+
+        Returns:
+            Координаты видимых меток или None
+        """
+        return self._sort_labels(
+            [
+                label
+                for label in self._find_text_bounds(self.SPONSORED_LABEL)
+                if content_bounds.contains_point(label.center_x, label.center_y)
+            ]
         )
 
-        if sponsored_crop_coords and not self.nodes.buttons.more_stories.exists:
-            return Coordinates(
-                top=sponsored_crop_coords.top + content_bounds.top,
-                left=sponsored_crop_coords.left + content_bounds.left,
-                right=sponsored_crop_coords.right + content_bounds.left,
-                bottom=sponsored_crop_coords.bottom + content_bounds.top,
+    def _scan_sponsored(
+        self,
+        bounds: Coordinates,
+    ) -> List[Coordinates]:
+        """
+        Ищет метки 'sponsored' в области кадра.
+
+        Если детектор шаблонов нашел кандидатов, Tesseract проверяет только
+        небольшие области вокруг них. Распознавание всей области выполняется,
+        когда кандидатов нет или ни один кандидат не подтвердился, поэтому
+        ошибка детектора не теряет метки по сравнению с обычным OCR.
+
+        Args:
+            bounds: Границы области
+
+        Returns:
+            Координаты найденных меток
+        """
+        candidates = self._detect_sponsored_candidates(bounds)
+        if not candidates:
+            return self._ocr_sponsored(bounds)
+
+        margin = settings.ocr.template_verify_margin
+        labels: List[Coordinates] = []
+        for candidate in candidates:
+            labels.extend(
+                self._ocr_sponsored(
+                    Coordinates(
+                        left=max(bounds.left, candidate.left - margin),
+                        top=max(bounds.top, candidate.top - margin),
+                        right=min(bounds.right, candidate.right + margin),
+                        bottom=min(bounds.bottom, candidate.bottom + margin),
+                    )
+                )
+            )
+
+        if not labels:
+            logger.debug("Кандидаты шаблонов не подтвердились, OCR всей области")
+            return self._ocr_sponsored(bounds)
+
+        return labels
+
+    def _find_sponsored_on_screen(
+        self,
+        content_bounds: Coordinates,
+    ) -> Optional[List[Coordinates]]:
+        """
+        Ищет метки 'sponsored' на кадре экрана.
+
+        Смещение ленты относительно предыдущего распознанного кадра
+        оценивается по профилям строк. Если кадры совпадают со сдвигом,
+        метки предыдущего кадра переносятся на смещение, а распознается
+        только появившаяся снизу полоса (с запасом на метки, разрезанные
+        краем предыдущего кадра).
+
+        Args:
+            content_bounds: Границы области контента
+
+        Returns:
+            Координаты найденных меток или None
+        """
+        profile = row_profile(self._get_frame().crop(content_bounds.to_list()))
+        scan_bounds = content_bounds
+        carried: List[Coordinates] = []
+
+        previous, self._last_scan = self._last_scan, None
+        estimate = None
+        if (
+            settings.ocr.incremental_scan
+            and previous
+            and previous.bounds == content_bounds
+        ):
+            estimate = estimate_scroll_offset(previous.profile, profile)
+
+        if estimate is None:
+            self.scroll_stats.full_scans += 1
+        else:
+            offset = estimate.offset
+            self.scroll_stats.incremental_scans += 1
+            self.scroll_stats.offsets_total += offset
+            if offset == 0:
+                self.scroll_stats.stalled_swipes += 1
+                logger.debug("Лента не сдвинулась с предыдущего кадра")
+
+            carried = [
+                Coordinates(
+                    left=label.left,
+                    top=label.top - offset,
+                    right=label.right,
+                    bottom=label.bottom - offset,
+                )
+                for label in previous.labels
+                if label.top - offset >= content_bounds.top
+            ]
+            # Без сдвига новых пикселей нет, распознавать нечего
+            strip_height = 0
+            if offset:
+                strip_height = offset + settings.ocr.incremental_scan_margin
+            scan_bounds = Coordinates(
+                left=content_bounds.left,
+                top=max(content_bounds.top, content_bounds.bottom - strip_height),
+                right=content_bounds.right,
+                bottom=content_bounds.bottom,
+            )
+            logger.debug(
+                "Смещение ленты %d px (корреляция %.3f), распознается полоса %d px",
+                offset,
+                estimate.score,
+                scan_bounds.height,
             )
 
-        return None
+        labels = carried
+        if scan_bounds.height > 0:
+            labels = carried + self._scan_sponsored(scan_bounds)
+        self.scroll_stats.add_scan(
+            scanned_pixels=scan_bounds.width * scan_bounds.height,
+            content_pixels=content_bounds.width * content_bounds.height,
+        )
+
+        labels = self._sort_labels(labels)
+        self._last_scan = SponsoredScan(
+            bounds=content_bounds, profile=profile, labels=labels or []
+        )
+        return labels
+
+    def _find_all_sponsored(self) -> List[Coordinates]:
+        """
+        Поиск всех меток 'sponsored' на экране.
+
+        Returns:
+            Координаты меток сверху вниз
+        """
+        labels = self.sponsored_chain.run(self.get_content_area_bounds())
+
+        if labels and not self._node(self.nodes.buttons.more_stories).exists:
+            return labels
+
+        return []
 
-    def _ads_processing(self) -> Optional[UiObject]:
+    def _find_sponsored(self) -> Optional[Coordinates]:
+        """
+        Поиск метки 'sponsored' на экране.
+
+        Returns:
+            Координаты первой сверху метки или None
+        """
+        labels = self._find_all_sponsored()
+        return labels[0] if labels else None
+
+    def _ads_processing(self) -> List[UiObject]:
         """
         Обрабатывает текущий экран для поиска рекламных объявлений.
 
+        Карточки всех меток, которые целиком видны в области контента,
+        возвращаются сразу по границам, без скролла и распознавания. Если
+        целиком не видна ни одна, лента скроллится к первой метке.
+
         Returns:
-            Информация о найденной рекламе или None
+            Найденные карточки рекламы сверху вниз
         """
-        sponsored_coords = self._find_sponsored()
+        labels = self._find_all_sponsored()
+        if not labels:
+            return []
 
-        if sponsored_coords:
-            self._scroll_to_ad(ads_coords=sponsored_coords)
-            return self.get_ads_node()
+        content_bounds = self.get_content_area_bounds()
+        candidates = self._card_candidates(content_bounds)
+
+        cards: Dict[Tuple[int, int, int, int], UiObject] = {}
+        for label in labels:
+            card = self._outer_card(candidates, label.center_x, label.center_y)
+            if card is None:
+                continue
 
-        return None
+            card_bounds = Coordinates(*card[2])
+            if (
+                card_bounds.top >= content_bounds.top
+                and card_bounds.bottom <= content_bounds.bottom
+            ):
+                cards.setdefault(card[2], card[1])
+
+        if cards:
+            return [cards[bounds] for bounds in sorted(cards, key=lambda b: b[1])]
+
+        sponsored_coords = labels[0]
+        shift = self._scroll_to_ad(ads_coords=sponsored_coords)
+        ads_node = self.get_ads_node(
+            label=Coordinates(
+                left=sponsored_coords.left,
+                top=sponsored_coords.top - shift,
+                right=sponsored_coords.right,
+                bottom=sponsored_coords.bottom - shift,
+            )
+        )
+        return [ads_node] if ads_node else []
 
     def get_content_area_bounds(self) -> Coordinates:
         """
@@ -104,49 +412,210 @@ class NavigationManager(MainClass):
         Returns:
             Границы области контента
         """
-        google_app_coords = self.nodes.blocks.google_app.bounds()
+        google_app_coords = self._node(self.nodes.blocks.google_app).bounds()
         coords = Coordinates(*google_app_coords)
 
-        if self.nodes.blocks.search_box.exists:
-            search_box_coords = self.nodes.blocks.search_box.bounds()
+        search_box = self._node(self.nodes.blocks.search_box)
+        if search_box.exists:
+            search_box_coords = search_box.bounds()
             coords.top = search_box_coords[3]
 
-        if self.nodes.blocks.navigation_bar.exists:
-            navigation_bar_coords = self.nodes.blocks.navigation_bar.bounds()
+        navigation_bar = self._node(self.nodes.blocks.navigation_bar)
+        if navigation_bar.exists:
+            navigation_bar_coords = navigation_bar.bounds()
             coords.bottom = navigation_bar_coords[1]
 
         return coords
 
-    def get_ads_node(self) -> Optional[UiObject]:
+    @staticmethod
+    def _outer_card(
+        candidates: Sequence[CardCandidate],
+        x: int,
+        y: int,
+    ) -> Optional[CardCandidate]:
+        """Самый высокий кандидат, содержащий точку, - карточка ленты."""
+
+        enclosing = [
+            candidate
+            for candidate in candidates
+            if Coordinates(*candidate[2]).contains_point(x, y)
+        ]
+        return max(enclosing, key=lambda candidate: candidate[0], default=None)
+
+    def _ads_node_from_geometry(
+        self,
+        candidates: Sequence[CardCandidate],
+        label: Optional[Coordinates] = None,
+    ) -> Optional[UiObject]:
         """
-        Находит наиболее вероятный узел с рекламным контентом.
+        Определяет карточку рекламы по границам без распознавания.
+
+        Метку содержат и вложенные элементы карточки, поэтому карточкой
+        считается самый внешний контейнер в пределах высоты области контента.
+        Положение метки после скролла известно с точностью до
+        settings.numeric.card_label_tolerance; если метка ближе к краю
+        карточки, OCR проверяет только соседние карточки.
+
+        Args:
+            candidates: Кандидаты (высота, узел, границы)
+            label: Ожидаемые координаты метки 'sponsored'
 
         Returns:
-            Найденный узел с рекламой или None
+            Узел карточки или None
         """
-        content_coords = self.get_content_area_bounds()
-        content_height = content_coords.bottom - content_coords.top
+        if label is None:
+            return None
+
+        card = self._outer_card(candidates, label.center_x, label.center_y)
+        if card is None:
+            return None
+
+        tolerance = settings.numeric.card_label_tolerance
+        card_bounds = Coordinates(*card[2])
+        if (
+            card_bounds.top + tolerance <= label.center_y
+            and label.center_y + tolerance < card_bounds.bottom
+        ):
+            return card[1]
+
+        ambiguous = {}
+        for y in (label.center_y - tolerance, label.center_y + tolerance):
+            neighbour = self._outer_card(candidates, label.center_x, y)
+            if neighbour is not None:
+                ambiguous[neighbour[2]] = neighbour
+        ambiguous[card[2]] = card
+
+        logger.debug(
+            "Метка у края карточки, проверка %d карточек распознаванием",
+            len(ambiguous),
+        )
+        return self._ads_node_from_ocr(list(ambiguous.values()))
+
+    def _ads_node_from_hierarchy(
+        self,
+        candidates: Sequence[CardCandidate],
+        label: Optional[Coordinates] = None,
+    ) -> Optional[UiObject]:
+        """
+        Выбирает самую высокую карточку, содержащую метку из снимка иерархии.
+
+        Args:
+            candidates: Кандидаты (высота, узел, границы)
+            label: Не используется
+
+        Returns:
+            Узел карточки или None
+        """
+        labels = self._find_text_bounds(self.SPONSORED_LABEL)
+        if not labels:
+            return None
 
-        nodes = self.nodes.blocks.google_app.child(**Classes.view_group)
         candidate_node = None
         candidate_height = 0
+        for node_height, node, node_bounds in candidates:
+            card = Coordinates(*node_bounds)
+            if node_height > candidate_height and any(
+                card.contains_point(label.center_x, label.center_y) for label in labels
+            ):
+                candidate_node = node
+                candidate_height = node_height
 
-        for node in nodes:
-            node_bounds = node.bounds()
-            node_height = node_bounds[3] - node_bounds[1]
+        return candidate_node
 
-            if node_height > content_height:
-                continue
+    def _ads_node_from_ocr(
+        self,
+        candidates: Sequence[CardCandidate],
+        label: Optional[Coordinates] = None,
+    ) -> Optional[UiObject]:
+        """
+        Выбирает самую высокую карточку, на изображении которой есть метка.
 
-            if node_height > candidate_height and Tesseract.find_matches_by_word(
-                image=node.screenshot(),
-                target_word="sponsored",
-            ):
+        Args:
+            candidates: Кандидаты (высота, узел, границы)
+            label: Не используется
+
+        Returns:
+            Узел карточки или None
+        """
+        # Все кандидаты распознаются одним запуском Tesseract
+        matches = Tesseract.find_matches_batch(
+            images=[self._crop_frame(bounds=bounds) for _, _, bounds in candidates],
+            phrase="sponsored",
+            profile=self.card_ocr_profile,
+        )
+
+        candidate_node = None
+        candidate_height = 0
+        for (node_height, node, _), node_matches in zip(candidates, matches):
+            if node_matches and node_height > candidate_height:
                 candidate_node = node
                 candidate_height = node_height
 
         return candidate_node
 
+    def _card_candidates(self, content_bounds: Coordinates) -> List[CardCandidate]:
+        """
+        Собирает кандидатов в карточки ленты не выше области контента.
+
+        В режиме снимка иерархии границы читаются из одного дампа.
+
+        Args:
+            content_bounds: Границы области контента
+
+        Returns:
+            Кандидаты (высота, узел, границы)
+        """
+        content_height = content_bounds.bottom - content_bounds.top
+        nodes = self._node(self.nodes.blocks.google_app).child(**Classes.view_group)
+
+        candidates: List[CardCandidate] = []
+        for node in nodes:
+            node_bounds = node.bounds()
+            node_height = node_bounds[3] - node_bounds[1]
+
+            if 0 < node_height <= content_height:
+                candidates.append((node_height, node, tuple(node_bounds)))
+
+        return candidates
+
+    def get_ads_node(
+        self,
+        label: Optional[Coordinates] = None,
+    ) -> Optional[UiObject]:
+        """
+        Находит наиболее вероятный узел с рекламным контентом.
+
+        Args:
+            label: Координаты метки 'sponsored', если она уже найдена
+
+        Returns:
+            Найденный узел с рекламой или None
+        """
+        candidates = self._card_candidates(self.get_content_area_bounds())
+        if not candidates:
+            return None
+
+        return self.ads_node_chain.run(candidates, label)
+
+    def log_detection_stats(self) -> None:
+        """Выводит статистику стратегий поиска рекламы."""
+
+        self.sponsored_chain.log_stats()
+        self.ads_node_chain.log_stats()
+
+        stats = self.scroll_stats
+        if stats.full_scans or stats.incremental_scans:
+            logger.info(
+                "Распознавание ленты: полных %d, инкрементальных %d "
+                "(среднее смещение %.0f px, без сдвига %d), "
+                "сэкономлено пикселей OCR: %.0f%%",
+                stats.full_scans,
+                stats.incremental_scans,
+                stats.mean_offset,
+                stats.stalled_swipes,
+                stats.pixels_saved * 100,
+            )
+
     def go_to_start_feed(
         self,
         timeout: int = 15,
@@ -162,7 +631,7 @@ class NavigationManager(MainClass):
             edge_offset: Отступ от краев экрана
             topbar_height: Высота области верхней панели
         """
-        if self.nodes.buttons.selected_account.exists:
+        if self._node(self.nodes.buttons.selected_account).exists:
             return
 
         content_coords = self.get_content_area_bounds()
@@ -173,7 +642,8 @@ class NavigationManager(MainClass):
         )
 
         self.nodes.buttons.home.click(timeout=timeout)
-        time.sleep(action_timeout)
+        self._invalidate_screen()
+        self._wait_settled(baseline=action_timeout)
 
         content_coords = self.get_content_area_bounds()
         self._swipe(
@@ -214,13 +684,61 @@ class NavigationManager(MainClass):
             wait_time=action_timeout,
         )
 
+    @staticmethod
+    def _deadline_passed(deadline: Optional[float]) -> bool:
+        return deadline is not None and time.time() >= deadline
+
+    def _new_cards(
+        self,
+        cards: List[UiObject],
+        seen_hashes: List[int],
+    ) -> List[UiObject]:
+        """
+        Отбрасывает карточки, уже выданные за текущий проход по ленте.
+
+        Карточка сравнивается по перцептивному хэшу своего изображения:
+        после скролла одна и та же реклама оказывается в других границах.
+        Хэши считаются для всех карточек до их обработки, пока кадр
+        соответствует экрану.
+
+        Args:
+            cards: Карточки текущего экрана
+            seen_hashes: Хэши выданных карточек (дополняется)
+
+        Returns:
+            Новые карточки
+        """
+        max_distance = settings.numeric.card_dedup_distance
+        new_cards = []
+        for card in cards:
+            card_hash = perceptual_hash(self._node_screenshot(card))
+            if any(
+                hamming_distance(card_hash, seen) <= max_distance
+                for seen in seen_hashes
+            ):
+                continue
+
+            seen_hashes.append(card_hash)
+            new_cards.append(card)
+
+        return new_cards
+
     def find_ads(
         self,
         max_iterations: int = 15,
+        deadline: Optional[float] = None,
     ) -> Generator[Optional[UiObject], None, None]:
         """
         Генератор для поиска рекламных объявлений в ленте.
 
+        За одну итерацию выдаются все новые карточки рекламы на экране,
+        после чего лента скроллится.
+
+        Args:
+            max_iterations: Максимальное количество свайпов
+            deadline: Момент (timestamp) закрытия окна расписания: после
+                него не выдается ни одной карточки
+
         Yields:
             Optional[FeedScrollerItem]: Информация о найденной рекламе или None
 
@@ -230,9 +748,13 @@ class NavigationManager(MainClass):
         logger.info("Запуск поиска рекламных объявлений в ленте")
         iterations = 0
         ads_found = 0
+        duplicates = 0
+        seen_hashes: List[int] = []
 
         while (
-            not self.nodes.buttons.more_stories.exists and iterations <= max_iterations
+            not self._node(self.nodes.buttons.more_stories).exists
+            and iterations <= max_iterations
+            and not self._deadline_passed(deadline)
         ):
             iterations += 1
             logger.debug("Итерация поиска рекламы #%d", iterations)
@@ -243,17 +765,32 @@ class NavigationManager(MainClass):
                 if sponsored_coords:
                     self._scroll_to_ad(ads_coords=sponsored_coords)
 
-            ads_item = self._ads_processing()
-            if ads_item:
+            cards = self._ads_processing()
+            ads_items = self._new_cards(cards, seen_hashes)
+            duplicates += len(cards) - len(ads_items)
+            logger.debug("Реклам на экране: %d, новых: %d", len(cards), len(ads_items))
+
+            for ads_item in ads_items:
+                if self._deadline_passed(deadline):
+                    break
+
                 ads_found += 1
                 logger.info("Найдено рекламное объявление #%d", ads_found)
+                yield ads_item
 
-            yield ads_item
+            if not ads_items:
+                yield None
 
             self._scroll_content()
 
+        if self._deadline_passed(deadline):
+            logger.info("Окно расписания закрылось, поиск рекламы остановлен")
+
         logger.info(
-            "Поиск рекламы завершен. Итераций: %d, найдено реклам: %d",
+            "Поиск рекламы завершен. Итераций: %d, найдено реклам: %d "
+            "(%.2f на свайп), повторов: %d",
             iterations,
             ads_found,
+            ads_found / iterations if iterations else 0.0,
+            duplicates,
         )
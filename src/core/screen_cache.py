@@ -0,0 +1,135 @@
+import time
+from typing import Dict, Optional, Sequence
+
+from PIL.Image import Image
+from uiautomator2 import Device
+
+from src.config import settings
+from src.elements import HierarchySnapshot
+from src.utils import Frame, FrameRegion, create_frame_source, get_logger
+
+from .settle_detector import SettleDetector
+
+logger = get_logger(name="screen-cache")
+
+
+class ScreenCache:
+    """Кэш состояния экрана, общий для всех MainClass одного устройства.
+
+    Кадр и снимок иерархии снимаются один раз на состояние UI: изображения
+    элементов вырезаются из кадра по границам, селекторы вычисляются по
+    снимку. Кэш сбрасывается при любом действии, меняющем экран (свайп,
+    клик, кнопка 'Назад', перезапуск приложения).
+    """
+
+    _instances: Dict[str, "ScreenCache"] = {}
+
+    def __init__(self, device: Device, max_age: float) -> None:
+        self.device = device
+        self.max_age = max_age
+        self.frame_source = create_frame_source(device=device)
+        self.settle = SettleDetector(
+            frame_source=self.frame_source,
+            scale=settings.screen.settle_scale,
+            quality=settings.screen.settle_quality,
+            threshold=settings.screen.settle_threshold,
+            poll_interval=settings.timeout.settle_poll_interval,
+        )
+
+        self._frame: Optional[Frame] = None
+        self._frame_time = 0.0
+
+        self._hierarchy: Optional[HierarchySnapshot] = None
+        self._hierarchy_time = 0.0
+
+        self.captures = 0
+        self.hits = 0
+        self.dumps = 0
+
+    @classmethod
+    def for_device(cls, device: Device) -> "ScreenCache":
+        """Возвращает кэш для устройства, создавая его при первом обращении."""
+
+        cache = cls._instances.get(device.serial)
+        if cache is None:
+            cache = cls(device=device, max_age=settings.timeout.frame_cache_ttl)
+            cls._instances[device.serial] = cache
+        return cache
+
+    def get_frame(self) -> Frame:
+        """
+        Возвращает кадр текущего состояния экрана.
+
+        Returns:
+            Кадр экрана в виде массива пикселей
+        """
+        if (
+            self._frame is not None
+            and time.monotonic() - self._frame_time <= self.max_age
+        ):
+            self.hits += 1
+            return self._frame
+
+        self._frame = self.frame_source.capture()
+        self._frame_time = time.monotonic()
+        self.captures += 1
+
+        logger.debug(
+            "Снят новый кадр экрана (кадров: %d, попаданий в кэш: %d)",
+            self.captures,
+            self.hits,
+        )
+        return self._frame
+
+    def get_hierarchy(self) -> HierarchySnapshot:
+        """
+        Возвращает снимок иерархии текущего состояния экрана.
+
+        Returns:
+            Снимок иерархии UI
+        """
+        if (
+            self._hierarchy is not None
+            and time.monotonic() - self._hierarchy_time <= self.max_age
+        ):
+            return self._hierarchy
+
+        self._hierarchy = HierarchySnapshot.from_device(device=self.device)
+        self._hierarchy_time = time.monotonic()
+        self.dumps += 1
+
+        logger.debug("Снят новый снимок иерархии (снимков: %d)", self.dumps)
+        return self._hierarchy
+
+    def crop(self, bounds: Sequence[int]) -> Image:
+        """
+        Вырезает область из кадра текущего состояния экрана.
+
+        Args:
+            bounds: Границы области (left, top, right, bottom)
+
+        Returns:
+            Изображение области для OCR или классификатора
+        """
+        return self.get_frame().to_image(bounds=bounds)
+
+    def region(self, bounds: Sequence[int]) -> FrameRegion:
+        """
+        Возвращает область кадра текущего состояния экрана для OCR.
+
+        В отличие от crop не создает изображение: сервис OCR передает
+        кадр в процесс пула через кольцо кадров.
+
+        Args:
+            bounds: Границы области (left, top, right, bottom)
+
+        Returns:
+            Область кадра
+        """
+        return self.get_frame().region(bounds=bounds)
+
+    def invalidate(self) -> None:
+        """Сбрасывает кадр и снимок иерархии после изменения экрана."""
+
+        self._frame = None
+        self._hierarchy = None
@@ -0,0 +1,165 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from src.utils import FrameSource, estimate_scroll_offset, get_logger, row_profile
+
+logger = get_logger(name="settle-detector")
+
+
+@dataclass
+class SettleStats:
+    """Статистика ожиданий стабилизации экрана."""
+
+    waits: int = 0
+    timeouts: int = 0
+    samples: int = 0
+    waited: float = 0.0
+    baseline: float = 0.0
+
+    @property
+    def saved(self) -> float:
+        """Время, сэкономленное относительно фиксированных пауз."""
+
+        return self.baseline - self.waited
+
+
+class SettleDetector:
+    """Ожидание стабилизации экрана по уменьшенным кадрам.
+
+    Вместо фиксированной паузы после действия снимаются уменьшенные кадры,
+    пока два последовательных кадра не совпадут, но не дольше таймаута.
+    После свайпа достаточно, чтобы лента перестала двигаться: смещение
+    между кадрами оценивается по профилям строк, поэтому видео в карточке
+    не мешает. После обновления ленты кадр должен совпасть целиком:
+    ни один блок кадра (например, индикатор загрузки) не должен меняться.
+    """
+
+    def __init__(
+        self,
+        frame_source: FrameSource,
+        scale: float = 0.2,
+        quality: int = 30,
+        threshold: float = 6.0,
+        block: int = 8,
+        poll_interval: float = 0.05,
+    ) -> None:
+        """
+        Args:
+            frame_source: Источник кадров устройства
+            scale: Масштаб уменьшенных кадров
+            quality: Качество JPEG уменьшенных кадров
+            threshold: Максимальная средняя разница блока кадров (0-255)
+            block: Размер блока для сравнения кадров в пикселях
+            poll_interval: Пауза между кадрами
+        """
+        self.frame_source = frame_source
+        self.scale = scale
+        self.quality = quality
+        self.threshold = threshold
+        self.block = block
+        self.poll_interval = poll_interval
+        self.stats = SettleStats()
+
+    def _max_block_difference(self, first: np.ndarray, second: np.ndarray) -> float:
+        """Наибольшая средняя разница по блокам block x block."""
+
+        height = first.shape[0] // self.block * self.block
+        width = first.shape[1] // self.block * self.block
+        difference = np.abs(
+            first[:height, :width].astype(np.int16) - second[:height, :width]
+        )
+        blocks = difference.reshape(
+            height // self.block, self.block, width // self.block, self.block
+        ).mean(axis=(1, 3))
+        return float(blocks.max())
+
+    def _is_settled(
+        self,
+        previous: np.ndarray,
+        current: np.ndarray,
+        motion_only: bool,
+    ) -> bool:
+        if previous.shape != current.shape:
+            return False
+
+        if self._max_block_difference(previous, current) <= self.threshold:
+            return True
+
+        if motion_only:
+            estimate = estimate_scroll_offset(
+                row_profile(previous, step=1), row_profile(current, step=1)
+            )
+            return estimate is not None and estimate.offset == 0
+
+        return False
+
+    def wait(
+        self,
+        timeout: float,
+        baseline: float = 0.0,
+        motion_only: bool = True,
+    ) -> bool:
+        """
+        Ждет, пока экран перестанет меняться.
+
+        Args:
+            timeout: Максимальное время ожидания
+            baseline: Фиксированная пауза, которую заменяет ожидание
+                (для статистики сэкономленного времени)
+            motion_only: Считать экран стабильным, когда прекратился скролл,
+                даже если отдельные области продолжают меняться
+
+        Returns:
+            True, если экран стабилизировался до таймаута
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        previous: Optional[np.ndarray] = None
+        settled = False
+
+        while True:
+            current = self.frame_source.capture_preview(
+                scale=self.scale, quality=self.quality
+            )
+            self.stats.samples += 1
+
+            if previous is not None and self._is_settled(
+                previous, current, motion_only
+            ):
+                settled = True
+                break
+
+            previous = current
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(self.poll_interval, remaining))
+
+        waited = time.monotonic() - start
+        self.stats.waits += 1
+        self.stats.waited += waited
+        self.stats.baseline += baseline
+        if not settled:
+            self.stats.timeouts += 1
+            logger.debug("Экран не стабилизировался за %.2f с", timeout)
+
+        return settled
+
+    def log_stats(self) -> None:
+        """Выводит статистику ожиданий за проход и сбрасывает ее."""
+
+        if self.stats.waits:
+            logger.info(
+                "Ожидание стабилизации экрана: ожиданий %d (по таймауту %d), "
+                "кадров %d, ожидание %.1f с вместо %.1f с, сэкономлено %.1f с",
+                self.stats.waits,
+                self.stats.timeouts,
+                self.stats.samples,
+                self.stats.waited,
+                self.stats.baseline,
+                self.stats.saved,
+            )
+        self.stats = SettleStats()
@@ -0,0 +1,139 @@
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Literal, Optional
+
+from src.utils import get_logger
+
+logger = get_logger(name="text-prefilter")
+
+PrefilterVerdict = Literal["arbitrage", "non_arbitrage", "unsure"]
+
+
+@dataclass
+class PrefilterStats:
+    """Статистика решений префильтра."""
+
+    checked: int = 0
+    arbitrage: int = 0
+    non_arbitrage: int = 0
+    unsure: int = 0
+
+    @property
+    def api_calls_saved(self) -> int:
+        return self.arbitrage + self.non_arbitrage
+
+
+class TextPrefilter:
+    """Быстрый локальный префильтр текста объявления.
+
+    Ключевые слова категорий из prompt.md собраны в одно скомпилированное
+    регулярное выражение с именованными группами, поэтому текст
+    просматривается за один проход. В классификатор уходят только
+    объявления с вердиктом 'unsure'. Локальный вердикт выносится только по
+    нескольким различным признакам одной категории: одно совпадение
+    ключевого слова не отличает арбитраж от обычной рекламы, поэтому
+    пороги ниже MIN_HITS не допускаются.
+    """
+
+    MIN_HITS = 2
+
+    def __init__(
+        self,
+        arbitrage_keywords: Iterable[str],
+        non_arbitrage_keywords: Iterable[str],
+        min_arbitrage_hits: int = 3,
+        min_non_arbitrage_hits: int = 2,
+    ) -> None:
+        """
+        Args:
+            arbitrage_keywords: Фрагменты регулярных выражений признаков арбитража
+            non_arbitrage_keywords: Фрагменты признаков обычной рекламы
+            min_arbitrage_hits: Минимум различных признаков для вердикта 'arbitrage'
+            min_non_arbitrage_hits: Минимум различных признаков для вердикта
+                'non_arbitrage'
+        """
+        if min(min_arbitrage_hits, min_non_arbitrage_hits) < self.MIN_HITS:
+            raise ValueError(
+                "Пороги префильтра должны быть не меньше %d" % self.MIN_HITS
+            )
+
+        self.min_arbitrage_hits = min_arbitrage_hits
+        self.min_non_arbitrage_hits = min_non_arbitrage_hits
+        self.stats = PrefilterStats()
+
+        self._pattern = re.compile(
+            r"(?<!\w)(?:(?P<arbitrage>{})|(?P<non_arbitrage>{}))(?!\w)".format(
+                "|".join(arbitrage_keywords),
+                "|".join(non_arbitrage_keywords),
+            ),
+            re.IGNORECASE,
+        )
+
+    @classmethod
+    def from_file(cls, path: Path) -> "TextPrefilter":
+        """Создает префильтр из JSON-файла с ключевыми словами."""
+
+        with path.open(mode="r", encoding="utf-8") as file:
+            config = json.load(file)
+
+        return cls(
+            arbitrage_keywords=config["arbitrage"],
+            non_arbitrage_keywords=config["non_arbitrage"],
+            min_arbitrage_hits=config.get("min_arbitrage_hits", 3),
+            min_non_arbitrage_hits=config.get("min_non_arbitrage_hits", 2),
+        )
+
+    def classify(self, text: Optional[str]) -> PrefilterVerdict:
+        """
+        Определяет вердикт по тексту объявления.
+
+        Args:
+            text: Текст объявления
+
+        Returns:
+            'arbitrage', 'non_arbitrage' или 'unsure'
+        """
+        verdict: PrefilterVerdict = "unsure"
+
+        if text:
+            arbitrage_hits = set()
+            non_arbitrage_hits = set()
+            for match in self._pattern.finditer(text):
+                if match.group("arbitrage"):
+                    arbitrage_hits.add(match.group("arbitrage").lower())
+                else:
+                    non_arbitrage_hits.add(match.group("non_arbitrage").lower())
+
+            if len(arbitrage_hits) >= self.min_arbitrage_hits:
+                verdict = "arbitrage"
+            elif (
+                not arbitrage_hits
+                and len(non_arbitrage_hits) >= self.min_non_arbitrage_hits
+            ):
+                verdict = "non_arbitrage"
+
+            logger.debug(
+                "Префильтр: %s (признаки арбитража: %s, обычной рекламы: %s)",
+                verdict,
+                sorted(arbitrage_hits),
+                sorted(non_arbitrage_hits),
+            )
+
+        self.stats.checked += 1
+        setattr(self.stats, verdict, getattr(self.stats, verdict) + 1)
+        return verdict
+
+    def log_stats(self) -> None:
+        """Выводит количество сэкономленных вызовов классификатора."""
+
+        logger.info(
+            "Префильтр текста: проверено %d, арбитраж %d, не арбитраж %d, "
+            "не уверен %d, сэкономлено вызовов API: %d",
+            self.stats.checked,
+            self.stats.arbitrage,
+            self.stats.non_arbitrage,
+            self.stats.unsure,
+            self.stats.api_calls_saved,
+        )
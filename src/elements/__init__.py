@@ -1,3 +1,4 @@
+from .hierarchy import HierarchySnapshot, SnapshotObject, parse_bounds
 from .nodes import AccountNodes, ButtonNodes, ItemsNodes, MainNodes, Nodes
 from .selectors import Accounts, Blocks, Buttons, Classes, Items
 
@@ -12,4 +13,7 @@ __all__ = [
     "ItemsNodes",
     "ButtonNodes",
     "AccountNodes",
+    "SnapshotObject",
+    "HierarchySnapshot",
+    "parse_bounds",
 ]
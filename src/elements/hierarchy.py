@@ -0,0 +1,384 @@
+import re
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+from lxml import etree
+from uiautomator2 import Device, UiObject
+
+from src.models import NodeSelector
+
+BOUNDS_PATTERN = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+# Служебные ключи селектора uiautomator2, не участвующие в сравнении атрибутов
+SERVICE_SELECTOR_KEYS = ("mask", "childOrSibling", "childOrSiblingSelector", "instance")
+
+BOOLEAN_ATTRIBUTES = {
+    "checkable": "checkable",
+    "checked": "checked",
+    "clickable": "clickable",
+    "enabled": "enabled",
+    "focusable": "focusable",
+    "focused": "focused",
+    "scrollable": "scrollable",
+    "longClickable": "long-clickable",
+    "selected": "selected",
+}
+
+
+class HierarchySnapshot:
+    """Снимок иерархии UI, полученный одним вызовом dump_hierarchy().
+
+    Позволяет вычислять NodeSelector локально, без JSON-RPC запроса
+    на каждое обращение к .exists, .bounds() и .info.
+    """
+
+    def __init__(self, xml: str, device: Optional[Device] = None) -> None:
+        """
+        Args:
+            xml: XML-дамп иерархии
+            device: Устройство для выполнения кликов по найденным элементам
+        """
+        self.device = device
+
+        root = etree.fromstring(xml.encode("utf-8"))
+        self._elements: List[etree._Element] = list(root.iter("node"))
+
+        # Порядок обхода и граница поддерева для проверки вложенности за O(1)
+        self._order: Dict[etree._Element, int] = {}
+        self._subtree_end: Dict[etree._Element, int] = {}
+        for index, element in enumerate(self._elements):
+            self._order[element] = index
+        for element in reversed(self._elements):
+            children = [child for child in element if child.tag == "node"]
+            self._subtree_end[element] = (
+                self._subtree_end[children[-1]] if children else self._order[element]
+            )
+
+        self._by_resource_id = self._build_index("resource-id")
+        self._by_class_name = self._build_index("class")
+        self._by_description = self._build_index("content-desc")
+
+    @classmethod
+    def from_device(cls, device: Device) -> "HierarchySnapshot":
+        """Снимает иерархию с устройства."""
+
+        return cls(xml=device.dump_hierarchy(), device=device)
+
+    def _build_index(self, attribute: str) -> Dict[str, List[etree._Element]]:
+        index: Dict[str, List[etree._Element]] = {}
+        for element in self._elements:
+            value = element.get(attribute)
+            if value:
+                index.setdefault(value, []).append(element)
+        return index
+
+    @staticmethod
+    def _matches(element: etree._Element, selector: Dict[str, Any]) -> bool:
+        """Проверяет соответствие элемента селектору."""
+
+        for key, value in selector.items():
+            if key == "className":
+                if element.get("class") != value:
+                    return False
+            elif key == "resourceId":
+                if element.get("resource-id") != value:
+                    return False
+            elif key == "description":
+                if element.get("content-desc") != value:
+                    return False
+            elif key == "descriptionStartsWith":
+                if not element.get("content-desc", "").startswith(value):
+                    return False
+            elif key == "descriptionContains":
+                if value not in element.get("content-desc", ""):
+                    return False
+            elif key == "text":
+                if element.get("text") != value:
+                    return False
+            elif key == "textStartsWith":
+                if not element.get("text", "").startswith(value):
+                    return False
+            elif key == "textContains":
+                if value not in element.get("text", ""):
+                    return False
+            elif key == "packageName":
+                if element.get("package") != value:
+                    return False
+            elif key in BOOLEAN_ATTRIBUTES:
+                if (element.get(BOOLEAN_ATTRIBUTES[key]) == "true") != bool(value):
+                    return False
+            else:
+                raise ValueError(f"Неподдерживаемый ключ селектора: {key}")
+
+        return True
+
+    def _candidates(self, selector: Dict[str, Any]) -> List[etree._Element]:
+        """Выбирает наиболее узкий индекс для селектора."""
+
+        if "resourceId" in selector:
+            return self._by_resource_id.get(selector["resourceId"], [])
+        if "description" in selector:
+            return self._by_description.get(selector["description"], [])
+        if "className" in selector:
+            return self._by_class_name.get(selector["className"], [])
+        return self._elements
+
+    def is_descendant(
+        self,
+        element: etree._Element,
+        parent: etree._Element,
+    ) -> bool:
+        """Проверяет, находится ли элемент в поддереве родителя."""
+
+        return self._order[parent] < self._order[element] <= self._subtree_end[parent]
+
+    def find(
+        self,
+        selector: Dict[str, Any],
+        parents: Optional[Sequence[etree._Element]] = None,
+    ) -> List[etree._Element]:
+        """
+        Находит элементы, соответствующие селектору.
+
+        Args:
+            selector: Атрибуты селектора (ключи NodeSelector)
+            parents: Ограничить поиск потомками указанных элементов
+
+        Returns:
+            Элементы в порядке обхода дерева
+        """
+        elements = [
+            element
+            for element in self._candidates(selector)
+            if self._matches(element, selector)
+        ]
+
+        if parents is not None:
+            elements = [
+                element
+                for element in elements
+                if any(self.is_descendant(element, parent) for parent in parents)
+            ]
+
+        return elements
+
+    def find_text(self, pattern: Pattern[str]) -> List[etree._Element]:
+        """
+        Находит элементы, у которых text или content-desc соответствует шаблону.
+
+        Args:
+            pattern: Скомпилированное регулярное выражение (re.search)
+
+        Returns:
+            Элементы в порядке обхода дерева
+        """
+        return [
+            element
+            for element in self._elements
+            if pattern.search(element.get("text", ""))
+            or pattern.search(element.get("content-desc", ""))
+        ]
+
+    def resolve(
+        self,
+        chain: Sequence[Dict[str, Any]],
+    ) -> List[etree._Element]:
+        """
+        Вычисляет цепочку селекторов вида device(...).child(...).child(...).
+
+        Args:
+            chain: Селекторы от корневого к вложенному
+
+        Returns:
+            Элементы, соответствующие последнему селектору
+        """
+        elements: Optional[List[etree._Element]] = None
+        for selector in chain:
+            elements = self.find(selector, parents=elements)
+            if not elements:
+                return []
+        return elements or []
+
+    def __call__(self, **kwargs: Any) -> "SnapshotObject":
+        """Аналог device(**selector) для снимка."""
+
+        return SnapshotObject(snapshot=self, chain=(NodeSelector(**kwargs),))
+
+    def node(self, node: UiObject) -> "SnapshotObject":
+        """Переносит селектор UiObject на снимок иерархии."""
+
+        return SnapshotObject.from_ui_object(snapshot=self, node=node)
+
+
+class SnapshotObject:
+    """Элемент снимка иерархии с интерфейсом чтения, совместимым с UiObject."""
+
+    def __init__(
+        self,
+        snapshot: HierarchySnapshot,
+        chain: Tuple[Dict[str, Any], ...],
+        instance: int = 0,
+    ) -> None:
+        self.snapshot = snapshot
+        self.chain = chain
+        self.instance = instance
+
+    @classmethod
+    def from_ui_object(
+        cls,
+        snapshot: HierarchySnapshot,
+        node: UiObject,
+    ) -> "SnapshotObject":
+        """Создает объект снимка по селектору UiObject."""
+
+        selector = node.selector
+        if any(kind != "child" for kind in selector["childOrSibling"]):
+            raise ValueError("Селекторы sibling не поддерживаются снимком иерархии")
+
+        chain = [selector, *selector["childOrSiblingSelector"]]
+        instance = chain[-1].get("instance", 0)
+
+        return cls(
+            snapshot=snapshot,
+            chain=tuple(
+                {k: v for k, v in item.items() if k not in SERVICE_SELECTOR_KEYS}
+                for item in chain
+            ),
+            instance=instance,
+        )
+
+    def _elements(self) -> List[etree._Element]:
+        return self.snapshot.resolve(self.chain)
+
+    def _element(self) -> Optional[etree._Element]:
+        elements = self._elements()
+        return elements[self.instance] if self.instance < len(elements) else None
+
+    @property
+    def exists(self) -> bool:
+        return self._element() is not None
+
+    @property
+    def count(self) -> int:
+        return len(self._elements())
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator["SnapshotObject"]:
+        for instance in range(self.count):
+            yield self[instance]
+
+    def __getitem__(self, instance: int) -> "SnapshotObject":
+        count = self.count
+        if instance < 0:
+            instance += count
+        if instance < 0 or instance >= count:
+            raise IndexError(instance)
+        return self._with_instance(instance)
+
+    def _with_instance(self, instance: int) -> "SnapshotObject":
+        return SnapshotObject(
+            snapshot=self.snapshot,
+            chain=self.chain,
+            instance=instance,
+        )
+
+    def child(self, **kwargs: Any) -> "SnapshotObject":
+        element = self._element()
+        if element is None:
+            return SnapshotObject(
+                snapshot=self.snapshot,
+                chain=(*self.chain, NodeSelector(**kwargs)),
+            )
+
+        # Фиксируем конкретный экземпляр родителя по его позиции в дереве
+        return _PinnedSnapshotObject(
+            snapshot=self.snapshot,
+            parent=element,
+            selector=NodeSelector(**kwargs),
+        )
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        element = self._element()
+        if element is None:
+            raise LookupError(f"Элемент не найден в снимке иерархии: {self.chain}")
+        return element_info(element)
+
+    def bounds(self) -> Tuple[int, int, int, int]:
+        bounds = self.info["bounds"]
+        return (bounds["left"], bounds["top"], bounds["right"], bounds["bottom"])
+
+    def center(self) -> Tuple[float, float]:
+        left, top, right, bottom = self.bounds()
+        return ((left + right) / 2, (top + bottom) / 2)
+
+    def get_text(self, timeout: Optional[float] = None) -> Optional[str]:
+        return self.info.get("text")
+
+    def click_exists(self, timeout: float = 0) -> bool:
+        """Кликает по центру элемента, если он есть в снимке."""
+
+        if self.snapshot.device is None or not self.exists:
+            return False
+
+        x, y = self.center()
+        self.snapshot.device.click(x, y)
+        return True
+
+
+class _PinnedSnapshotObject(SnapshotObject):
+    """Потомки конкретного элемента снимка (результат child() у экземпляра)."""
+
+    def __init__(
+        self,
+        snapshot: HierarchySnapshot,
+        parent: etree._Element,
+        selector: Dict[str, Any],
+        instance: int = 0,
+    ) -> None:
+        super().__init__(snapshot=snapshot, chain=(selector,), instance=instance)
+        self.parent = parent
+
+    def _elements(self) -> List[etree._Element]:
+        return self.snapshot.find(self.chain[0], parents=[self.parent])
+
+    def _with_instance(self, instance: int) -> "SnapshotObject":
+        return _PinnedSnapshotObject(
+            snapshot=self.snapshot,
+            parent=self.parent,
+            selector=self.chain[0],
+            instance=instance,
+        )
+
+
+def parse_bounds(value: str) -> Tuple[int, int, int, int]:
+    """Разбирает строку границ вида "[l,t][r,b]"."""
+
+    match = BOUNDS_PATTERN.fullmatch(value or "")
+    if not match:
+        return (0, 0, 0, 0)
+    left, top, right, bottom = (int(group) for group in match.groups())
+    return (left, top, right, bottom)
+
+
+def element_info(element: etree._Element) -> Dict[str, Any]:
+    """Формирует словарь в формате UiObject.info для элемента снимка."""
+
+    left, top, right, bottom = parse_bounds(element.get("bounds", ""))
+    bounds = {"left": left, "top": top, "right": right, "bottom": bottom}
+
+    info: Dict[str, Any] = {
+        "bounds": bounds,
+        "visibleBounds": bounds,
+        "className": element.get("class"),
+        "contentDescription": element.get("content-desc") or None,
+        "packageName": element.get("package"),
+        "resourceName": element.get("resource-id") or None,
+        "text": element.get("text", ""),
+        "childCount": sum(1 for child in element if child.tag == "node"),
+    }
+    for key, attribute in BOOLEAN_ATTRIBUTES.items():
+        info[key] = element.get(attribute) == "true"
+
+    return info
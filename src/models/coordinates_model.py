@@ -27,5 +27,8 @@ class Coordinates:
     def center_y(self) -> int:
         return (self.top + self.bottom) // 2
 
+    def contains_point(self, x: int, y: int) -> bool:
+        return self.left <= x < self.right and self.top <= y < self.bottom
+
     def to_list(self) -> List[int]:
         return [self.left, self.top, self.right, self.bottom]
@@ -1,17 +1,61 @@
 from .adb_manager import AdbDevicesManager
 from .arg_manager import ArgsManager, ArgsResult
+from .classification_cache import CacheStats, ClassificationCache
+from .frame_ring import FrameRef, FrameRing, read_frame
+from .frame_source import Frame, FrameRegion, FrameSource, create_frame_source
 from .google_manager import GoogleApp
+from .image_hash import hamming_distance, perceptual_hash
 from .log_manager import get_logger, setup_logging
+from .ocr_profile import OcrProfile, get_ocr_profile
+from .ocr_service import OcrService, RemoteOcrEngine
+from .schedule_table import ScheduleState, ScheduleTable
+from .scroll_estimator import (
+    ScrollEstimate,
+    ScrollStats,
+    estimate_scroll_offset,
+    row_profile,
+)
+from .seen_ad_index import SeenAdIndex, SeenAdStats
+from .switch_latency import SwitchLatency
+from .template_detector import TemplateDetector, TemplateMatch
 from .tesseract_manager import Tesseract, TesseractCoords, TesseractResult
+from .transition_waiter import TransitionWaiter
 
 __all__ = [
+    "Frame",
+    "FrameRef",
+    "FrameRing",
+    "FrameRegion",
     "GoogleApp",
     "Tesseract",
     "get_logger",
     "ArgsResult",
     "ArgsManager",
+    "OcrProfile",
+    "OcrService",
+    "RemoteOcrEngine",
+    "CacheStats",
+    "FrameSource",
     "setup_logging",
     "TesseractResult",
+    "TemplateDetector",
+    "TemplateMatch",
+    "TransitionWaiter",
     "TesseractCoords",
     "AdbDevicesManager",
+    "SeenAdIndex",
+    "SeenAdStats",
+    "SwitchLatency",
+    "ScheduleState",
+    "ScheduleTable",
+    "ScrollEstimate",
+    "ScrollStats",
+    "ClassificationCache",
+    "perceptual_hash",
+    "hamming_distance",
+    "create_frame_source",
+    "read_frame",
+    "row_profile",
+    "estimate_scroll_offset",
+    "get_ocr_profile",
 ]
@@ -0,0 +1,188 @@
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from src.models import ClassificationResult
+
+from .image_hash import hamming_distance, to_signed
+from .log_manager import get_logger
+
+logger = get_logger(name="classification-cache")
+
+
+@dataclass
+class CacheStats:
+    """Статистика обращений к кэшу классификаций."""
+
+    lookups: int = 0
+    hits: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    @property
+    def api_calls_saved(self) -> int:
+        return self.hits
+
+
+class ClassificationCache:
+    """Кэш результатов классификации по перцептивному хэшу изображения.
+
+    Хранится в SQLite-файле, общем для всех процессов устройств и
+    переживающем перезапуски. Поиск выполняется с допуском по расстоянию
+    Хэмминга, записи удаляются по TTL и при превышении размера.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_distance: int = 6,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 50_000,
+    ) -> None:
+        """
+        Args:
+            path: Путь к файлу SQLite
+            max_distance: Максимальное расстояние Хэмминга для совпадения
+            ttl: Время жизни записи в секундах
+            max_entries: Максимальное количество записей
+        """
+        self.path = path
+        self.max_distance = max_distance
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+
+        self._lock = Lock()
+        self._connection = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        connection = sqlite3.connect(
+            self.path,
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.create_function("hamming", 2, hamming_distance, deterministic=True)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS classifications (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                phash INTEGER NOT NULL,
+                label TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                created_at REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+            """)
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS classifications_created_at "
+            "ON classifications (created_at)"
+        )
+        return connection
+
+    def get(self, phash: int) -> Optional[ClassificationResult]:
+        """
+        Ищет результат для ближайшего похожего изображения.
+
+        Args:
+            phash: Перцептивный хэш изображения
+
+        Returns:
+            Результат классификации или None
+        """
+        with self._lock:
+            self.stats.lookups += 1
+            row = self._connection.execute(
+                """
+                SELECT id, label, confidence, hamming(phash, :phash) AS distance
+                FROM classifications
+                WHERE created_at >= :min_created_at
+                  AND hamming(phash, :phash) <= :max_distance
+                ORDER BY distance
+                LIMIT 1
+                """,
+                {
+                    "phash": to_signed(phash),
+                    "min_created_at": time.time() - self.ttl,
+                    "max_distance": self.max_distance,
+                },
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            record_id, label, confidence, distance = row
+            self._connection.execute(
+                "UPDATE classifications SET hits = hits + 1 WHERE id = ?",
+                (record_id,),
+            )
+            self.stats.hits += 1
+
+        logger.debug(
+            "Попадание в кэш классификаций (расстояние %d), hit rate: %.0f%%",
+            distance,
+            self.stats.hit_rate * 100,
+        )
+        return ClassificationResult(label=label, confidence=confidence)
+
+    def put(self, phash: int, result: ClassificationResult) -> None:
+        """
+        Сохраняет результат классификации.
+
+        Args:
+            phash: Перцептивный хэш изображения
+            result: Результат классификации
+        """
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT INTO classifications (phash, label, confidence, created_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    to_signed(phash),
+                    result["label"],
+                    result["confidence"],
+                    time.time(),
+                ),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Удаляет устаревшие записи и самые старые сверх лимита."""
+
+        self._connection.execute(
+            "DELETE FROM classifications WHERE created_at < ?",
+            (time.time() - self.ttl,),
+        )
+        self._connection.execute(
+            """
+            DELETE FROM classifications
+            WHERE id IN (
+                SELECT id FROM classifications
+                ORDER BY created_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    def log_stats(self) -> None:
+        """Выводит hit rate и количество сэкономленных вызовов API."""
+
+        logger.info(
+            "Кэш классификаций: обращений %d, попаданий %d (%.0f%%), "
+            "сэкономлено вызовов API: %d",
+            self.stats.lookups,
+            self.stats.hits,
+            self.stats.hit_rate * 100,
+            self.stats.api_calls_saved,
+        )
@@ -0,0 +1,218 @@
+import uuid
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .frame_source import Frame
+from .log_manager import get_logger
+
+logger = get_logger(name="frame-ring")
+
+
+class FrameRef(NamedTuple):
+    """Ссылка на кадр в кольце разделяемой памяти.
+
+    Передается между процессами вместо пикселей.
+    """
+
+    name: str
+    slot: int
+    offset: int
+    shape: Tuple[int, ...]
+    crop: Optional[Tuple[int, int, int, int]] = None
+
+
+class FrameRing:
+    """Кольцо предвыделенных слотов разделяемой памяти для кадров.
+
+    Размер слота рассчитывается по разрешению экрана устройства (RGBA):
+    в кольцо записываются снятые кадры, а не обработанные изображения.
+    Владелец кольца (процесс устройства) записывает кадр в свободный слот
+    и отправляет другим процессам только FrameRef с границами области.
+    Слот возвращается в кольцо, когда счетчик ссылок падает до нуля:
+    ссылки освобождает владелец после ответа процесса-потребителя.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        width: int,
+        height: int,
+        channels: int = 4,
+    ) -> None:
+        """
+        Args:
+            slots: Количество слотов
+            width: Ширина экрана
+            height: Высота экрана
+            channels: Максимальное количество каналов кадра
+        """
+        self.slots = slots
+        self.slot_size = width * height * channels
+        self.frames = 0
+        self.regions = 0
+        self.fallbacks = 0
+
+        self._memory = SharedMemory(
+            name=f"frame-ring-{uuid.uuid4().hex[:12]}",
+            create=True,
+            size=self.slots * self.slot_size,
+        )
+        self._refcounts: List[int] = [0] * slots
+        self._shared: "weakref.WeakKeyDictionary[Frame, FrameRef]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._next_slot = 0
+        self._lock = Lock()
+
+        logger.debug(
+            "Создано кольцо кадров %s: слотов %d по %.1f МБ",
+            self.name,
+            self.slots,
+            self.slot_size / 1024 / 1024,
+        )
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def _acquire_slot(self) -> Optional[int]:
+        """Находит свободный слот, начиная с последнего выданного."""
+
+        for step in range(self.slots):
+            slot = (self._next_slot + step) % self.slots
+            if self._refcounts[slot] == 0:
+                self._refcounts[slot] = 1
+                self._next_slot = (slot + 1) % self.slots
+                return slot
+        return None
+
+    def put(
+        self,
+        array: np.ndarray,
+        crop: Optional[Sequence[int]] = None,
+    ) -> Optional[FrameRef]:
+        """
+        Копирует кадр в свободный слот.
+
+        Args:
+            array: Пиксели кадра (uint8)
+            crop: Область кадра (left, top, right, bottom), которую нужно
+                прочитать потребителю
+
+        Returns:
+            Ссылка на кадр или None, если кадр больше слота или свободных
+            слотов нет (тогда кадр нужно передать обычным способом)
+        """
+        if array.dtype != np.uint8 or array.nbytes > self.slot_size:
+            self.fallbacks += 1
+            return None
+
+        with self._lock:
+            slot = self._acquire_slot()
+        if slot is None:
+            self.fallbacks += 1
+            return None
+
+        offset = slot * self.slot_size
+        target = np.ndarray(
+            array.shape, dtype=np.uint8, buffer=self._memory.buf, offset=offset
+        )
+        np.copyto(target, array)
+        self.frames += 1
+
+        return FrameRef(
+            name=self.name,
+            slot=slot,
+            offset=offset,
+            shape=array.shape,
+            crop=tuple(crop) if crop is not None else None,
+        )
+
+    def share(self, frame: Frame, crop: Sequence[int]) -> Optional[FrameRef]:
+        """
+        Возвращает ссылку на область кадра, копируя кадр в кольцо один раз.
+
+        Все области одного кадра читаются из одного слота. Кадр держит
+        свою ссылку на слот, пока объект Frame жив; каждую возвращенную
+        ссылку нужно освободить через release после ответа потребителя.
+
+        Args:
+            frame: Снятый кадр экрана
+            crop: Область кадра (left, top, right, bottom)
+
+        Returns:
+            Ссылка на область или None, если кадр не удалось записать
+        """
+        ref = self._shared.get(frame)
+        if ref is None:
+            ref = self.put(frame.array)
+            if ref is None:
+                return None
+            self._shared[frame] = ref
+            weakref.finalize(frame, self.release, ref)
+
+        self.retain(ref)
+        self.regions += 1
+        return ref._replace(crop=tuple(crop))
+
+    def retain(self, ref: FrameRef) -> None:
+        """Увеличивает счетчик ссылок слота."""
+
+        with self._lock:
+            self._refcounts[ref.slot] += 1
+
+    def release(self, ref: FrameRef) -> None:
+        """Уменьшает счетчик ссылок; при нуле слот снова свободен."""
+
+        with self._lock:
+            if self._refcounts[ref.slot] > 0:
+                self._refcounts[ref.slot] -= 1
+
+    def log_stats(self) -> None:
+        """Выводит количество кадров, переданных через кольцо и мимо него."""
+
+        logger.info(
+            "Кольцо кадров: записано кадров %d, передано областей %d, "
+            "передано копированием %d",
+            self.frames,
+            self.regions,
+            self.fallbacks,
+        )
+
+    def close(self) -> None:
+        """Освобождает разделяемую память."""
+
+        self._memory.close()
+        self._memory.unlink()
+
+
+# Подключенные блоки разделяемой памяти в процессе-потребителе
+_attached: Dict[str, SharedMemory] = {}
+
+
+def read_frame(ref: FrameRef) -> np.ndarray:
+    """
+    Возвращает кадр (или его область) по ссылке без копирования.
+
+    Представление действительно, пока владелец не освободил ссылку.
+
+    Args:
+        ref: Ссылка на кадр
+
+    Returns:
+        Массив пикселей поверх разделяемой памяти
+    """
+    memory = _attached.get(ref.name)
+    if memory is None:
+        memory = SharedMemory(name=ref.name, track=False)
+        _attached[ref.name] = memory
+
+    array = np.ndarray(ref.shape, dtype=np.uint8, buffer=memory.buf, offset=ref.offset)
+    if ref.crop is not None:
+        left, top, right, bottom = ref.crop
+        array = array[top:bottom, left:right]
+    return array
@@ -0,0 +1,296 @@
+import base64
+import io
+import subprocess
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+from PIL.Image import Image as PILImage
+from uiautomator2 import Device
+
+from src.config import settings
+
+from .log_manager import get_logger
+
+logger = get_logger(name="frame-source")
+
+# Форматы пикселей screencap (android.graphics.PixelFormat)
+SCREENCAP_RGBA_8888 = 1
+SCREENCAP_RGBX_8888 = 2
+
+
+class Frame:
+    """Кадр экрана в виде массива пикселей HxWxC (uint8).
+
+    Области кадра возвращаются как представления массива без копирования,
+    преобразование в PIL выполняется только на границе OCR/классификатора.
+    """
+
+    # __weakref__ нужен кольцу кадров: слот кадра освобождается вместе с ним
+    __slots__ = ("array", "transferred_bytes", "__weakref__")
+
+    def __init__(self, array: np.ndarray, transferred_bytes: int = 0) -> None:
+        """
+        Args:
+            array: Пиксели кадра формы (height, width, channels)
+            transferred_bytes: Количество байт, переданных с устройства
+        """
+        self.array = array
+        self.transferred_bytes = transferred_bytes
+
+    @property
+    def width(self) -> int:
+        return self.array.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.array.shape[0]
+
+    def crop(self, bounds: Sequence[int]) -> np.ndarray:
+        """
+        Возвращает область кадра как представление массива.
+
+        Args:
+            bounds: Границы области (left, top, right, bottom)
+
+        Returns:
+            Представление массива без копирования пикселей
+        """
+        left, top, right, bottom = self.clip(bounds)
+        return self.array[top:bottom, left:right]
+
+    def clip(self, bounds: Sequence[int]) -> Tuple[int, int, int, int]:
+        """Ограничивает границы области размерами кадра."""
+
+        left, top, right, bottom = bounds
+        return (
+            max(0, left),
+            max(0, top),
+            min(self.width, right),
+            min(self.height, bottom),
+        )
+
+    def region(self, bounds: Sequence[int]) -> "FrameRegion":
+        """
+        Возвращает область кадра без копирования и преобразования в PIL.
+
+        Args:
+            bounds: Границы области (left, top, right, bottom)
+
+        Returns:
+            Кадр с границами области
+        """
+        return FrameRegion(frame=self, bounds=self.clip(bounds))
+
+    def to_image(self, bounds: Optional[Sequence[int]] = None) -> PILImage:
+        """
+        Преобразует кадр или его область в RGB-изображение PIL.
+
+        Args:
+            bounds: Границы области (left, top, right, bottom)
+
+        Returns:
+            Изображение PIL (копия пикселей)
+        """
+        array = self.array if bounds is None else self.crop(bounds)
+        return array_to_image(array)
+
+
+class FrameRegion(NamedTuple):
+    """Область кадра для OCR.
+
+    Сервис OCR передает в процесс пула сам кадр через кольцо кадров и
+    границы области, поэтому изображение области создается только там,
+    где оно распознается.
+    """
+
+    frame: Frame
+    bounds: Tuple[int, int, int, int]
+
+    def to_image(self) -> PILImage:
+        """Преобразует область в RGB-изображение PIL (копия пикселей)."""
+
+        return self.frame.to_image(bounds=self.bounds)
+
+
+def array_to_image(array: np.ndarray) -> PILImage:
+    """Преобразует массив HxWxC или HxW в изображение PIL."""
+
+    if array.ndim == 3 and array.shape[2] == 4:
+        array = array[..., :3]
+    return Image.fromarray(np.ascontiguousarray(array))
+
+
+def parse_screencap(data: bytes) -> np.ndarray:
+    """
+    Разбирает сырой вывод 'screencap' без копирования пикселей.
+
+    Args:
+        data: Вывод команды screencap (заголовок + RGBA пиксели)
+
+    Returns:
+        Массив формы (height, width, 4), ссылающийся на буфер data
+
+    Raises:
+        ValueError: Если формат пикселей не поддерживается
+    """
+    width, height, pixel_format = np.frombuffer(data, dtype="<u4", count=3)
+    if pixel_format not in (SCREENCAP_RGBA_8888, SCREENCAP_RGBX_8888):
+        raise ValueError(f"Неподдерживаемый формат пикселей screencap: {pixel_format}")
+
+    pixels_size = int(width) * int(height) * 4
+    # Android 9+ добавляет в заголовок поле цветового пространства
+    header_size = len(data) - pixels_size
+    if header_size not in (12, 16):
+        raise ValueError(f"Некорректный размер вывода screencap: {len(data)}")
+
+    return np.frombuffer(
+        data, dtype=np.uint8, count=pixels_size, offset=header_size
+    ).reshape(int(height), int(width), 4)
+
+
+def device_preview(device: Device, scale: float, quality: int) -> Optional[np.ndarray]:
+    """
+    Снимает уменьшенный кадр, сжатый на устройстве (несколько КБ).
+
+    Args:
+        device: Устройство uiautomator2
+        scale: Масштаб относительно разрешения экрана
+        quality: Качество JPEG
+
+    Returns:
+        Массив HxW (uint8) или None, если устройство не вернуло кадр
+    """
+    data = device.jsonrpc.takeScreenshot(scale, quality)
+    if not data:
+        return None
+
+    image = Image.open(io.BytesIO(base64.b64decode(data)))
+    return np.asarray(image.convert("L"))
+
+
+class FrameSource:
+    """Базовый источник кадров экрана."""
+
+    name: str = "base"
+
+    @property
+    def fast_preview(self) -> bool:
+        """Уменьшенный кадр снимается без передачи полного кадра."""
+
+        return False
+
+    def capture(self) -> Frame:
+        """Снимает кадр экрана."""
+
+        raise NotImplementedError
+
+    def capture_preview(self, scale: float = 0.2, quality: int = 30) -> np.ndarray:
+        """
+        Снимает уменьшенный кадр в оттенках серого для сравнения состояний.
+
+        Базовая реализация прореживает полный кадр.
+
+        Args:
+            scale: Масштаб относительно разрешения экрана
+            quality: Качество JPEG, если источник сжимает кадр на устройстве
+
+        Returns:
+            Массив HxW (uint8)
+        """
+        step = max(1, round(1 / scale))
+        return np.ascontiguousarray(self.capture().array[::step, ::step, 1])
+
+
+class Uiautomator2FrameSource(FrameSource):
+    """Кадры через uiautomator2: сжатое на устройстве изображение, декодируемое на хосте."""
+
+    name = "uiautomator2"
+
+    def __init__(self, device: Device) -> None:
+        self.device = device
+
+    @property
+    def fast_preview(self) -> bool:
+        return True
+
+    def capture(self) -> Frame:
+        image: PILImage = self.device.screenshot()
+        return Frame(array=np.asarray(image.convert("RGB")))
+
+    def capture_preview(self, scale: float = 0.2, quality: int = 30) -> np.ndarray:
+        # Устройство уменьшает и сжимает кадр само, передается несколько КБ
+        preview = device_preview(self.device, scale=scale, quality=quality)
+        if preview is None:
+            return super().capture_preview(scale=scale, quality=quality)
+        return preview
+
+
+class ScreencapRawFrameSource(FrameSource):
+    """Кадры через 'adb exec-out screencap': несжатый RGBA без декодирования.
+
+    screencap не умеет уменьшать кадр, и каждый полный кадр - около 10 МБ
+    через adb. Поэтому уменьшенные кадры для ожидания стабилизации экрана
+    снимаются через uiautomator2, если передано устройство.
+    """
+
+    name = "screencap_raw"
+
+    def __init__(
+        self,
+        serial: str,
+        adb_path: str = "adb",
+        timeout: float = 10.0,
+        device: Optional[Device] = None,
+    ) -> None:
+        self.serial = serial
+        self.adb_path = adb_path
+        self.timeout = timeout
+        self.device = device
+
+    @property
+    def fast_preview(self) -> bool:
+        return self.device is not None
+
+    def capture(self) -> Frame:
+        result = subprocess.run(
+            [self.adb_path, "-s", self.serial, "exec-out", "screencap"],
+            capture_output=True,
+            check=True,
+            timeout=self.timeout,
+        )
+        return Frame(
+            array=parse_screencap(result.stdout),
+            transferred_bytes=len(result.stdout),
+        )
+
+    def capture_preview(self, scale: float = 0.2, quality: int = 30) -> np.ndarray:
+        preview = None
+        if self.device is not None:
+            preview = device_preview(self.device, scale=scale, quality=quality)
+        if preview is None:
+            return super().capture_preview(scale=scale, quality=quality)
+        return preview
+
+
+def create_frame_source(device: Device) -> FrameSource:
+    """
+    Создает источник кадров, выбранный в настройках.
+
+    Args:
+        device: Экземпляр устройства uiautomator2
+
+    Returns:
+        Источник кадров
+    """
+    if settings.screen.frame_source == "screencap_raw":
+        source: FrameSource = ScreencapRawFrameSource(
+            serial=device.serial,
+            adb_path=settings.screen.adb_path,
+            device=device,
+        )
+    else:
+        source = Uiautomator2FrameSource(device=device)
+
+    logger.info("Источник кадров: %s", source.name)
+    return source
@@ -1,9 +1,11 @@
-import time
+from typing import Optional
 
 from uiautomator2 import Device
 
 from src.config import settings
 
+from .transition_waiter import TransitionWaiter
+
 
 class GoogleApp:
     """Класс для управления приложением Google через uiautomator2."""
@@ -19,28 +21,45 @@ class GoogleApp:
         """
 
         self.device = device
+        self.transitions = TransitionWaiter(
+            device=device,
+            min_interval=settings.timeout.transition_min_interval,
+            max_interval=settings.timeout.transition_max_interval,
+        )
 
-    def start(self, wait: bool = True, timeout: float = 5.0) -> None:
+    def start(
+        self,
+        wait: bool = True,
+        timeout: float = 5.0,
+        stop: bool = False,
+    ) -> None:
         """Запускает приложение Google.
 
         Args:
-            wait: Ожидать полной загрузки приложения
+            wait: Ожидать запуска основной активности
+            timeout: Срок ожидания запуска
+            stop: Остановить приложение перед запуском (не нужно после close)
         """
 
         self.device.app_start(
             package_name=self.PACKAGE_NAME,
             activity=self.MAIN_ACTIVITY,
-            # wait=wait,
-            stop=True,
+            stop=stop,
         )
 
         if wait:
-            self.device.wait_activity(self.MAIN_ACTIVITY, timeout=timeout)
-
-    def close(self, attempt: int = 6) -> None:
-        """Закрывает приложение Google."""
-        for _ in range(attempt):
-            if "launcher" not in self.device.info.get("currentPackageName"):
-                self.device.app_stop(package_name=self.PACKAGE_NAME)
-            else:
-                time.sleep(settings.timeout.action_timeout)
+            self.transitions.wait_activity(self.MAIN_ACTIVITY, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Закрывает приложение Google и ждет ухода с переднего плана.
+
+        Args:
+            timeout: Срок ожидания закрытия
+        """
+        if timeout is None:
+            timeout = settings.timeout.app_close_timeout
+
+        self.device.app_stop(package_name=self.PACKAGE_NAME)
+        self.transitions.wait_package(
+            self.PACKAGE_NAME, timeout=timeout, foreground=False
+        )
@@ -0,0 +1,55 @@
+from functools import lru_cache
+
+import numpy as np
+from PIL.Image import Image, Resampling
+
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(size: int) -> np.ndarray:
+    """Матрица ортонормированного DCT-II размера size x size."""
+
+    n = np.arange(size)
+    matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+    matrix *= np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+def perceptual_hash(image: Image, hash_size: int = 8, highfreq_factor: int = 4) -> int:
+    """Вычисляет 64-битный перцептивный хэш (pHash) изображения.
+
+    Args:
+        image: Изображение
+        hash_size: Размер стороны блока низких частот
+        highfreq_factor: Во сколько раз уменьшенное изображение больше блока
+
+    Returns:
+        int: Хэш как беззнаковое целое
+    """
+
+    size = hash_size * highfreq_factor
+    pixels = np.asarray(
+        image.convert("L").resize((size, size), Resampling.LANCZOS),
+        dtype=np.float64,
+    )
+
+    dct = _dct_matrix(size)
+    low_frequencies = (dct @ pixels @ dct.T)[:hash_size, :hash_size]
+    bits = (low_frequencies > np.median(low_frequencies)).flatten()
+
+    return int.from_bytes(np.packbits(bits).tobytes(), byteorder="big")
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Расстояние Хэмминга между двумя 64-битными хэшами."""
+
+    return ((first ^ second) & HASH_MASK).bit_count()
+
+
+def to_signed(value: int) -> int:
+    """Переводит беззнаковый 64-битный хэш в знаковый (для SQLite INTEGER)."""
+
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
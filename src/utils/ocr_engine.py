@@ -0,0 +1,298 @@
+import shlex
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Union
+
+import pytesseract
+from PIL.Image import Image as PILImage
+
+from src.config import settings
+
+from .frame_source import FrameRegion
+from .log_manager import get_logger
+from .ocr_profile import OcrProfile, SourceTransform
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+logger = get_logger(name="ocr-engine")
+
+# Колонки TSV-вывода Tesseract в порядке следования
+TSV_COLUMNS = (
+    "level",
+    "page_num",
+    "block_num",
+    "par_num",
+    "line_num",
+    "word_num",
+    "left",
+    "top",
+    "width",
+    "height",
+    "conf",
+    "text",
+)
+
+
+def parse_tesseract_config(config: str) -> Tuple[int, int, Dict[str, str]]:
+    """Разбирает строку конфигурации Tesseract в стиле командной строки.
+
+    Args:
+        config: Строка вида "--oem 3 --psm 6 -c key=value"
+
+    Returns:
+        Кортеж (oem, psm, variables)
+    """
+
+    oem, psm = 3, 3
+    variables: Dict[str, str] = {}
+
+    tokens = shlex.split(config)
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        value = tokens[index + 1] if index + 1 < len(tokens) else None
+
+        if token == "--oem" and value is not None:
+            oem = int(value)
+            index += 1
+        elif token == "--psm" and value is not None:
+            psm = int(value)
+            index += 1
+        elif token == "-c" and value is not None and "=" in value:
+            key, var_value = value.split("=", 1)
+            variables[key] = var_value
+            index += 1
+        index += 1
+
+    return oem, psm, variables
+
+
+def tsv_to_dict(tsv: str) -> Dict[str, List]:
+    """Преобразует TSV-вывод Tesseract в словарь формата pytesseract.Output.DICT.
+
+    Args:
+        tsv: TSV-текст без строки заголовка
+
+    Returns:
+        Словарь со списками значений по колонкам
+    """
+
+    data: Dict[str, List] = {column: [] for column in TSV_COLUMNS}
+
+    for line in tsv.splitlines():
+        values = line.split("\t")
+        if len(values) < len(TSV_COLUMNS) - 1:
+            continue
+
+        # Пустой текст может быть обрезан в конце строки
+        if len(values) == len(TSV_COLUMNS) - 1:
+            values.append("")
+
+        for column, value in zip(TSV_COLUMNS[:-2], values[:-2]):
+            data[column].append(int(value))
+        data["conf"].append(float(values[-2]))
+        data["text"].append(values[-1])
+
+    return data
+
+
+class OcrEngine:
+    """Базовый интерфейс движка распознавания."""
+
+    name: str = "base"
+
+    def image_to_data(self, image: PILImage, lang: str, config: str) -> Dict[str, List]:
+        """Распознает изображение и возвращает данные в формате Output.DICT.
+
+        Args:
+            image: Подготовленное изображение
+            lang: Строка языков Tesseract
+            config: Параметры конфигурации Tesseract
+
+        Returns:
+            Словарь со списками значений по колонкам
+        """
+
+        raise NotImplementedError
+
+    def recognize(
+        self,
+        image: Union[PILImage, FrameRegion],
+        profile: OcrProfile,
+        lang: str,
+    ) -> Tuple[Dict[str, List], SourceTransform]:
+        """Подготавливает изображение по профилю и распознает его.
+
+        Args:
+            image: Исходное изображение или область кадра
+            profile: Профиль OCR
+            lang: Строка языков Tesseract
+
+        Returns:
+            Данные в формате Output.DICT и преобразование координат в
+            систему исходного изображения
+        """
+
+        if isinstance(image, FrameRegion):
+            image = image.to_image()
+
+        # Предобработка: шаги возвращают новые изображения, копия не нужна
+        processed_image, transform = profile.prepare(image)
+        data = self.image_to_data(
+            image=processed_image, lang=lang, config=profile.config
+        )
+        return data, transform
+
+
+class PytesseractEngine(OcrEngine):
+    """Движок на основе pytesseract: отдельный процесс tesseract на каждый вызов."""
+
+    name = "pytesseract"
+
+    def image_to_data(self, image: PILImage, lang: str, config: str) -> Dict[str, List]:
+        return pytesseract.image_to_data(
+            image=image,
+            lang=lang,
+            output_type=pytesseract.Output.DICT,
+            config=config,
+        )
+
+
+class TesserocrEngine(OcrEngine):
+    """Движок с постоянно инициализированным API Tesseract внутри процесса.
+
+    Для каждой комбинации языка, OEM и переменных создается один экземпляр
+    API, который переиспользуется между вызовами. Изображение передается
+    сырым буфером пикселей, без временных файлов. API для языка по умолчанию
+    создается сразу, поэтому ошибки инициализации проявляются в
+    конструкторе. Если API для другого языка создать не удалось, вызов
+    выполняется через pytesseract.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, tessdata_path: Optional[str] = None, lang: str = "eng") -> None:
+        if tesserocr is None:
+            raise RuntimeError("Пакет tesserocr не установлен")
+
+        self._tessdata_path = tessdata_path
+        self._apis: Dict[Tuple, "tesserocr.PyTessBaseAPI"] = {}
+        self._lock = Lock()
+        self._fallback: Optional[PytesseractEngine] = None
+
+        self._get_api(lang=lang, oem=3, variables={})
+
+    def _get_api(
+        self,
+        lang: str,
+        oem: int,
+        variables: Dict[str, str],
+    ) -> "tesserocr.PyTessBaseAPI":
+        """Возвращает инициализированный API для указанных параметров."""
+
+        key = (lang, oem, tuple(sorted(variables.items())))
+        api = self._apis.get(key)
+        if api is not None:
+            return api
+
+        # OEM и PSM в tesserocr - пространства имен с целыми константами
+        kwargs = {"lang": lang, "oem": oem}
+        if self._tessdata_path:
+            kwargs["path"] = self._tessdata_path
+
+        api = tesserocr.PyTessBaseAPI(**kwargs)
+        for name, value in variables.items():
+            api.SetVariable(name, value)
+
+        logger.debug("Инициализирован API Tesseract: lang=%s, oem=%s", lang, oem)
+        self._apis[key] = api
+        return api
+
+    def image_to_data(self, image: PILImage, lang: str, config: str) -> Dict[str, List]:
+        oem, psm, variables = parse_tesseract_config(config)
+
+        if image.mode not in ("L", "RGB", "RGBA"):
+            image = image.convert("RGB")
+
+        bytes_per_pixel = len(image.getbands())
+
+        with self._lock:
+            try:
+                api = self._get_api(lang=lang, oem=oem, variables=variables)
+            except RuntimeError as e:
+                if self._fallback is None:
+                    logger.warning(
+                        "Не удалось инициализировать API Tesseract (lang=%s), "
+                        "используется pytesseract: %s",
+                        lang,
+                        e,
+                    )
+                    self._fallback = PytesseractEngine()
+                api = None
+
+            if api is not None:
+                api.SetPageSegMode(psm)
+                api.SetImageBytes(
+                    image.tobytes(),
+                    image.width,
+                    image.height,
+                    bytes_per_pixel,
+                    image.width * bytes_per_pixel,
+                )
+                tsv = api.GetTSVText(0)
+                api.Clear()
+
+        if api is None:
+            return self._fallback.image_to_data(image=image, lang=lang, config=config)
+
+        return tsv_to_dict(tsv)
+
+
+_engine: Optional[OcrEngine] = None
+
+
+def get_ocr_engine() -> OcrEngine:
+    """Возвращает движок распознавания текущего процесса.
+
+    Движок выбирается настройкой ``settings.ocr.ocr_backend`` и создается
+    один раз на процесс. Если tesserocr недоступен, используется pytesseract.
+
+    Returns:
+        Экземпляр OcrEngine
+    """
+
+    global _engine
+
+    if _engine is not None:
+        return _engine
+
+    if settings.ocr.ocr_backend == "tesserocr":
+        try:
+            _engine = TesserocrEngine(tessdata_path=settings.ocr.tessdata_path)
+        except Exception as e:
+            logger.warning(
+                "Не удалось инициализировать tesserocr, используется pytesseract: %s",
+                e,
+            )
+
+    if _engine is None:
+        _engine = PytesseractEngine()
+
+    logger.info("Движок OCR: %s", _engine.name)
+    return _engine
+
+
+def set_ocr_engine(engine: OcrEngine) -> None:
+    """Устанавливает движок распознавания текущего процесса.
+
+    Используется, например, для подключения общего сервиса OCR.
+
+    Args:
+        engine: Экземпляр OcrEngine
+    """
+
+    global _engine
+
+    _engine = engine
@@ -0,0 +1,281 @@
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+from PIL.Image import Image as PILImage
+from PIL.Image import Resampling
+from PIL.ImageEnhance import Contrast as ContrastEnhance
+
+from src.config import settings
+
+RESAMPLING_FILTERS = {
+    "nearest": Resampling.NEAREST,
+    "bilinear": Resampling.BILINEAR,
+    "bicubic": Resampling.BICUBIC,
+    "lanczos": Resampling.LANCZOS,
+}
+
+
+class SourceTransform(NamedTuple):
+    """Преобразование координат обработанного изображения в исходные.
+
+    x_source = x / divisor_x + offset_x (аналогично для y).
+    """
+
+    divisor_x: float = 1.0
+    divisor_y: float = 1.0
+    offset_x: float = 0.0
+    offset_y: float = 0.0
+
+    @property
+    def is_identity(self) -> bool:
+        return self == SourceTransform()
+
+
+class PreprocessStep:
+    """Шаг предобработки изображения перед OCR.
+
+    Шаги не изменяют изображение на месте, поэтому копия исходного
+    изображения не нужна.
+    """
+
+    def apply(
+        self,
+        image: PILImage,
+        transform: SourceTransform,
+    ) -> Tuple[PILImage, SourceTransform]:
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class Grayscale(PreprocessStep):
+    """Перевод в оттенки серого: в 3 раза меньше данных для остальных шагов."""
+
+    def apply(self, image, transform):
+        if image.mode == "L":
+            return image, transform
+        return image.convert("L"), transform
+
+
+@dataclass(frozen=True)
+class Crop(PreprocessStep):
+    """Обрезка по доле размеров изображения (left, top, right, bottom)."""
+
+    box: Tuple[float, float, float, float] = (0.0, 0.0, 1.0, 1.0)
+
+    def apply(self, image, transform):
+        left, top, right, bottom = self.box
+        pixels = (
+            int(left * image.width),
+            int(top * image.height),
+            int(round(right * image.width)),
+            int(round(bottom * image.height)),
+        )
+        if pixels == (0, 0, image.width, image.height):
+            return image, transform
+
+        return image.crop(pixels), transform._replace(
+            offset_x=transform.offset_x + pixels[0] / transform.divisor_x,
+            offset_y=transform.offset_y + pixels[1] / transform.divisor_y,
+        )
+
+
+@dataclass(frozen=True)
+class Resize(PreprocessStep):
+    """Масштабирование с выбранным фильтром."""
+
+    scale: float = 2.0
+    filter: str = "bilinear"
+
+    def apply(self, image, transform):
+        if self.scale == 1:
+            return image, transform
+
+        size = (round(image.width * self.scale), round(image.height * self.scale))
+        return image.resize(size, RESAMPLING_FILTERS[self.filter]), transform._replace(
+            divisor_x=transform.divisor_x * self.scale,
+            divisor_y=transform.divisor_y * self.scale,
+        )
+
+
+@dataclass(frozen=True)
+class Contrast(PreprocessStep):
+    """Коррекция контрастности."""
+
+    factor: float = 1.5
+
+    def apply(self, image, transform):
+        if self.factor == 1:
+            return image, transform
+        return ContrastEnhance(image).enhance(self.factor), transform
+
+
+@dataclass(frozen=True)
+class Binarize(PreprocessStep):
+    """Бинаризация с порогом Оцу (или заданным) и темным текстом на светлом фоне."""
+
+    threshold: Optional[int] = None
+
+    @staticmethod
+    def _otsu_threshold(pixels: np.ndarray) -> int:
+        histogram = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+        weights = np.cumsum(histogram)
+        sums = np.cumsum(histogram * np.arange(256))
+
+        background = weights[:-1]
+        foreground = weights[-1] - background
+        valid = (background > 0) & (foreground > 0)
+
+        mean_background = np.divide(
+            sums[:-1], background, where=valid, out=np.zeros(255)
+        )
+        mean_foreground = np.divide(
+            sums[-1] - sums[:-1], foreground, where=valid, out=np.zeros(255)
+        )
+        variance = background * foreground * (mean_background - mean_foreground) ** 2
+        return int(np.argmax(np.where(valid, variance, -1)))
+
+    def apply(self, image, transform):
+        pixels = np.asarray(image.convert("L"))
+        threshold = (
+            self.threshold
+            if self.threshold is not None
+            else self._otsu_threshold(pixels)
+        )
+        binary = pixels > threshold
+
+        # Tesseract лучше распознает темный текст на светлом фоне
+        if np.count_nonzero(binary) < binary.size // 2:
+            binary = ~binary
+
+        return Image.fromarray(binary.astype(np.uint8) * 255, mode="L"), transform
+
+
+STEPS = {
+    "grayscale": Grayscale,
+    "crop": Crop,
+    "resize": Resize,
+    "contrast": Contrast,
+    "binarize": Binarize,
+}
+
+
+@dataclass(frozen=True)
+class OcrProfile:
+    """Профиль OCR: цепочка предобработки и параметры Tesseract."""
+
+    name: str
+    steps: Tuple[PreprocessStep, ...] = field(default_factory=tuple)
+    oem: int = 3
+    psm: int = 6
+    whitelist: Optional[str] = None
+    lang: Optional[str] = None
+    raw_config: Optional[str] = None
+
+    @property
+    def config(self) -> str:
+        """Строка конфигурации Tesseract."""
+
+        # Готовая строка конфигурации имеет приоритет над oem/psm профиля
+        if self.raw_config:
+            return self.raw_config
+
+        config = f"--oem {self.oem} --psm {self.psm}"
+        if self.whitelist:
+            config += f" -c tessedit_char_whitelist={self.whitelist}"
+        return config
+
+    @property
+    def scale(self) -> float:
+        """Итоговое увеличение изображения."""
+
+        scale = 1.0
+        for step in self.steps:
+            if isinstance(step, Resize):
+                scale *= step.scale
+        return scale
+
+    @property
+    def crops(self) -> bool:
+        return any(isinstance(step, Crop) for step in self.steps)
+
+    def prepare(self, image: PILImage) -> Tuple[PILImage, SourceTransform]:
+        """
+        Применяет цепочку предобработки.
+
+        Args:
+            image: Исходное изображение
+
+        Returns:
+            Обработанное изображение и преобразование координат в исходные
+        """
+        transform = SourceTransform()
+        for step in self.steps:
+            image, transform = step.apply(image, transform)
+        return image, transform
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any]) -> "OcrProfile":
+        """Создает профиль из декларативного описания."""
+
+        steps = []
+        for step in data.get("steps", []):
+            options = dict(step)
+            step_type = STEPS[options.pop("op")]
+            if "box" in options:
+                options["box"] = tuple(options["box"])
+            steps.append(step_type(**options))
+
+        return cls(
+            name=name,
+            steps=tuple(steps),
+            oem=data.get("oem", 3),
+            psm=data.get("psm", 6),
+            whitelist=data.get("whitelist"),
+            lang=data.get("lang"),
+        )
+
+    @classmethod
+    def from_args(
+        cls,
+        contrast_factor: float = 1.5,
+        scale: Optional[float] = None,
+        config: Optional[str] = None,
+    ) -> "OcrProfile":
+        """Профиль, эквивалентный прежним параметрам get_screen_data."""
+
+        steps = []
+        if scale:
+            steps.append(Resize(scale=scale, filter="bicubic"))
+        if contrast_factor != 1.0:
+            steps.append(Contrast(factor=contrast_factor))
+
+        return cls(name="args", steps=tuple(steps), raw_config=config)
+
+
+def load_ocr_profiles(path: Path) -> Dict[str, OcrProfile]:
+    """Загружает профили OCR из JSON-файла."""
+
+    with path.open(mode="r", encoding="utf-8") as file:
+        data = json.load(file)
+
+    return {name: OcrProfile.from_dict(name, options) for name, options in data.items()}
+
+
+@lru_cache(maxsize=None)
+def get_ocr_profile(name: str) -> OcrProfile:
+    """
+    Возвращает профиль OCR по имени из settings.path.ocr_profiles_file.
+
+    Args:
+        name: Имя профиля
+
+    Returns:
+        Профиль OCR
+    """
+    profiles = load_ocr_profiles(settings.path.ocr_profiles_file)
+    return profiles[name]
@@ -0,0 +1,519 @@
+import multiprocessing
+import os
+import queue
+import statistics
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import partial
+from threading import Lock, Semaphore, Thread
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from PIL import Image
+from PIL.Image import Image as PILImage
+
+from .frame_ring import FrameRef, FrameRing, read_frame
+from .frame_source import FrameRegion, array_to_image
+from .log_manager import get_logger
+from .ocr_engine import OcrEngine, PytesseractEngine, get_ocr_engine, set_ocr_engine
+from .ocr_profile import OcrProfile, SourceTransform
+
+logger = get_logger(name="ocr-service")
+
+
+class OcrRequest(NamedTuple):
+    """Запрос к сервису OCR из процесса устройства."""
+
+    request_id: int
+    mode: str
+    size: Tuple[int, int]
+    # Пиксели изображения или ссылка на область кадра в кольце кадров
+    pixels: Union[bytes, FrameRef]
+    lang: str
+    config: str
+    enqueued_at: float
+    # Профиль, по которому изображение подготавливается в процессе пула
+    profile: Optional[OcrProfile] = None
+    # Кадр не поместился в кольцо кадров и передан копированием
+    ring_fallback: bool = False
+
+
+def _run_ocr(
+    mode: str,
+    size: Tuple[int, int],
+    pixels: Union[bytes, FrameRef],
+    lang: str,
+    config: str,
+    profile: Optional[OcrProfile] = None,
+) -> Tuple[Dict[str, List], SourceTransform, float]:
+    """Подготавливает и распознает изображение в процессе пула."""
+
+    start = time.perf_counter()
+    if isinstance(pixels, FrameRef):
+        image = array_to_image(read_frame(pixels))
+    else:
+        image = Image.frombytes(mode, size, pixels)
+
+    engine = get_ocr_engine()
+    try:
+        if profile is None:
+            data = engine.image_to_data(image=image, lang=lang, config=config)
+            transform = SourceTransform()
+        else:
+            data, transform = engine.recognize(image=image, profile=profile, lang=lang)
+    except Exception as e:
+        # Не все исключения движков переживают передачу между процессами
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+    return data, transform, time.perf_counter() - start
+
+
+@dataclass
+class OcrServiceStats:
+    """Метрики задержек сервиса OCR."""
+
+    window: int = 500
+    requests: Counter = field(default_factory=Counter)
+    errors: int = 0
+    # Запросы с областью кадра в кольце кадров и с копией пикселей
+    shared: int = 0
+    copied: int = 0
+    # Запросы, кадр которых не поместился в кольцо кадров
+    ring_fallbacks: int = 0
+    queue_waits: Deque[float] = field(default_factory=deque)
+    ocr_times: Deque[float] = field(default_factory=deque)
+    latencies: Deque[float] = field(default_factory=deque)
+
+    def add_transfer(self, request: OcrRequest) -> None:
+        if isinstance(request.pixels, FrameRef):
+            self.shared += 1
+        else:
+            self.copied += 1
+        if request.ring_fallback:
+            self.ring_fallbacks += 1
+
+    def add(
+        self, serial: str, queue_wait: float, ocr_time: float, latency: float
+    ) -> None:
+        self.requests[serial] += 1
+        for values, value in (
+            (self.queue_waits, queue_wait),
+            (self.ocr_times, ocr_time),
+            (self.latencies, latency),
+        ):
+            values.append(value)
+            if len(values) > self.window:
+                values.popleft()
+
+    @staticmethod
+    def _percentiles(values: Deque[float]) -> str:
+        if len(values) < 2:
+            return "n/a"
+        quantiles = statistics.quantiles(values, n=100)
+        return "p50=%.0f p95=%.0f p99=%.0f ms" % (
+            quantiles[49] * 1000,
+            quantiles[94] * 1000,
+            quantiles[98] * 1000,
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"запросов {sum(self.requests.values())} ({dict(self.requests)}), "
+            f"ошибок {self.errors}, через кольцо кадров {self.shared}, "
+            f"копированием {self.copied} (не поместилось в кольцо "
+            f"{self.ring_fallbacks}), "
+            f"ожидание в очереди {self._percentiles(self.queue_waits)}, "
+            f"OCR {self._percentiles(self.ocr_times)}, "
+            f"полная задержка {self._percentiles(self.latencies)}"
+        )
+
+
+class RemoteOcrEngine(OcrEngine):
+    """Клиент сервиса OCR внутри процесса устройства.
+
+    Отправляет изображения в очередь своего устройства и ждет ответ.
+    Предобработка по профилю OCR выполняется в процессе пула. Если
+    подключено кольцо кадров, области кадра передаются через разделяемую
+    память: кадр записывается в кольцо один раз на состояние UI, а в
+    очередь уходит только ссылка на слот с границами области. Если очередь
+    переполнена дольше таймаута или сервис не отвечает, запрос выполняется
+    локальным движком.
+    """
+
+    name = "remote"
+
+    def __init__(
+        self,
+        serial: str,
+        requests: "multiprocessing.Queue",
+        responses: "multiprocessing.Queue",
+        notifications: "multiprocessing.Queue",
+        timeout: float = 60.0,
+    ) -> None:
+        self.serial = serial
+        self.timeout = timeout
+        self._requests = requests
+        self._responses = responses
+        self._notifications = notifications
+        self._request_id = 0
+        self._lock = Lock()
+        self._local_engine: Optional[OcrEngine] = None
+        self._frame_ring: Optional[FrameRing] = None
+        self._pending_refs: Dict[int, FrameRef] = {}
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_local_engine"] = None
+        state["_frame_ring"] = None
+        state["_pending_refs"] = {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def install(self, frame_ring: Optional[FrameRing] = None) -> None:
+        """Делает клиент движком OCR текущего процесса.
+
+        Args:
+            frame_ring: Кольцо кадров для передачи кадров без копирования
+        """
+
+        self._frame_ring = frame_ring
+        set_ocr_engine(self)
+        logger.info("[%s] OCR выполняется через общий сервис", self.serial)
+
+    def _local(self) -> OcrEngine:
+        if self._local_engine is None:
+            self._local_engine = PytesseractEngine()
+        return self._local_engine
+
+    @staticmethod
+    def _transferable(image: PILImage) -> PILImage:
+        if image.mode not in ("L", "RGB", "RGBA"):
+            image = image.convert("RGB")
+        return image
+
+    def image_to_data(self, image: PILImage, lang: str, config: str) -> Dict[str, List]:
+        image = self._transferable(image)
+
+        data, _ = self._call(
+            mode=image.mode,
+            size=image.size,
+            pixels=image.tobytes(),
+            lang=lang,
+            config=config,
+            local=lambda: (
+                self._local().image_to_data(image=image, lang=lang, config=config),
+                SourceTransform(),
+            ),
+        )
+        return data
+
+    def recognize(
+        self,
+        image: Union[PILImage, FrameRegion],
+        profile: OcrProfile,
+        lang: str,
+    ) -> Tuple[Dict[str, List], SourceTransform]:
+        region = image if isinstance(image, FrameRegion) else None
+
+        ref = None
+        if region and self._frame_ring:
+            ref = self._frame_ring.share(frame=region.frame, crop=region.bounds)
+
+        if ref:
+            left, top, right, bottom = region.bounds
+            mode, size, pixels = "RGB", (right - left, bottom - top), ref
+        else:
+            # Без кольца передается исходное изображение: до предобработки
+            # оно меньше (профили увеличивают изображение)
+            if region:
+                image = region.to_image()
+            image = self._transferable(image)
+            mode, size, pixels = image.mode, image.size, image.tobytes()
+
+        return self._call(
+            mode=mode,
+            size=size,
+            pixels=pixels,
+            lang=lang,
+            config=profile.config,
+            profile=profile,
+            ring_fallback=bool(region and self._frame_ring and not ref),
+            local=lambda: self._local().recognize(
+                image=image, profile=profile, lang=lang
+            ),
+        )
+
+    def _call(
+        self,
+        mode: str,
+        size: Tuple[int, int],
+        pixels: Union[bytes, FrameRef],
+        lang: str,
+        config: str,
+        local: Callable[[], Tuple[Dict[str, List], SourceTransform]],
+        profile: Optional[OcrProfile] = None,
+        ring_fallback: bool = False,
+    ) -> Tuple[Dict[str, List], SourceTransform]:
+        ref = pixels if isinstance(pixels, FrameRef) else None
+
+        with self._lock:
+            self._request_id += 1
+            request = OcrRequest(
+                request_id=self._request_id,
+                mode=mode,
+                size=size,
+                pixels=pixels,
+                lang=lang,
+                config=config,
+                enqueued_at=time.time(),
+                profile=profile,
+                ring_fallback=ring_fallback,
+            )
+
+            try:
+                try:
+                    self._requests.put(request, timeout=self.timeout)
+                except queue.Full:
+                    if ref:
+                        self._frame_ring.release(ref)
+                    raise
+
+                if ref:
+                    self._pending_refs[self._request_id] = ref
+                self._notifications.put(self.serial)
+
+                deadline = time.monotonic() + self.timeout
+                while True:
+                    request_id, data, transform, error = self._responses.get(
+                        timeout=max(deadline - time.monotonic(), 0)
+                    )
+
+                    # Слот освобождается только после ответа: до этого его
+                    # может читать процесс пула
+                    done_ref = self._pending_refs.pop(request_id, None)
+                    if done_ref:
+                        self._frame_ring.release(done_ref)
+
+                    # Ответы на запросы, по которым истек таймаут, пропускаются
+                    if request_id == self._request_id:
+                        break
+            except (queue.Full, queue.Empty):
+                logger.warning(
+                    "[%s] Сервис OCR не ответил за %.0f с, локальное распознавание",
+                    self.serial,
+                    self.timeout,
+                )
+                return local()
+
+        if error is not None:
+            raise RuntimeError(f"Ошибка сервиса OCR: {error}")
+
+        return data, transform
+
+
+class OcrService:
+    """Общий для всех устройств пул процессов OCR.
+
+    Создается процессом-лаунчером. Каждое устройство получает собственную
+    ограниченную очередь запросов; диспетчер выбирает устройства по кругу
+    и передает в пул не больше запросов, чем в нем процессов, поэтому
+    одно активное устройство не может вытеснить остальные, а число
+    одновременных процессов tesseract не превышает число ядер.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: int = 4,
+        timeout: float = 60.0,
+        stats_interval: int = 200,
+    ) -> None:
+        """
+        Args:
+            workers: Количество процессов пула (по умолчанию - число ядер)
+            queue_size: Размер очереди запросов одного устройства
+            timeout: Таймаут ожидания ответа на стороне устройства
+            stats_interval: Через сколько запросов выводить метрики
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.stats_interval = stats_interval
+        self.stats = OcrServiceStats()
+
+        self._context = multiprocessing.get_context()
+        self._notifications = self._context.Queue()
+        self._clients: Dict[str, RemoteOcrEngine] = {}
+        self._slots = Semaphore(self.workers)
+        self._stats_lock = Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._dispatcher: Optional[Thread] = None
+
+    def register(self, serial: str) -> RemoteOcrEngine:
+        """
+        Создает очереди и клиента для устройства.
+
+        Вызывается до запуска процессов устройств.
+
+        Args:
+            serial: Серийный номер устройства
+
+        Returns:
+            Клиент, который нужно установить в процессе устройства
+        """
+        client = RemoteOcrEngine(
+            serial=serial,
+            requests=self._context.Queue(maxsize=self.queue_size),
+            responses=self._context.Queue(),
+            notifications=self._notifications,
+            timeout=self.timeout,
+        )
+        self._clients[serial] = client
+        return client
+
+    def start(self) -> None:
+        """Запускает пул процессов и диспетчер.
+
+        Вызывается после запуска процессов устройств, чтобы они не
+        наследовали потоки сервиса.
+        """
+        self._executor = self._create_executor()
+        self._dispatcher = Thread(
+            target=self._dispatch_loop, name="ocr-dispatcher", daemon=True
+        )
+        self._dispatcher.start()
+        logger.info(
+            "Сервис OCR запущен: процессов %d, устройств %d",
+            self.workers,
+            len(self._clients),
+        )
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def close(self) -> None:
+        """Останавливает диспетчер и пул, выводит итоговые метрики."""
+
+        if self._dispatcher and self._dispatcher.is_alive():
+            self._notifications.put(None)
+            self._dispatcher.join(timeout=5)
+
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+        logger.info("Сервис OCR остановлен: %s", self.stats)
+
+    def _dispatch_loop(self) -> None:
+        rotation = deque(self._clients)
+        pending: Counter = Counter()
+        running = True
+
+        while running:
+            if not sum(pending.values()):
+                serial = self._notifications.get()
+                if serial is None:
+                    break
+                pending[serial] += 1
+
+            self._slots.acquire()
+
+            # Учитываем все запросы, поступившие за время ожидания слота
+            while True:
+                try:
+                    serial = self._notifications.get_nowait()
+                except queue.Empty:
+                    break
+                if serial is None:
+                    running = False
+                    break
+                pending[serial] += 1
+
+            if not running:
+                self._slots.release()
+                break
+
+            # Круговой выбор следующего устройства с запросами
+            while not pending[rotation[0]]:
+                rotation.rotate(-1)
+            serial = rotation[0]
+            rotation.rotate(-1)
+            pending[serial] -= 1
+
+            self._submit(serial, self._clients[serial]._requests.get())
+
+    def _submit(self, serial: str, request: OcrRequest) -> None:
+        dispatched_at = time.time()
+        task = partial(
+            _run_ocr,
+            request.mode,
+            request.size,
+            request.pixels,
+            request.lang,
+            request.config,
+            request.profile,
+        )
+
+        with self._stats_lock:
+            self.stats.add_transfer(request)
+
+        try:
+            future = self._executor.submit(task)
+        except BrokenProcessPool:
+            logger.error("Пул процессов OCR поврежден, перезапуск")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._create_executor()
+            future = self._executor.submit(task)
+
+        future.add_done_callback(
+            partial(
+                self._on_done,
+                serial=serial,
+                request_id=request.request_id,
+                enqueued_at=request.enqueued_at,
+                dispatched_at=dispatched_at,
+            )
+        )
+
+    def _on_done(
+        self,
+        future: Future,
+        serial: str,
+        request_id: int,
+        enqueued_at: float,
+        dispatched_at: float,
+    ) -> None:
+        self._slots.release()
+        responses = self._clients[serial]._responses
+
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is not None:
+            with self._stats_lock:
+                self.stats.errors += 1
+            logger.error("[%s] Ошибка распознавания в пуле: %s", serial, error)
+            responses.put((request_id, None, None, repr(error)))
+            return
+
+        data, transform, ocr_time = future.result()
+        responses.put((request_id, data, transform, None))
+
+        with self._stats_lock:
+            self.stats.add(
+                serial=serial,
+                queue_wait=dispatched_at - enqueued_at,
+                ocr_time=ocr_time,
+                latency=time.time() - enqueued_at,
+            )
+            total = sum(self.stats.requests.values())
+            if total % self.stats_interval == 0:
+                logger.info("Сервис OCR: %s", self.stats)
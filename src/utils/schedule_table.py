@@ -0,0 +1,110 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional, Sequence
+
+from src.models import ConfigItem
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class ScheduleState(NamedTuple):
+    """Активная конфигурация, момент следующей смены и следующая конфигурация."""
+
+    config: Optional[ConfigItem]
+    next_transition: Optional[datetime]
+    next_config: Optional[ConfigItem] = None
+
+
+def parse_minutes(value: str) -> int:
+    """Переводит время 'HH:MM' в минуты от начала суток."""
+
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+class ScheduleTable:
+    """Расписание устройства, скомпилированное в таблицу интервалов суток.
+
+    Окна, переходящие через полночь, разбиваются на два интервала. Сутки
+    делятся границами всех окон на отрезки, и для каждого отрезка заранее
+    определяется активная конфигурация (при пересечении окон - первая по
+    порядку, как при линейном поиске). Соседние отрезки с одной
+    конфигурацией объединяются, поэтому каждая граница таблицы - смена
+    конфигурации. Поиск выполняется бинарным поиском по границам.
+    """
+
+    def __init__(self, configs: Sequence[ConfigItem]) -> None:
+        """
+        Args:
+            configs: Окна расписания в порядке приоритета
+        """
+        intervals = []
+        for index, config in enumerate(configs):
+            start = parse_minutes(config["start_time"])
+            end = parse_minutes(config["end_time"])
+            if start < end:
+                intervals.append((start, end, index))
+            elif start > end:
+                intervals.append((start, MINUTES_PER_DAY, index))
+                intervals.append((0, end, index))
+
+        points = {0}
+        for start, end, _ in intervals:
+            points.update((start, end))
+        points.discard(MINUTES_PER_DAY)
+
+        self._configs = list(configs)
+        self._starts: List[int] = []
+        self._indexes: List[Optional[int]] = []
+        for point in sorted(points):
+            active = [index for start, end, index in intervals if start <= point < end]
+            index = min(active) if active else None
+            if self._indexes and self._indexes[-1] == index:
+                continue
+            self._starts.append(point)
+            self._indexes.append(index)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def lookup(self, now: datetime) -> ScheduleState:
+        """
+        Находит активную конфигурацию и момент ее смены.
+
+        Args:
+            now: Текущее локальное время
+
+        Returns:
+            Активная конфигурация (или None), момент следующей смены
+            (None, если расписание не меняется в течение суток) и
+            конфигурация после смены
+        """
+        minute = now.hour * 60 + now.minute
+        position = bisect_right(self._starts, minute) - 1
+        index = self._indexes[position]
+
+        # Ближайшая граница с другой конфигурацией, с переходом через полночь
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        for step in range(1, len(self._starts) + 1):
+            next_position = (position + step) % len(self._starts)
+            if self._indexes[next_position] == index:
+                continue
+
+            days = (position + step) // len(self._starts)
+            next_transition = day_start + timedelta(
+                days=days, minutes=self._starts[next_position]
+            )
+            next_index = self._indexes[next_position]
+            break
+        else:
+            next_transition = None
+            next_index = None
+
+        return ScheduleState(
+            config=self._config(index),
+            next_transition=next_transition,
+            next_config=self._config(next_index),
+        )
+
+    def _config(self, index: Optional[int]) -> Optional[ConfigItem]:
+        return self._configs[index] if index is not None else None
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+class ScrollEstimate(NamedTuple):
+    """Смещение контента вверх между двумя кадрами."""
+
+    offset: int
+    score: float
+
+
+def row_profile(pixels: np.ndarray, bands: int = 8, step: int = 2) -> np.ndarray:
+    """
+    Строит профиль строк области кадра для оценки скролла.
+
+    Для каждой строки и каждой из bands вертикальных полос берется средний
+    модуль горизонтального градиента: профиль описывает текст и границы
+    изображений, а не заливку фона. Профиль занимает H x bands float32,
+    поэтому между итерациями хранится вместо кадра.
+
+    Args:
+        pixels: Пиксели области (HxW или HxWxC)
+        bands: Количество вертикальных полос
+        step: Шаг выборки столбцов
+
+    Returns:
+        Массив профиля формы (H, bands)
+    """
+    # Зеленый канал достаточно близок к яркости и не требует смешивания
+    gray = pixels[..., 1] if pixels.ndim == 3 else pixels
+    gray = gray[:, ::step].astype(np.int16)
+
+    edges = np.abs(np.diff(gray, axis=1)).astype(np.float32)
+    return np.stack(
+        [band.mean(axis=1) for band in np.array_split(edges, bands, axis=1)],
+        axis=1,
+    ).astype(np.float32)
+
+
+def estimate_scroll_offset(
+    previous: np.ndarray,
+    current: np.ndarray,
+    min_overlap: float = 0.2,
+    min_score: float = 0.9,
+) -> Optional[ScrollEstimate]:
+    """
+    Оценивает смещение контента вверх по профилям строк двух кадров.
+
+    Для каждого смещения d считается нормализованная корреляция перекрытия
+    previous[d:] и current[:H - d]. Суммы произведений вычисляются через
+    FFT, суммы и квадраты окон - через префиксные суммы, поэтому оценка
+    занимает O(H log H) для всех смещений сразу.
+
+    Args:
+        previous: Профиль предыдущего кадра (row_profile)
+        current: Профиль текущего кадра
+        min_overlap: Минимальная доля перекрытия кадров
+        min_score: Минимальная корреляция для доверия оценке
+
+    Returns:
+        Смещение и корреляция или None, если кадры не совпадают
+        ни при одном смещении
+    """
+    if previous.shape != current.shape:
+        return None
+
+    height, bands = previous.shape
+    max_offset = height - max(int(height * min_overlap), 2)
+    if max_offset < 0:
+        return None
+
+    size = 2 * height
+    products = np.fft.irfft(
+        np.fft.rfft(previous, n=size, axis=0)
+        * np.conj(np.fft.rfft(current, n=size, axis=0)),
+        n=size,
+        axis=0,
+    )[: max_offset + 1].sum(axis=1)
+
+    offsets = np.arange(max_offset + 1)
+    count = (height - offsets) * bands
+
+    # Суммы previous[d:] и current[:H - d] по всем полосам
+    previous_sums = np.concatenate(([0.0], np.cumsum(previous.sum(axis=1))))
+    previous_squares = np.concatenate(([0.0], np.cumsum((previous**2).sum(axis=1))))
+    current_sums = np.concatenate(([0.0], np.cumsum(current.sum(axis=1))))
+    current_squares = np.concatenate(([0.0], np.cumsum((current**2).sum(axis=1))))
+
+    sum_a = previous_sums[height] - previous_sums[offsets]
+    sum_aa = previous_squares[height] - previous_squares[offsets]
+    sum_b = current_sums[height - offsets]
+    sum_bb = current_squares[height - offsets]
+
+    covariance = products - sum_a * sum_b / count
+    variance = (sum_aa - sum_a**2 / count) * (sum_bb - sum_b**2 / count)
+    scores = np.divide(
+        covariance,
+        np.sqrt(np.maximum(variance, 0)),
+        out=np.zeros_like(covariance),
+        where=variance > 1e-6,
+    )
+
+    offset = int(np.argmax(scores))
+    score = float(scores[offset])
+    if score < min_score:
+        return None
+
+    return ScrollEstimate(offset=offset, score=score)
+
+
+@dataclass
+class ScrollStats:
+    """Статистика инкрементального распознавания ленты."""
+
+    full_scans: int = 0
+    incremental_scans: int = 0
+    stalled_swipes: int = 0
+    offsets_total: int = 0
+    scanned_pixels: int = 0
+    content_pixels: int = 0
+
+    def add_scan(self, scanned_pixels: int, content_pixels: int) -> None:
+        self.scanned_pixels += scanned_pixels
+        self.content_pixels += content_pixels
+
+    @property
+    def mean_offset(self) -> float:
+        if not self.incremental_scans:
+            return 0.0
+        return self.offsets_total / self.incremental_scans
+
+    @property
+    def pixels_saved(self) -> float:
+        if not self.content_pixels:
+            return 0.0
+        return 1 - self.scanned_pixels / self.content_pixels
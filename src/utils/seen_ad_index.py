@@ -0,0 +1,173 @@
+import hashlib
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from .image_hash import hamming_distance, to_signed
+from .log_manager import get_logger
+
+logger = get_logger(name="seen-ad-index")
+
+
+@dataclass
+class SeenAdStats:
+    """Статистика обращений к индексу просмотренных объявлений."""
+
+    lookups: int = 0
+    hits: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class SeenAdIndex:
+    """Индекс уже обработанных объявлений.
+
+    Объявление идентифицируется текстом кнопки "Поделиться" и перцептивным
+    хэшем изображения. Записи хранятся в SQLite отдельно для каждого
+    устройства и региона и устаревают по истечении временного окна, после
+    чего объявление обрабатывается заново.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        device_serial: str,
+        window: float = 6 * 3600,
+        max_distance: int = 4,
+    ) -> None:
+        """
+        Args:
+            path: Путь к файлу SQLite
+            device_serial: Серийный номер устройства
+            window: Временное окно в секундах, в течение которого объявление
+                считается просмотренным
+            max_distance: Максимальное расстояние Хэмминга между хэшами изображений
+        """
+        self.path = path
+        self.device_serial = device_serial
+        self.window = window
+        self.max_distance = max_distance
+        self.stats = SeenAdStats()
+
+        self._lock = Lock()
+        self._connection = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        connection = sqlite3.connect(
+            self.path,
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.create_function("hamming", 2, hamming_distance, deterministic=True)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS seen_ads (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                device TEXT NOT NULL,
+                region TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                phash INTEGER NOT NULL,
+                seen_at REAL NOT NULL
+            )
+            """)
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS seen_ads_key "
+            "ON seen_ads (device, region, text_hash, seen_at)"
+        )
+        return connection
+
+    @staticmethod
+    def _text_hash(text: Optional[str]) -> str:
+        normalized = " ".join((text or "").lower().split())
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+    def seen(self, region: str, text: Optional[str], phash: int) -> bool:
+        """
+        Проверяет, обрабатывалось ли объявление в текущем временном окне.
+
+        Args:
+            region: Регион
+            text: Текст объявления
+            phash: Перцептивный хэш изображения
+
+        Returns:
+            bool: True, если объявление уже обработано
+        """
+        with self._lock:
+            self.stats.lookups += 1
+            row = self._connection.execute(
+                """
+                SELECT 1 FROM seen_ads
+                WHERE device = :device
+                  AND region = :region
+                  AND text_hash = :text_hash
+                  AND seen_at >= :min_seen_at
+                  AND hamming(phash, :phash) <= :max_distance
+                LIMIT 1
+                """,
+                {
+                    "device": self.device_serial,
+                    "region": region,
+                    "text_hash": self._text_hash(text),
+                    "min_seen_at": time.time() - self.window,
+                    "phash": to_signed(phash),
+                    "max_distance": self.max_distance,
+                },
+            ).fetchone()
+
+            if row is None:
+                return False
+
+            self.stats.hits += 1
+
+        logger.debug(
+            "Объявление уже обработано, hit rate: %.0f%%", self.stats.hit_rate * 100
+        )
+        return True
+
+    def add(self, region: str, text: Optional[str], phash: int) -> None:
+        """
+        Отмечает объявление как обработанное.
+
+        Args:
+            region: Регион
+            text: Текст объявления
+            phash: Перцептивный хэш изображения
+        """
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT INTO seen_ads (device, region, text_hash, phash, seen_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    self.device_serial,
+                    region,
+                    self._text_hash(text),
+                    to_signed(phash),
+                    time.time(),
+                ),
+            )
+            self._connection.execute(
+                "DELETE FROM seen_ads WHERE seen_at < ?",
+                (time.time() - self.window,),
+            )
+
+    def log_stats(self) -> None:
+        """Выводит hit rate индекса."""
+
+        logger.info(
+            "Индекс просмотренных объявлений: проверок %d, повторов %d (%.0f%%)",
+            self.stats.lookups,
+            self.stats.hits,
+            self.stats.hit_rate * 100,
+        )
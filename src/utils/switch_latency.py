@@ -0,0 +1,140 @@
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock
+
+from .log_manager import get_logger
+
+logger = get_logger(name="switch-latency")
+
+
+class SwitchLatency:
+    """Измеренная длительность смены аккаунта на устройстве.
+
+    Хранит сглаженное среднее и среднее отклонение длительности (как оценка
+    RTT в TCP) и по ним рассчитывает, за сколько секунд до открытия окна
+    расписания начинать смену. Оценка сохраняется в SQLite отдельно для
+    каждого устройства и переживает перезапуск парсера.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        device_serial: str,
+        initial: float = 30.0,
+        alpha: float = 0.25,
+        deviation_factor: float = 2.0,
+        margin: float = 5.0,
+        max_lead: float = 300.0,
+    ) -> None:
+        """
+        Args:
+            path: Путь к файлу SQLite
+            device_serial: Серийный номер устройства
+            initial: Оценка длительности до первого измерения
+            alpha: Вес нового измерения при сглаживании
+            deviation_factor: Сколько средних отклонений добавлять к оценке
+            margin: Постоянный запас в секундах
+            max_lead: Максимальное опережение в секундах
+        """
+        self.path = path
+        self.device_serial = device_serial
+        self.alpha = alpha
+        self.deviation_factor = deviation_factor
+        self.margin = margin
+        self.max_lead = max_lead
+
+        self.estimate = initial
+        self.deviation = initial / 4
+        self.samples = 0
+
+        self._lock = Lock()
+        self._connection = self._connect()
+        self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        connection = sqlite3.connect(
+            self.path,
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS switch_latency (
+                device TEXT PRIMARY KEY,
+                estimate REAL NOT NULL,
+                deviation REAL NOT NULL,
+                samples INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """)
+        return connection
+
+    def _load(self) -> None:
+        row = self._connection.execute(
+            "SELECT estimate, deviation, samples FROM switch_latency WHERE device = ?",
+            (self.device_serial,),
+        ).fetchone()
+        if row is None:
+            return
+
+        self.estimate, self.deviation, self.samples = row
+        logger.debug(
+            "[%s] Длительность смены аккаунта: %.1f ± %.1f с (%d измерений)",
+            self.device_serial,
+            self.estimate,
+            self.deviation,
+            self.samples,
+        )
+
+    @property
+    def lead_time(self) -> float:
+        """За сколько секунд до открытия окна начинать смену аккаунта."""
+
+        lead = self.estimate + self.deviation_factor * self.deviation + self.margin
+        return min(lead, self.max_lead)
+
+    def record(self, duration: float) -> None:
+        """
+        Учитывает измеренную длительность смены аккаунта.
+
+        Args:
+            duration: Длительность смены в секундах
+        """
+        with self._lock:
+            if self.samples:
+                error = duration - self.estimate
+                self.estimate += self.alpha * error
+                self.deviation += self.alpha * (abs(error) - self.deviation)
+            else:
+                # Первое измерение заменяет начальную оценку
+                self.estimate = duration
+                self.deviation = duration / 4
+            self.samples += 1
+
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO switch_latency
+                    (device, estimate, deviation, samples, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    self.device_serial,
+                    self.estimate,
+                    self.deviation,
+                    self.samples,
+                    time.time(),
+                ),
+            )
+
+        logger.info(
+            "[%s] Смена аккаунта: %.1f с, оценка %.1f ± %.1f с, опережение %.0f с",
+            self.device_serial,
+            duration,
+            self.estimate,
+            self.deviation,
+            self.lead_time,
+        )
@@ -0,0 +1,247 @@
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image
+from PIL.Image import Image as PILImage
+from PIL.Image import Resampling
+
+from .log_manager import get_logger
+
+logger = get_logger(name="template-detector")
+
+
+class TemplateMatch(NamedTuple):
+    """Найденное вхождение шаблона в координатах исходного изображения."""
+
+    left: int
+    top: int
+    right: int
+    bottom: int
+    score: float
+
+
+def to_gray(image: Union[PILImage, np.ndarray]) -> np.ndarray:
+    """Переводит изображение или массив HxWxC в оттенки серого (float32)."""
+
+    if isinstance(image, np.ndarray):
+        if image.ndim == 2:
+            return image.astype(np.float32)
+        rgb = image[..., :3].astype(np.float32)
+        return rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    return np.asarray(image.convert("L"), dtype=np.float32)
+
+
+def _integral(values: np.ndarray) -> np.ndarray:
+    """Интегральное изображение с нулевой первой строкой и столбцом."""
+
+    integral = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=np.float64)
+    integral[1:, 1:] = values.cumsum(axis=0, dtype=np.float64).cumsum(axis=1)
+    return integral
+
+
+def _window_sums(integral: np.ndarray, height: int, width: int) -> np.ndarray:
+    """Суммы по всем окнам height x width по интегральному изображению."""
+
+    return (
+        integral[height:, width:]
+        - integral[:-height, width:]
+        - integral[height:, :-width]
+        + integral[:-height, :-width]
+    )
+
+
+class TemplateDetector:
+    """Детектор фиксированной метки нормализованной кросс-корреляцией.
+
+    Корреляция считается через FFT в float32: спектр изображения
+    вычисляется один раз на вызов, спектры шаблонов кэшируются по размеру
+    области (он почти не меняется между кадрами), нормировка - через
+    интегральные изображения. Поиск выполняется на уменьшенном изображении.
+    """
+
+    def __init__(
+        self,
+        templates: Sequence[np.ndarray],
+        scales: Sequence[float] = (0.9, 1.0, 1.1),
+        threshold: float = 0.75,
+        downscale: int = 3,
+        max_matches: int = 8,
+    ) -> None:
+        """
+        Args:
+            templates: Шаблоны метки в оттенках серого
+            scales: Масштабы шаблонов относительно записанного размера
+            threshold: Минимальная корреляция для вхождения
+            downscale: Во сколько раз уменьшать изображение и шаблоны
+            max_matches: Максимальное количество вхождений
+        """
+        self.threshold = threshold
+        self.downscale = downscale
+        self.max_matches = max_matches
+
+        # Шаблоны заранее приводятся к рабочему разрешению и нормируются
+        self._templates: List[Tuple[np.ndarray, float]] = []
+        self._spectra: Dict[Tuple[int, int], List[np.ndarray]] = {}
+        for template in templates:
+            for scale in scales:
+                factor = scale / downscale
+                height = round(template.shape[0] * factor)
+                width = round(template.shape[1] * factor)
+                if height < 4 or width < 4:
+                    continue
+
+                resized = np.asarray(
+                    Image.fromarray(template.astype(np.uint8)).resize(
+                        (width, height), Resampling.BILINEAR
+                    ),
+                    dtype=np.float32,
+                )
+                centered = resized - resized.mean()
+                norm = float(np.sqrt((centered**2).sum()))
+                if norm > 0:
+                    self._templates.append((centered, norm))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._templates)
+
+    @classmethod
+    def from_directory(cls, path: Path, **kwargs) -> "TemplateDetector":
+        """Загружает шаблоны (*.png) из папки; пустая папка отключает детектор."""
+
+        templates = []
+        if path.is_dir():
+            templates = [
+                to_gray(Image.open(file)) for file in sorted(path.glob("*.png"))
+            ]
+
+        detector = cls(templates=templates, **kwargs)
+        logger.debug(
+            "Загружено шаблонов: %d из %s (вариантов с масштабами: %d)",
+            len(templates),
+            path,
+            len(detector._templates),
+        )
+        return detector
+
+    def _template_spectra(self, shape: Tuple[int, int]) -> List[np.ndarray]:
+        """Сопряженные спектры шаблонов для области заданного размера."""
+
+        spectra = self._spectra.get(shape)
+        if spectra is None:
+            spectra = [
+                np.conj(np.fft.rfft2(template, s=shape))
+                for template, _ in self._templates
+            ]
+            self._spectra = {shape: spectra}
+        return spectra
+
+    def _correlate(
+        self,
+        product: np.ndarray,
+        shape: Tuple[int, int],
+        integrals: Tuple[np.ndarray, np.ndarray],
+        template: np.ndarray,
+        norm: float,
+    ) -> np.ndarray:
+        """Карта нормализованной корреляции для допустимых положений шаблона."""
+
+        height, width = template.shape
+        numerator = np.fft.irfft2(product, s=shape)[
+            : shape[0] - height + 1, : shape[1] - width + 1
+        ]
+
+        count = height * width
+        sums = _window_sums(integrals[0], height, width)
+        squares = _window_sums(integrals[1], height, width)
+        variance = np.maximum(squares - sums * sums / count, 0)
+
+        denominator = np.sqrt(variance) * norm
+        return np.divide(
+            numerator,
+            denominator,
+            out=np.zeros_like(numerator),
+            where=denominator > 1e-3 * norm,
+        )
+
+    def detect(self, image: Union[PILImage, np.ndarray]) -> List[TemplateMatch]:
+        """
+        Ищет метку на изображении.
+
+        Args:
+            image: Изображение или массив пикселей (например, Frame.crop)
+
+        Returns:
+            Вхождения, отсортированные по убыванию корреляции
+        """
+        if not self._templates:
+            return []
+
+        gray = np.ascontiguousarray(
+            to_gray(image)[:: self.downscale, :: self.downscale]
+        )
+        shape = gray.shape
+        spectrum = np.fft.rfft2(gray)
+        integrals = (_integral(gray), _integral(gray * gray))
+
+        candidates: List[Tuple[float, int, int, int, int]] = []
+        for (template, norm), template_spectrum in zip(
+            self._templates, self._template_spectra(shape)
+        ):
+            height, width = template.shape
+            if height > shape[0] or width > shape[1]:
+                continue
+
+            scores = self._correlate(
+                spectrum * template_spectrum, shape, integrals, template, norm
+            )
+
+            # Немаксимальное подавление внутри карты одного шаблона
+            for _ in range(self.max_matches):
+                index = int(np.argmax(scores))
+                y, x = divmod(index, scores.shape[1])
+                score = float(scores[y, x])
+                if score < self.threshold:
+                    break
+
+                candidates.append((score, x, y, width, height))
+                scores[
+                    max(0, y - height // 2) : y + height // 2 + 1,
+                    max(0, x - width // 2) : x + width // 2 + 1,
+                ] = -1
+
+        return self._merge(candidates)
+
+    def _merge(
+        self,
+        candidates: List[Tuple[float, int, int, int, int]],
+    ) -> List[TemplateMatch]:
+        """Объединяет пересекающиеся вхождения разных шаблонов и масштабов."""
+
+        matches: List[TemplateMatch] = []
+        for score, x, y, width, height in sorted(candidates, reverse=True):
+            match = TemplateMatch(
+                left=x * self.downscale,
+                top=y * self.downscale,
+                right=(x + width) * self.downscale,
+                bottom=(y + height) * self.downscale,
+                score=score,
+            )
+            if any(_overlaps(match, kept) for kept in matches):
+                continue
+
+            matches.append(match)
+            if len(matches) >= self.max_matches:
+                break
+
+        return matches
+
+
+def _overlaps(first: TemplateMatch, second: TemplateMatch) -> bool:
+    return (
+        first.left < second.right
+        and second.left < first.right
+        and first.top < second.bottom
+        and second.top < first.bottom
+    )
@@ -1,10 +1,13 @@
-import math
 from dataclasses import dataclass
-from typing import List, Literal, Optional, Tuple
+from typing import Dict, List, Literal, Optional, Sequence, Tuple, Union
 
-import pytesseract
+import numpy as np
+from PIL import Image
 from PIL.Image import Image as PILImage
-from PIL.ImageEnhance import Contrast
+
+from .frame_source import FrameRegion
+from .ocr_engine import get_ocr_engine
+from .ocr_profile import OcrProfile, SourceTransform
 
 
 @dataclass(frozen=True)
@@ -35,37 +38,138 @@ class TesseractCoords:
         return (self.left + self.width // 2, self.top + self.height // 2)
 
 
-@dataclass
 class TesseractResult:
-    """Результат распознавания текста Tesseract OCR."""
-
-    level: List[int]
-    page_num: List[int]
-    block_num: List[int]
-    par_num: List[int]
-    line_num: List[int]
-    word_num: List[int]
-    left: List[int]
-    top: List[int]
-    width: List[int]
-    height: List[int]
-    conf: List[float]
-    text: List[str]
+    """Результат распознавания текста Tesseract OCR.
+
+    Колонки хранятся в массивах NumPy, поэтому масштабирование координат,
+    фильтрация по уверенности и поиск фраз выполняются векторно. Текст
+    хранится массивом объектов: его построение из списка почти бесплатно,
+    а сравнение со словом фразы выполняется одной операцией.
+    """
+
+    COLUMNS = (
+        "level",
+        "page_num",
+        "block_num",
+        "par_num",
+        "line_num",
+        "word_num",
+        "left",
+        "top",
+        "width",
+        "height",
+        "conf",
+        "text",
+    )
+
+    __slots__ = COLUMNS + ("_words",)
+
+    def __init__(
+        self,
+        level: Sequence[int],
+        page_num: Sequence[int],
+        block_num: Sequence[int],
+        par_num: Sequence[int],
+        line_num: Sequence[int],
+        word_num: Sequence[int],
+        left: Sequence[int],
+        top: Sequence[int],
+        width: Sequence[int],
+        height: Sequence[int],
+        conf: Sequence[float],
+        text: Sequence[str],
+    ) -> None:
+        self.level = self._int_column(level)
+        self.page_num = self._int_column(page_num)
+        self.block_num = self._int_column(block_num)
+        self.par_num = self._int_column(par_num)
+        self.line_num = self._int_column(line_num)
+        self.word_num = self._int_column(word_num)
+        self.left = self._int_column(left)
+        self.top = self._int_column(top)
+        self.width = self._int_column(width)
+        self.height = self._int_column(height)
+        self.conf = np.asarray(conf, dtype=np.float32)
+        self.text = np.asarray(text, dtype=object)
+        self._words: Optional[np.ndarray] = None
+
+    @staticmethod
+    def _int_column(values: Sequence[int]) -> np.ndarray:
+        if isinstance(values, np.ndarray):
+            return values.astype(np.int32, copy=False)
+        return np.fromiter(values, dtype=np.int32, count=len(values))
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __repr__(self) -> str:
+        return f"TesseractResult(words={self.get_word_count()}, rows={len(self)})"
+
+    @property
+    def words(self) -> np.ndarray:
+        """Слова в нижнем регистре (вычисляются один раз)."""
+
+        if self._words is None:
+            # Одно преобразование регистра для всего текста вместо вызова на слово
+            self._words = np.asarray(
+                "\x00".join(self.text).lower().split("\x00"), dtype=object
+            )
+        return self._words
+
+    def select(self, rows: np.ndarray) -> "TesseractResult":
+        """Возвращает результат только с указанными строками (маска или индексы)."""
+
+        result = TesseractResult.__new__(TesseractResult)
+        for column in self.COLUMNS:
+            setattr(result, column, getattr(self, column)[rows])
+        result._words = self._words[rows] if self._words is not None else None
+        return result
+
+    def rescale(self, scale: int) -> None:
+        """Переводит координаты из увеличенного в scale раз изображения."""
+
+        # floor для начала блока и ceil для размера, как при делении вручную
+        self.top //= scale
+        self.left //= scale
+        self.width = -(-self.width // scale)
+        self.height = -(-self.height // scale)
+
+    def map_to_source(self, transform: SourceTransform) -> None:
+        """Переводит координаты обработанного изображения в исходные."""
+
+        if (
+            not transform.offset_x
+            and not transform.offset_y
+            and transform.divisor_x == transform.divisor_y
+            and float(transform.divisor_x).is_integer()
+        ):
+            self.rescale(int(transform.divisor_x))
+            return
+
+        self.left = np.floor(
+            self.left / transform.divisor_x + transform.offset_x
+        ).astype(np.int32)
+        self.top = np.floor(self.top / transform.divisor_y + transform.offset_y).astype(
+            np.int32
+        )
+        self.width = np.ceil(self.width / transform.divisor_x).astype(np.int32)
+        self.height = np.ceil(self.height / transform.divisor_y).astype(np.int32)
+
+    def confident(self, min_confidence: float) -> np.ndarray:
+        """Маска строк с уверенностью не ниже min_confidence."""
+
+        return self.conf >= min_confidence
 
     def get_word_count(self) -> int:
         """Возвращает количество распознанных слов."""
 
-        return len([t for t in self.text if t.strip()])
+        return sum(1 for text in self.text if text.strip())
 
     def get_average_confidence(self) -> float:
         """Возвращает среднюю уверенность распознавания."""
 
-        valid_confidences = [c for c in self.conf if c != -1]
-        return (
-            sum(valid_confidences) / len(valid_confidences)
-            if valid_confidences
-            else 0.0
-        )
+        valid_confidences = self.conf[self.conf != -1]
+        return float(valid_confidences.mean()) if valid_confidences.size else 0.0
 
 
 class Tesseract:
@@ -73,23 +177,28 @@ class Tesseract:
 
     DEFAULT_LANG = "eng"
     SUPPORTED_SCALES = (2, 4, 8)
+    # Tesseract не принимает изображения со стороной больше 32767 пикселей
+    MAX_MOSAIC_HEIGHT = 16000
 
     @staticmethod
     def get_screen_data(
-        image: PILImage,
+        image: Union[PILImage, FrameRegion],
         lang: str = DEFAULT_LANG,
         contrast_factor: float = 1.5,
         scale: Optional[Literal[2, 4, 8]] = None,
         config: Optional[str] = None,
+        profile: Optional[OcrProfile] = None,
     ) -> TesseractResult:
         """Распознает текст на изображении с помощью Tesseract OCR.
 
         Args:
-            image: Изображение для распознавания
+            image: Изображение или область кадра для распознавания
             lang: Язык для распознавания (по умолчанию "eng")
             contrast_factor: Коэффициент контрастности (1.0 - без изменений)
             scale: Масштаб увеличения изображения перед распознаванием
             config: Дополнительные параметры конфигурации Tesseract
+            profile: Профиль OCR; если задан, contrast_factor, scale и
+                config не используются
 
         Returns:
             TesseractResult: Результат распознавания с координатами и текстом
@@ -98,171 +207,353 @@ class Tesseract:
             ValueError: Если передан неподдерживаемый масштаб
         """
 
-        if scale and scale not in Tesseract.SUPPORTED_SCALES:
-            raise ValueError(
-                f"Масштаб должен быть одним из: {Tesseract.SUPPORTED_SCALES}"
+        if profile is None:
+            if scale and scale not in Tesseract.SUPPORTED_SCALES:
+                raise ValueError(
+                    f"Масштаб должен быть одним из: {Tesseract.SUPPORTED_SCALES}"
+                )
+            profile = OcrProfile.from_args(
+                contrast_factor=contrast_factor, scale=scale, config=config
             )
 
-        processed_image = image.copy()
-
-        # Масштабирование изображения
-        if scale:
-            new_size = (processed_image.width * scale, processed_image.height * scale)
-            processed_image = processed_image.resize(new_size)
-
         # Настройка языка
-        actual_lang = lang
-        if lang != Tesseract.DEFAULT_LANG:
-            actual_lang = f"{lang}+{Tesseract.DEFAULT_LANG}"
+        actual_lang = profile.lang or lang
+        if actual_lang != Tesseract.DEFAULT_LANG:
+            actual_lang = f"{actual_lang}+{Tesseract.DEFAULT_LANG}"
 
-        # Коррекция контрастности
-        if contrast_factor != 1.0:
-            processed_image = Contrast(processed_image).enhance(contrast_factor)
-
-        # Конфигурация Tesseract
-        tesseract_config = config or "--oem 3 --psm 6"
-
-        # Распознавание текста
-        data_dict: dict = pytesseract.image_to_data(
-            image=processed_image,
+        # Предобработка и распознавание выбранным движком
+        data_dict, transform = get_ocr_engine().recognize(
+            image=image,
+            profile=profile,
             lang=actual_lang,
-            output_type=pytesseract.Output.DICT,
-            config=tesseract_config,
         )
 
         data = TesseractResult(**data_dict)
 
-        # Масштабирование координат обратно
-        if scale:
-            data.top = [math.floor(i / scale) for i in data.top]
-            data.left = [math.floor(i / scale) for i in data.left]
-            data.width = [math.ceil(i / scale) for i in data.width]
-            data.height = [math.ceil(i / scale) for i in data.height]
+        # Перевод координат обратно в систему исходного изображения
+        if not transform.is_identity:
+            data.map_to_source(transform)
 
         return data
 
     @staticmethod
-    def find_matches_by_word(
-        image: PILImage,
-        target_word: str,
+    def _match_phrases(
+        image_data: TesseractResult,
+        phrases: Sequence[str],
+        min_confidence: float,
+    ) -> Dict[str, List[TesseractCoords]]:
+        """Ищет все вхождения фраз векторными операциями над массивом слов.
+
+        Args:
+            image_data: Результат распознавания
+            phrases: Фразы для поиска
+            min_confidence: Минимальная уверенность распознавания
+
+        Returns:
+            Dict[str, List[TesseractCoords]]: Вхождения для каждой фразы
+        """
+
+        matches: Dict[str, List[TesseractCoords]] = {phrase: [] for phrase in phrases}
+        if not len(image_data):
+            return matches
+
+        words = image_data.words
+        confident = image_data.confident(min_confidence)
+
+        for phrase in phrases:
+            target_words = phrase.lower().split()
+            length = len(target_words)
+            if not length or length > len(words):
+                continue
+
+            # Кандидаты - позиции первого слова, затем сужение по остальным
+            starts = np.flatnonzero(
+                (words[: len(words) - length + 1] == target_words[0])
+                & confident[: len(words) - length + 1]
+            )
+            for offset, target_word in enumerate(target_words[1:], start=1):
+                if not starts.size:
+                    break
+                shifted = starts + offset
+                starts = starts[(words[shifted] == target_word) & confident[shifted]]
+
+            if not starts.size:
+                continue
+
+            # Bounding box каждой последовательности слов
+            rows = starts[:, None] + np.arange(length)
+            tops = image_data.top[rows].min(axis=1)
+            lefts = image_data.left[rows].min(axis=1)
+            rights = (image_data.left[rows] + image_data.width[rows]).max(axis=1)
+            bottoms = (image_data.top[rows] + image_data.height[rows]).max(axis=1)
+
+            matches[phrase] = [
+                TesseractCoords(
+                    top=int(top),
+                    left=int(left),
+                    width=int(right - left),
+                    height=int(bottom - top),
+                )
+                for top, left, right, bottom in zip(tops, lefts, rights, bottoms)
+            ]
+
+        return matches
+
+    @staticmethod
+    def find_matches_by_words(
+        image: Union[PILImage, FrameRegion],
+        phrases: Sequence[str],
         lang: str = DEFAULT_LANG,
         contrast_factor: float = 1.5,
         scale: Optional[Literal[2, 4, 8]] = None,
         min_confidence: float = 60.0,
-    ) -> Optional[TesseractCoords]:
-        """Находит координаты целевого слова или фразы на изображении.
+        profile: Optional[OcrProfile] = None,
+    ) -> Dict[str, List[TesseractCoords]]:
+        """Находит вхождения нескольких фраз за одно распознавание изображения.
 
         Args:
-            image: Изображение для поиска
-            target_word: Слово или фраза для поиска
+            image: Изображение или область кадра для поиска
+            phrases: Слова или фразы для поиска
             lang: Язык для распознавания
             contrast_factor: Коэффициент контрастности
             scale: Масштаб увеличения изображения
             min_confidence: Минимальная уверенность распознавания
+            profile: Профиль OCR вместо contrast_factor и scale
 
         Returns:
-            TesseractCoords: Координаты найденного текста или None
+            Dict[str, List[TesseractCoords]]: Координаты вхождений для каждой
+            фразы (пустой список, если фраза не найдена)
         """
 
-        if not target_word.strip():
-            return None
+        if not any(phrase.strip() for phrase in phrases):
+            return {phrase: [] for phrase in phrases}
 
         image_data = Tesseract.get_screen_data(
             image=image,
             scale=scale,
             lang=lang,
             contrast_factor=contrast_factor,
+            profile=profile,
         )
 
-        target_words = target_word.lower().split()
-        words = [w.lower() if w else "" for w in image_data.text]
+        return Tesseract._match_phrases(
+            image_data=image_data,
+            phrases=phrases,
+            min_confidence=min_confidence,
+        )
 
-        # Поиск последовательности слов
-        for i in range(len(words) - len(target_words) + 1):
-            # Проверка уверенности распознавания
-            if any(
-                image_data.conf[i + j] < min_confidence
-                for j in range(len(target_words))
-            ):
-                continue
+    @staticmethod
+    def find_matches_by_word(
+        image: Union[PILImage, FrameRegion],
+        target_word: str,
+        lang: str = DEFAULT_LANG,
+        contrast_factor: float = 1.5,
+        scale: Optional[Literal[2, 4, 8]] = None,
+        min_confidence: float = 60.0,
+        profile: Optional[OcrProfile] = None,
+    ) -> Optional[TesseractCoords]:
+        """Находит координаты целевого слова или фразы на изображении.
 
-            # Проверка совпадения слов
-            if words[i : i + len(target_words)] == target_words:
-                indices = range(i, i + len(target_words))
+        Args:
+            image: Изображение или область кадра для поиска
+            target_word: Слово или фраза для поиска
+            lang: Язык для распознавания
+            contrast_factor: Коэффициент контрастности
+            scale: Масштаб увеличения изображения
+            min_confidence: Минимальная уверенность распознавания
+            profile: Профиль OCR вместо contrast_factor и scale
 
-                # Вычисление bounding box для всей фразы
-                top = min(image_data.top[j] for j in indices)
-                left = min(image_data.left[j] for j in indices)
-                right = max(image_data.left[j] + image_data.width[j] for j in indices)
-                bottom = max(image_data.top[j] + image_data.height[j] for j in indices)
+        Returns:
+            TesseractCoords: Координаты найденного текста или None
+        """
 
-                return TesseractCoords(
-                    top=top, left=left, width=right - left, height=bottom - top
-                )
+        matches = Tesseract.find_all_matches_by_word(
+            image=image,
+            target_word=target_word,
+            lang=lang,
+            contrast_factor=contrast_factor,
+            scale=scale,
+            min_confidence=min_confidence,
+            profile=profile,
+        )
 
-        return None
+        return matches[0] if matches else None
 
     @staticmethod
     def find_all_matches_by_word(
-        image: PILImage,
+        image: Union[PILImage, FrameRegion],
         target_word: str,
         lang: str = DEFAULT_LANG,
         contrast_factor: float = 1.5,
         scale: Optional[Literal[2, 4, 8]] = None,
         min_confidence: float = 60.0,
+        profile: Optional[OcrProfile] = None,
     ) -> List[TesseractCoords]:
         """Находит все вхождения целевого слова или фразы на изображении.
 
         Args:
-            image: Изображение для поиска
+            image: Изображение или область кадра для поиска
             target_word: Слово или фраза для поиска
             lang: Язык для распознавания
             contrast_factor: Коэффициент контрастности
             scale: Масштаб увеличения изображения
             min_confidence: Минимальная уверенность распознавания
+            profile: Профиль OCR вместо contrast_factor и scale
 
         Returns:
             List[TesseractCoords]: Список координат всех найденных вхождений
         """
 
-        if not target_word.strip():
-            return []
-
-        image_data = Tesseract.get_screen_data(
+        return Tesseract.find_matches_by_words(
             image=image,
-            scale=scale,
+            phrases=[target_word],
             lang=lang,
             contrast_factor=contrast_factor,
+            scale=scale,
+            min_confidence=min_confidence,
+            profile=profile,
+        )[target_word]
+
+    @staticmethod
+    def _build_mosaics(
+        images: Sequence[PILImage],
+        gutter: int,
+        max_height: int,
+    ) -> List[Tuple[PILImage, List[int], List[int]]]:
+        """Складывает изображения в столбик с белыми разделителями.
+
+        Returns:
+            Список мозаик вида (изображение, индексы исходных изображений,
+            вертикальные смещения исходных изображений в мозаике)
+        """
+
+        groups: List[List[int]] = [[]]
+        group_height = 0
+        for index, image in enumerate(images):
+            height = image.height + gutter
+            if groups[-1] and group_height + height > max_height:
+                groups.append([])
+                group_height = 0
+            groups[-1].append(index)
+            group_height += height
+
+        mosaics = []
+        for indices in groups:
+            width = max(images[i].width for i in indices) + 2 * gutter
+            height = sum(images[i].height + gutter for i in indices) + gutter
+            mosaic = Image.new("RGB", (width, height), "white")
+
+            offsets = []
+            top = gutter
+            for i in indices:
+                mosaic.paste(images[i].convert("RGB"), (gutter, top))
+                offsets.append(top)
+                top += images[i].height + gutter
+
+            mosaics.append((mosaic, indices, offsets))
+
+        return mosaics
+
+    @staticmethod
+    def _split_mosaic_data(
+        image_data: TesseractResult,
+        images: Sequence[PILImage],
+        indices: Sequence[int],
+        offsets: Sequence[int],
+        gutter: int,
+    ) -> Dict[int, TesseractResult]:
+        """Раскладывает результат распознавания мозаики по исходным изображениям.
+
+        Блок относится к изображению, в которое попадает его центр;
+        координаты переводятся в систему координат этого изображения.
+        Блоки, центр которых лежит на разделителе, отбрасываются.
+        """
+
+        offsets_array = np.asarray(offsets)
+        heights = np.asarray([images[index].height for index in indices])
+
+        center_y = image_data.top + image_data.height // 2
+        positions = np.searchsorted(offsets_array, center_y, side="right") - 1
+        inside = positions >= 0
+        inside[inside] = (
+            center_y[inside]
+            < offsets_array[positions[inside]] + heights[positions[inside]]
         )
 
-        target_words = target_word.lower().split()
-        words = [w.lower() if w else "" for w in image_data.text]
+        parts: Dict[int, TesseractResult] = {}
+        for position, index in enumerate(indices):
+            part = image_data.select(inside & (positions == position))
+            part.top -= offsets[position]
+            part.left -= gutter
+            parts[index] = part
 
-        matches = []
+        return parts
 
-        for i in range(len(words) - len(target_words) + 1):
-            # Проверка уверенности распознавания
-            if any(
-                image_data.conf[i + j] < min_confidence
-                for j in range(len(target_words))
-            ):
-                continue
+    @staticmethod
+    def find_matches_batch(
+        images: Sequence[PILImage],
+        phrase: str,
+        lang: str = DEFAULT_LANG,
+        contrast_factor: float = 1.5,
+        scale: Optional[Literal[2, 4, 8]] = None,
+        min_confidence: float = 60.0,
+        gutter: int = 32,
+        profile: Optional[OcrProfile] = None,
+    ) -> List[List[TesseractCoords]]:
+        """Ищет фразу сразу на нескольких изображениях за одно распознавание.
 
-            # Проверка совпадения слов
-            if words[i : i + len(target_words)] == target_words:
-                indices = range(i, i + len(target_words))
+        Изображения складываются в мозаику с белыми разделителями, Tesseract
+        запускается один раз на мозаику, а найденные слова возвращаются к
+        исходным изображениям. Фраза не может совпасть на стыке изображений.
 
-                # Вычисление bounding box для всей фразы
-                top = min(image_data.top[j] for j in indices)
-                left = min(image_data.left[j] for j in indices)
-                right = max(image_data.left[j] + image_data.width[j] for j in indices)
-                bottom = max(image_data.top[j] + image_data.height[j] for j in indices)
+        Args:
+            images: Изображения для поиска
+            phrase: Слово или фраза для поиска
+            lang: Язык для распознавания
+            contrast_factor: Коэффициент контрастности
+            scale: Масштаб увеличения изображения
+            min_confidence: Минимальная уверенность распознавания
+            gutter: Ширина разделителя между изображениями в пикселях
+            profile: Профиль OCR вместо contrast_factor и scale (без обрезки)
 
-                matches.append(
-                    TesseractCoords(
-                        top=top, left=left, width=right - left, height=bottom - top
-                    )
-                )
+        Returns:
+            List[List[TesseractCoords]]: Вхождения фразы для каждого
+            изображения в его собственных координатах
+        """
+
+        matches: List[List[TesseractCoords]] = [[] for _ in images]
+        if not images or not phrase.strip():
+            return matches
+
+        if profile and profile.crops:
+            raise ValueError("Профиль с обрезкой нельзя применять к мозаике")
+
+        upscale = profile.scale if profile else scale or 1
+        max_height = int(Tesseract.MAX_MOSAIC_HEIGHT // upscale)
+        for mosaic, indices, offsets in Tesseract._build_mosaics(
+            images=images, gutter=gutter, max_height=max_height
+        ):
+            image_data = Tesseract.get_screen_data(
+                image=mosaic,
+                scale=scale,
+                lang=lang,
+                contrast_factor=contrast_factor,
+                profile=profile,
+            )
+
+            parts = Tesseract._split_mosaic_data(
+                image_data=image_data,
+                images=images,
+                indices=indices,
+                offsets=offsets,
+                gutter=gutter,
+            )
+            for index, part in parts.items():
+                matches[index] = Tesseract._match_phrases(
+                    image_data=part,
+                    phrases=[phrase],
+                    min_confidence=min_confidence,
+                )[phrase]
 
         return matches
 
@@ -272,6 +563,7 @@ class Tesseract:
         lang: str = DEFAULT_LANG,
         contrast_factor: float = 1.5,
         scale: Optional[Literal[2, 4, 8]] = None,
+        profile: Optional[OcrProfile] = None,
     ) -> str:
         """Извлекает весь текст с изображения.
 
@@ -280,6 +572,7 @@ class Tesseract:
             lang: Язык для распознавания
             contrast_factor: Коэффициент контрастности
             scale: Масштаб увеличения изображения
+            profile: Профиль OCR вместо contrast_factor и scale
 
         Returns:
             str: Распознанный текст
@@ -290,6 +583,7 @@ class Tesseract:
             scale=scale,
             lang=lang,
             contrast_factor=contrast_factor,
+            profile=profile,
         )
 
         return " ".join([text for text in image_data.text if text.strip()])
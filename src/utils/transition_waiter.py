@@ -0,0 +1,157 @@
+import time
+from typing import Callable, Optional
+
+from uiautomator2 import Device, UiObject
+
+from .log_manager import get_logger
+
+logger = get_logger(name="transition-waiter")
+
+
+class TransitionWaiter:
+    """Ожидание переходов между приложениями и экранами.
+
+    Условие перехода (пакет, активность, наличие элемента) проверяется
+    с короткими интервалами, которые растут до max_interval, пока переход
+    не завершится или не истечет срок ожидания. Фактическое время каждого
+    перехода выводится в лог.
+    """
+
+    def __init__(
+        self,
+        device: Device,
+        min_interval: float = 0.05,
+        max_interval: float = 0.5,
+        backoff: float = 1.5,
+    ) -> None:
+        """
+        Args:
+            device: Экземпляр устройства uiautomator2
+            min_interval: Первый интервал проверки условия
+            max_interval: Максимальный интервал проверки условия
+            backoff: Множитель интервала после каждой неудачной проверки
+        """
+        self.device = device
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+
+    def wait_for(
+        self,
+        name: str,
+        condition: Callable[[], bool],
+        timeout: float,
+    ) -> bool:
+        """
+        Ждет выполнения условия перехода.
+
+        Args:
+            name: Название перехода для лога
+            condition: Проверка завершения перехода
+            timeout: Срок ожидания в секундах
+
+        Returns:
+            True, если переход завершился до срока
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        interval = self.min_interval
+        checks = 0
+
+        while True:
+            checks += 1
+            if condition():
+                logger.debug(
+                    "[%s] %s: %.2f с (проверок: %d)",
+                    self.device.serial,
+                    name,
+                    time.monotonic() - start,
+                    checks,
+                )
+                return True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(
+                    "[%s] %s: не завершено за %.2f с",
+                    self.device.serial,
+                    name,
+                    timeout,
+                )
+                return False
+
+            time.sleep(min(interval, remaining))
+            interval = min(interval * self.backoff, self.max_interval)
+
+    def current_package(self) -> Optional[str]:
+        """Пакет приложения на переднем плане."""
+
+        return self.device.info.get("currentPackageName")
+
+    def current_activity(self) -> Optional[str]:
+        """Активность на переднем плане или None, если ее не удалось определить."""
+
+        try:
+            return self.device.app_current().get("activity")
+        except Exception:
+            # Во время перехода фокус может быть ни у одного окна
+            return None
+
+    def wait_package(
+        self,
+        package: str,
+        timeout: float,
+        foreground: bool = True,
+    ) -> bool:
+        """
+        Ждет, пока приложение окажется на переднем плане или покинет его.
+
+        Args:
+            package: Имя пакета
+            timeout: Срок ожидания
+            foreground: True - ждать появления, False - ухода с переднего плана
+
+        Returns:
+            True, если переход завершился до срока
+        """
+        return self.wait_for(
+            name=f"{package} {'на переднем плане' if foreground else 'закрыт'}",
+            condition=lambda: (self.current_package() == package) == foreground,
+            timeout=timeout,
+        )
+
+    def wait_activity(self, activity: str, timeout: float) -> bool:
+        """
+        Ждет запуска активности.
+
+        Args:
+            activity: Имя активности
+            timeout: Срок ожидания
+
+        Returns:
+            True, если активность запущена до срока
+        """
+        return self.wait_for(
+            name=f"активность {activity.rsplit('.', 1)[-1]}",
+            condition=lambda: self.current_activity() == activity,
+            timeout=timeout,
+        )
+
+    def wait_node(
+        self,
+        node: UiObject,
+        timeout: float,
+        name: str = "элемент на экране",
+    ) -> bool:
+        """
+        Ждет появления элемента.
+
+        Args:
+            node: UI элемент
+            timeout: Срок ожидания
+            name: Название перехода для лога
+
+        Returns:
+            True, если элемент появился до срока
+        """
+        return self.wait_for(name=name, condition=lambda: node.exists, timeout=timeout)
@@ -0,0 +1,148 @@
+import re
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from uiautomator2 import UiObject
+from uiautomator2._selector import Selector
+
+from src.elements import HierarchySnapshot, parse_bounds
+from src.elements.selectors import Blocks, Buttons
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "hierarchy"
+
+# Снимку нужен только селектор UiObject, соединение с устройством не используется
+OFFLINE_SESSION = SimpleNamespace(jsonrpc=None)
+
+
+def load_snapshot(name: str) -> HierarchySnapshot:
+    return HierarchySnapshot(xml=(FIXTURES_DIR / name).read_text(encoding="utf-8"))
+
+
+def ui_object(*chain: dict) -> UiObject:
+    node = UiObject(OFFLINE_SESSION, Selector(**chain[0]))
+    for selector in chain[1:]:
+        node = node.child(**selector)
+    return node
+
+
+class FeedSnapshotTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.snapshot = load_snapshot("feed.xml")
+
+    def test_child_chain(self) -> None:
+        feed = self.snapshot(**Blocks.google_app).child(**Blocks.news_feed_box)
+
+        self.assertTrue(feed.exists)
+        self.assertEqual(feed.bounds(), (0, 252, 1080, 2106))
+
+    def test_child_chain_from_ui_object(self) -> None:
+        share = self.snapshot.node(
+            ui_object(Blocks.google_app, Blocks.news_feed_box, Buttons.share)
+        )
+
+        self.assertEqual(share.count, 2)
+        self.assertEqual(
+            share.info["contentDescription"],
+            "Share Ten destinations to visit this autumn",
+        )
+
+    def test_child_outside_parent_is_not_found(self) -> None:
+        home = self.snapshot.node(
+            ui_object(Blocks.google_app, Blocks.news_feed_box, Buttons.home)
+        )
+
+        self.assertFalse(home.exists)
+        self.assertTrue(self.snapshot.node(ui_object(Buttons.home)).exists)
+
+    def test_instance_indexing(self) -> None:
+        share = self.snapshot(**Buttons.share)
+
+        self.assertEqual(len(share), 2)
+        self.assertEqual(share[1].bounds(), (828, 1911, 912, 1995))
+        self.assertEqual(share[-1].bounds(), share[1].bounds())
+        self.assertEqual([item.bounds()[1] for item in share], [1029, 1911])
+        with self.assertRaises(IndexError):
+            share[2]
+
+    def test_instance_from_ui_object(self) -> None:
+        share = self.snapshot.node(ui_object(Blocks.news_feed_box, Buttons.share)[1])
+
+        self.assertEqual(share.instance, 1)
+        self.assertEqual(share.bounds(), (828, 1911, 912, 1995))
+
+    def test_child_of_instance_is_pinned(self) -> None:
+        cards = self.snapshot(**Blocks.news_feed_box).child(
+            className="android.view.ViewGroup", longClickable=True
+        )
+        share = cards[1].child(**Buttons.share)
+
+        self.assertEqual(share.count, 1)
+        self.assertEqual(share.bounds(), (828, 1911, 912, 1995))
+
+    def test_info(self) -> None:
+        home = self.snapshot(**Buttons.home)
+        info = home.info
+
+        self.assertEqual(info["className"], "android.widget.FrameLayout")
+        self.assertEqual(info["contentDescription"], "Home")
+        self.assertEqual(info["resourceName"], Buttons.home["resourceId"])
+        self.assertEqual(info["text"], "")
+        self.assertEqual(info["childCount"], 0)
+        self.assertTrue(info["selected"])
+        self.assertTrue(info["clickable"])
+        self.assertFalse(info["scrollable"])
+        self.assertEqual(home.center(), (180.0, 2190.0))
+
+    def test_find_text(self) -> None:
+        labels = self.snapshot.find_text(re.compile(r"^\s*sponsored\b", re.I))
+
+        self.assertEqual(
+            [label.get("bounds") for label in labels], ["[84,1757][288,1799]"]
+        )
+
+
+class MissingNodeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.snapshot = load_snapshot("launcher.xml")
+
+    def test_missing_node(self) -> None:
+        google_app = self.snapshot(**Blocks.google_app)
+
+        self.assertFalse(google_app.exists)
+        self.assertEqual(google_app.count, 0)
+        self.assertEqual(list(google_app), [])
+        self.assertFalse(google_app.click_exists())
+        with self.assertRaises(LookupError):
+            google_app.info
+        with self.assertRaises(LookupError):
+            google_app.bounds()
+
+    def test_child_of_missing_node(self) -> None:
+        feed = self.snapshot(**Blocks.google_app).child(**Blocks.news_feed_box)
+
+        self.assertFalse(feed.exists)
+        with self.assertRaises(IndexError):
+            feed[0]
+
+    def test_sibling_selector_is_rejected(self) -> None:
+        node = UiObject(
+            OFFLINE_SESSION, Selector(**Blocks.google_app).sibling(text="Google")
+        )
+
+        with self.assertRaises(ValueError):
+            self.snapshot.node(node)
+
+
+class ParseBoundsTest(unittest.TestCase):
+    def test_parse_bounds(self) -> None:
+        self.assertEqual(parse_bounds("[0,84][1080,2274]"), (0, 84, 1080, 2274))
+        self.assertEqual(parse_bounds("[-12,-3][40,50]"), (-12, -3, 40, 50))
+
+    def test_malformed_bounds(self) -> None:
+        self.assertEqual(parse_bounds(""), (0, 0, 0, 0))
+        self.assertEqual(parse_bounds("[0,84][1080]"), (0, 0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()